@@ -0,0 +1,144 @@
+import copy
+import types
+import input.simulation as sim_in
+import input.operating_conditions as op_con_in
+import input.geometry as geom_in
+import input.physical_properties as phy_prop_in
+import data.global_parameters as g_par
+import data.stack_dict as st_dict
+import data.cell_dict as c_dict
+import data.membrane_dict as mem_dict
+import data.half_cell_dict as hc_dict
+import data.channel_dict as ch_dict
+import data.manifold_dict as m_fold_dict
+import data.electrical_coupling_dict as el_cpl_dict
+import data.temperature_system_dict as therm_dict
+import data.simulation_dict as sim_dict
+import data.gas_properties as g_fit
+import data.water_properties as w_prop
+
+
+def get_settings(module, **changes):
+    """
+    Returns a namespace with the settings of an input module,
+    i.e. its public names apart from modules and functions,
+    updated by the given changes.
+    """
+    settings = {name: value for name, value in vars(module).items()
+                if not name.startswith('_')
+                and not isinstance(value, (types.ModuleType,
+                                           types.FunctionType))}
+    settings.update(changes)
+    return types.SimpleNamespace(**copy.deepcopy(settings))
+
+
+def load_settings(path, base, **changes):
+    """
+    Returns a namespace with the settings of the base input module
+    or namespace, updated by the names set in the input file at path,
+    e.g. a preset file, and by the given changes.
+    """
+    values = {}
+    with open(path) as file:
+        exec(compile(file.read(), path, 'exec'), values)
+    values = {name: value for name, value in values.items()
+              if not name.startswith('_')
+              and not isinstance(value, (types.ModuleType,
+                                         types.FunctionType))}
+    settings = get_settings(base, **values)
+    vars(settings).update(changes)
+    return settings
+
+
+class Configuration:
+
+    def __init__(self, sim=None, op_con=None, geom=None, phy_prop=None):
+        # Handover
+        self.sim = sim if sim is not None else get_settings(sim_in)
+        # simulation settings
+        self.op_con = op_con if op_con is not None \
+            else get_settings(op_con_in)
+        # operating conditions
+        self.geom = geom if geom is not None else get_settings(geom_in)
+        # geometry
+        self.phy_prop = phy_prop if phy_prop is not None \
+            else get_settings(phy_prop_in)
+        # physical properties
+        args = (self.sim, self.op_con, self.geom, self.phy_prop)
+
+        """Settings of the simulation components"""
+        self.dict_case = g_par.get_dict_case(*args)
+        # case parameters, the target current density is set
+        # by the simulation for each load point
+        self.dict_simulation = sim_dict.get_dict_simulation(*args)
+        # simulation settings
+        self.dict_stack = st_dict.get_dict_stack(*args)
+        # stack settings
+        self.dict_cell = c_dict.get_dict_cell(*args)
+        # cell settings
+        self.dict_membrane = mem_dict.get_dict_membrane(*args)
+        # membrane settings
+        self.dict_cathode = hc_dict.get_dict_cathode(*args)
+        # cathode settings
+        self.dict_anode = hc_dict.get_dict_anode(*args)
+        # anode settings
+        self.dict_cathode_channel = ch_dict.get_dict_cathode_channel(*args)
+        # cathode channel settings
+        self.dict_anode_channel = ch_dict.get_dict_anode_channel(*args)
+        # anode channel settings
+        self.dict_mfold_cat = m_fold_dict.get_dict_mfold_cat(*args)
+        # cathode manifold settings
+        self.dict_mfold_ano = m_fold_dict.get_dict_mfold_ano(*args)
+        # anode manifold settings
+        self.dict_electrical_coupling = \
+            el_cpl_dict.get_dict_electrical_coupling(*args)
+        # electrical coupling settings
+        self.dict_temp_sys = therm_dict.get_dict_temp_sys(*args)
+        # temperature system settings
+
+        """Gas and water properties"""
+        self.gas_mix = {'cathode': g_fit.GasMixture((g_fit.oxygen,
+                                                     g_fit.water,
+                                                     g_fit.nitrogen)),
+                        'anode': g_fit.GasMixture((g_fit.hydrogen,
+                                                   g_fit.water,
+                                                   g_fit.nitrogen))}
+        # species property fits of the cathode and anode gas
+        self.water = copy.copy(w_prop.water)
+        # liquid water
+        if self.dict_simulation['property_backend'] == 'table':
+            for item in list(self.gas_mix.values()) + [self.water]:
+                item.set_tables(self.dict_simulation
+                                ['property_table_temp_range'],
+                                self.dict_simulation['property_table_points'],
+                                self.dict_simulation
+                                ['property_table_interpolation'],
+                                self.dict_simulation
+                                ['property_table_tolerance'])
+
+    def set_elements(self, elements):
+        """
+        Sets the number of elements along the channel
+        of the next stack set up.
+
+            Manipulate:
+            -self.dict_case
+            -self.dict_electrical_coupling
+            -self.dict_temp_sys
+        """
+        self.dict_case['elements'] = elements
+        self.dict_case['nodes'] = elements + 1
+        self.dict_electrical_coupling['dx'] = \
+            self.geom.channel_length / float(elements)
+        self.dict_temp_sys['nodes'] = elements + 1
+        self.dict_temp_sys['heat_pow'] = \
+            self.op_con.endplates_heat_power / float(elements)
+
+    def get_settings(self):
+        """
+        Returns the input settings as {input name: {name: value}}.
+        """
+        return {'simulation': vars(self.sim),
+                'operating_conditions': vars(self.op_con),
+                'geometry': vars(self.geom),
+                'physical_properties': vars(self.phy_prop)}
@@ -1,16 +1,15 @@
-import input.operating_conditions as op_con
-import input.geometry as geom
-import input.simulation as sim
-
-
-dict_electrical_coupling =\
-    {
+def get_dict_electrical_coupling(sim, op_con, geom, phy_prop):
+    """
+    Returns the electrical coupling settings of the given input settings.
+    """
+    return {
         'cell_numb': op_con.cell_number,
         'dx': geom.channel_length / float(sim.elements),
         'th_bpp': geom.bipolar_plate_thickness,
         'width_channels': geom.channel_width * geom.gas_channel_number
-                          + geom.rack_width * (geom.gas_channel_number + 1)
-    }
+                          + geom.rack_width * (geom.gas_channel_number + 1),
+        'show_it_output': sim.show_iteration_output
+        }
 
 
 def electrical_coupling(v_loss, r_cell):
@@ -1,4 +1,5 @@
 import numpy as np
+import data.property_table as p_tab
 "This file contains there species equation fit data and equation methods "
 
 
@@ -87,6 +88,55 @@ class Gas:
         return lambda_1_bar + (p - 1.e5) / 9.e5 * (lambda_10_bar-lambda_1_bar)
 
 
+class GasMixture:
+
+    def __init__(self, species):
+        self.species = species
+        # Gas objects of the species
+        self.param = np.array([[item.cp_param for item in species],
+                               [item.viscosity_param for item in species],
+                               [item.lambda_param[1] for item in species],
+                               [item.lambda_param[0] for item in species]])
+        self.param = np.reshape(self.param, (-1, self.param.shape[-1]))
+        # fit parameters of cp, viscosity and the conductivity
+        # at 10 and 1 bar of all species, [property * species][power]
+        self.table = None
+        # temperature table of all fits, None evaluates the fits
+
+    def set_tables(self, temp_range, temp_num, interpolation, tolerance):
+        """
+        Precomputes one temperature table of all property fits
+        of all species, which is refined until the maximal
+        relative interpolation error is below the tolerance.
+        """
+        self.table = p_tab.PropertyTable(self.param, temp_range, temp_num,
+                                         interpolation, tolerance)
+
+    def calc_properties(self, temp, p):
+        """
+        Calculates cp, viscosity and the conductivity of all species
+        as [property][species] + the shape of temp.
+        The power basis of the temperature is built once and
+        all fits are evaluated with a single matrix product.
+        With a table, all fits are interpolated in the same table steps.
+        """
+        temp = np.asarray(temp)
+        if self.table is not None:
+            val = self.table.calc(temp)
+        else:
+            basis = np.ones((self.param.shape[-1], temp.size))
+            for q in range(len(basis) - 2, -1, -1):
+                basis[q] = basis[q + 1] * np.ravel(temp)
+            # temperature powers in descending order as the fit parameters
+            val = np.dot(self.param, basis)
+        val = np.reshape(val, (4, len(self.species)) + temp.shape)
+        val[2] -= val[3]
+        val[2] *= (p - 1.e5) / 9.e5
+        val[2] += val[3]
+        # conductivity interpolated between 1 and 10 bar
+        return val[:3]
+
+
 hydrogen = Gas(cp_param_hydrogen,
                viscosity_param_hydrogen,
                lambda_param_hydrogen)
@@ -1,30 +1,40 @@
-import copy as copy
 import numpy as np
-import input.operating_conditions as op_con
-import input.geometry as geom
-import input.physical_properties as phy_prop
 
 
-dict_mfold_cat = {
-    'cell_num': op_con.cell_number,
-    'channel_numb': geom.gas_channel_number,
-    'header_width': geom.manifold_width,
-    'header_height': geom.manifold_height,
-    'kf': phy_prop.manifold_pressure_loss_coefficient,
-    'cell_height': np.full(op_con.cell_number,
-                           2. * (geom.bipolar_plate_thickness
-                                 + geom.gas_diffusion_layer_thickness
-                                 + geom.catalyst_layer_thickness)
-                           + geom.membrane_thickness),
-    'cell_channel_length': np.full(op_con.cell_number, geom.channel_length),
-    'cell_channel_cross_area': np.full(op_con.cell_number,
-                                       geom.channel_width
-                                       * geom.channel_height),
-    'p_out': op_con.p_manifold_cathode_out
-    }
+def get_dict_mfold_cat(sim, op_con, geom, phy_prop):
+    """
+    Returns the cathode manifold settings of the given input settings.
+    """
+    return {
+        'cell_num': op_con.cell_number,
+        'channel_numb': geom.gas_channel_number,
+        'header_width': geom.manifold_width,
+        'header_height': geom.manifold_height,
+        'kf': phy_prop.manifold_pressure_loss_coefficient,
+        'cell_height': np.full(op_con.cell_number,
+                               2. * (geom.bipolar_plate_thickness
+                                     + geom.gas_diffusion_layer_thickness
+                                     + geom.catalyst_layer_thickness)
+                               + geom.membrane_thickness),
+        'cell_channel_length': np.full(op_con.cell_number, geom.channel_length),
+        'cell_channel_cross_area': np.full(op_con.cell_number,
+                                           geom.channel_width
+                                           * geom.channel_height),
+        'p_out': op_con.p_manifold_cathode_out,
+        'solver': sim.flow_distribution_solver,
+        'newton_criteria': sim.flow_distribution_criteria,
+        'newton_max_iteration': sim.flow_distribution_max_iteration,
+        'show_it_output': sim.show_iteration_output
+        }
 
-dict_mfold_ano = copy.copy(dict_mfold_cat)
-dict_mfold_ano['p_out'] = op_con.p_manifold_anode_out
+
+def get_dict_mfold_ano(sim, op_con, geom, phy_prop):
+    """
+    Returns the anode manifold settings of the given input settings.
+    """
+    dict_mfold_ano = get_dict_mfold_cat(sim, op_con, geom, phy_prop)
+    dict_mfold_ano['p_out'] = op_con.p_manifold_anode_out
+    return dict_mfold_ano
 
 
 def manifold(mol_flow, cell_temp, cell_cp, cell_visc,
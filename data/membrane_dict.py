@@ -0,0 +1,12 @@
+def get_dict_membrane(sim, op_con, geom, phy_prop):
+    """
+    Returns the membrane settings of the given input settings.
+    """
+    # still in search for shortings to replace mem_bas_r and mem_acl_r
+    return {
+        'model': op_con.membrane_model,
+        'calc_cross_flux': op_con.pem_type is False,
+        'th_mem': geom.membrane_thickness,
+        'mem_base_r': phy_prop.membrane_basic_resistance,
+        'mem_acl_r': phy_prop.membrane_temperature_resistance
+        }
@@ -0,0 +1,112 @@
+import numpy as np
+"This file contains the temperature tables of the property equation fits"
+
+
+class PropertyTable:
+
+    def __init__(self, param, temp_range, temp_num, interpolation,
+                 tolerance, max_refinement=10):
+        self.param = np.reshape(param, (-1, np.shape(param)[-1]))
+        # polynomial fit parameters of the properties, [fit][power]
+        self.shape = np.shape(param)[:-1]
+        # shape of the fits, () for a single fit
+        self.interpolation = interpolation
+        # interpolation of the table, 'linear' or 'cubic'
+        self.temp_min, self.temp_max = temp_range
+        # temperature range of the table
+        self.d_temp = None
+        # temperature step of the table
+        self.coef = None
+        # polynomial coefficients of the interpolation in each table step
+        self.max_error = None
+        # maximal relative interpolation error over the table range,
+        # checked at ten points per table step
+        self.temp_num = temp_num
+        # number of temperature points of the table,
+        # the step is halved until the tolerance is met
+        self.calc_coef(self.temp_num)
+        self.max_error = self.calc_max_error()
+        for q in range(max_refinement):
+            if self.max_error <= tolerance:
+                break
+            error_old = self.max_error
+            self.temp_num = 2 * self.temp_num - 1
+            self.calc_coef(self.temp_num)
+            self.max_error = self.calc_max_error()
+            if self.max_error > .5 * error_old:
+                break
+            # the round-off of the fits limits the error
+        if self.max_error > tolerance:
+            raise ValueError('the relative interpolation error '
+                             + str(self.max_error) + ' of the property table'
+                             ' exceeds the tolerance ' + str(tolerance)
+                             + ' with ' + str(self.temp_num) + ' points')
+
+    def calc_coef(self, temp_num):
+        """
+        Calculates the coefficients of the linear or cubic hermite
+        interpolation of the fits for the given number of table points.
+
+            Manipulate:
+            -self.d_temp
+            -self.coef
+        """
+        self.d_temp = (self.temp_max - self.temp_min) / (temp_num - 1)
+        temp = np.linspace(self.temp_min, self.temp_max, temp_num)
+        val = self.calc_fit(temp)
+        # property values at the table temperatures
+        self.coef = [val[:, :-1], val[:, 1:] - val[:, :-1]]
+        # coefficients of each fit and table step in powers
+        # of the normalized temperature within the step
+        if self.interpolation == 'cubic':
+            der = np.array([np.polyval(np.polyder(item), temp)
+                            for item in self.param]) * self.d_temp
+            # derivatives scaled by the temperature step
+            self.coef = [val[:, :-1], der[:, :-1],
+                         3. * (val[:, 1:] - val[:, :-1])
+                         - 2. * der[:, :-1] - der[:, 1:],
+                         2. * (val[:, :-1] - val[:, 1:])
+                         + der[:, :-1] + der[:, 1:]]
+
+    def calc_max_error(self):
+        """
+        Calculates the maximal relative deviation of the interpolation
+        from the fits at ten points per table step.
+        """
+        temp = np.linspace(self.temp_min, self.temp_max,
+                           10 * self.coef[0].shape[-1] + 1)
+        ref = self.calc_fit(temp)
+        return np.max(np.abs(self.calc_table(temp) / ref - 1.))
+
+    def calc_fit(self, temp):
+        """
+        Evaluates the polynomial fits as [fit] + the shape of temp.
+        """
+        return np.array([np.polyval(item, temp) for item in self.param])
+
+    def calc_table(self, temp):
+        """
+        Interpolates the fits as [fit] + the shape of temp
+        at temperatures within the table range.
+        """
+        x = (temp - self.temp_min) / self.d_temp
+        i = np.minimum(x.astype(int), self.coef[0].shape[-1] - 1)
+        t = x - i
+        val = self.coef[-1][:, i]
+        for item in self.coef[-2::-1]:
+            val = val * t + item[:, i]
+        return val
+
+    def calc(self, temp):
+        """
+        Interpolates the properties at the given temperatures
+        as the shape of the fits + the shape of temp.
+        If a temperature is outside the table range,
+        the property fits are evaluated for the whole array.
+        """
+        temp = np.asarray(temp)
+        if not np.all((temp >= self.temp_min) & (temp <= self.temp_max)):
+            val = self.calc_fit(temp)
+        else:
+            val = self.calc_table(temp)
+        return np.reshape(val, self.shape + temp.shape)
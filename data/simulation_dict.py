@@ -1,10 +1,28 @@
-import input.simulation as sim
-
-
-simulation = {
-    'maximal_iteration': sim.maximal_number_iteration,
-    'iteration_criteria': sim.convergence_criteria,
-    'save_csv': sim.save_csv_data,
-    'save_plot': sim.save_plot_data,
-    'show_loss': sim.show_voltage_loss
-    }
+def get_dict_simulation(sim, op_con, geom, phy_prop):
+    """
+    Returns the simulation settings of the given input settings.
+    """
+    return {
+        'maximal_iteration': sim.maximal_number_iteration,
+        'iteration_criteria': sim.convergence_criteria,
+        'save_results': sim.save_result_data,
+        'result_format': sim.result_format,
+        'save_csv': sim.save_csv_data,
+        'save_plot': sim.save_plot_data,
+        'async_output': sim.async_output,
+        'output_queue_size': sim.output_queue_size,
+        'plot_workers': sim.plot_workers,
+        'sweep_workers': sim.sweep_workers,
+        'show_loss': sim.show_voltage_loss,
+        'anderson_depth': sim.anderson_depth,
+        'anderson_damping': sim.anderson_damping,
+        'continuation': sim.continuation,
+        'continuation_predictor': sim.continuation_predictor,
+        'grid_levels': sim.grid_sequencing_levels,
+        'grid_criteria': sim.grid_sequencing_criteria,
+        'property_backend': sim.property_backend,
+        'property_table_temp_range': sim.property_table_temp_range,
+        'property_table_points': sim.property_table_points,
+        'property_table_interpolation': sim.property_table_interpolation,
+        'property_table_tolerance': sim.property_table_tolerance
+        }
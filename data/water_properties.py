@@ -1,4 +1,5 @@
 import numpy as np
+import data.property_table as p_tab
 
 
 p_saturation_param = \
@@ -18,11 +19,28 @@ class Fluid:
     def __init__(self, p_sat_param, h_vap_param):
         self.p_sat_param = p_sat_param
         self.h_vap_param = h_vap_param
+        self.tables = None
+        # temperature tables of the saturation pressure and the
+        # vaporization enthalpy, None evaluates the polynomial fits
+
+    def set_tables(self, temp_range, temp_num, interpolation, tolerance):
+        """
+        Precomputes the temperature tables of the properties,
+        which are refined until the maximal relative interpolation error
+        is below the tolerance.
+        """
+        self.tables = [p_tab.PropertyTable(item, temp_range, temp_num,
+                                           interpolation, tolerance)
+                       for item in (self.p_sat_param, self.h_vap_param)]
 
     def calc_p_sat(self, t_in):
+        if self.tables is not None:
+            return self.tables[0].calc(t_in)
         return np.polyval(self.p_sat_param, t_in)
 
     def calc_h_vap(self, t_in):
+        if self.tables is not None:
+            return self.tables[1].calc(t_in)
         return np.polyval(self.h_vap_param, t_in)
 
 
@@ -14,6 +14,9 @@ stoichiometry_cathode = 2.5
 stoichiometry_anode = 2.
 # pem-type (True = HT-PEM, False = NT-PEM)
 pem_type = True
+# membrane resistivity model, 'kvesic', 'springer' or 'gossling',
+# the water cross flux is calculated for the NT-PEM
+membrane_model = 'kvesic'
 
 """"Thermal Settings"""
 # air inlet temperature [K]
@@ -14,6 +14,9 @@ stoichiometry_cathode = 2.
 stoichiometry_anode = 5.
 # pem-type (True = HT-PEM, False = NT-PEM)
 pem_type = False
+# membrane resistivity model, 'kvesic', 'springer' or 'gossling',
+# the water cross flux is calculated for the NT-PEM
+membrane_model = 'springer'
 
 """"Thermal Settings"""
 # air inlet temperature [K]
@@ -7,16 +7,90 @@ elements = 5
 convergence_criteria = 1.e-6
 # maximal number of iterations
 maximal_number_iteration = 2
-# output csv data
+# number of previous iterations used for the anderson mixing
+# of the stack iteration, 0 results in the damped fixed point iteration
+anderson_depth = 8
+# damping factor of the anderson mixing, 1 is undamped
+anderson_damping = 1.
+# keep the stack over the target current densities and start each one
+# from the results of the previous target current density
+continuation = False
+# extrapolate the initial state from the last two target current densities
+continuation_predictor = True
+# number of element grids of the grid sequencing, the stack is solved
+# first on the coarsest grid, each coarser grid halves the elements
+grid_sequencing_levels = 1
+# convergence criteria of the coarse grids
+grid_sequencing_criteria = 1.e-5
+# number of processes solving the target current densities in parallel,
+# only without continuation, each process solves a target current
+# density with a new stack and writes its output
+sweep_workers = 1
+# save all results of each target current density, the inputs and the
+# convergence history in one result container
+save_result_data = False
+# format of the result container, 'npz' writes one compressed file,
+# 'npy' a directory of .npy files, which can be memory mapped
+result_format = 'npz'
+# convert the saved results into csv data
 save_csv_data = False
 # output plots
 save_plot_data = False
+# write the results and plots of a target current density in a
+# background thread while the next one is solved
+async_output = True
+# maximal number of target current densities waiting for their output
+output_queue_size = 2
+# number of processes rendering the plots, 1 renders them one after
+# the other in the simulation process
+plot_workers = 4
 # calculate the PEMFC stack temperatures
 calc_temperature = True
+# solve the coolant and gas channel temperatures implicit
+# together with the layer temperatures
+implicit_fluid_temperature = False
+# solver of the layer temperatures, 'monolithic' solves the whole stack,
+# 'jacobi' and 'gauss_seidel' solve the cells separately and iterate
+# the cell interfaces (only with explicit fluid temperatures)
+thermal_solver = 'monolithic'
+# convergence criteria of the cell interface temperatures [K]
+thermal_block_criteria = 1.e-6
+# maximal number of cell interface iterations
+thermal_block_max_iteration = 1000
+# number of worker threads for the separate cell solves
+thermal_block_workers = 1
+# evaluation of the gas and water properties, 'polynomial' evaluates the
+# property fits, 'table' interpolates tables of the fits precomputed over
+# the temperature range, the maximal relative interpolation error of
+# 2001 points is 3e-8 for 'cubic' and 2e-4 for 'linear' interpolation,
+# the tables are refined until property_table_tolerance is met
+property_backend = 'polynomial'
+# temperature range of the property tables [K], outside of it
+# the property fits are evaluated
+property_table_temp_range = (273.15, 473.15)
+# number of temperature points of the property tables
+property_table_points = 2001
+# interpolation of the property tables, 'linear' or 'cubic'
+property_table_interpolation = 'cubic'
+# maximal relative interpolation error of the property tables, checked
+# against the fits at ten points per table step, the number of points
+# is doubled until it is met, at most ten times, the round-off
+# of the saturation pressure fit limits it to about 5e-8
+property_table_tolerance = 1.e-6
+# evaluate all cells of the stack at once in (cell, node) arrays
+vectorized_cells = False
 # calculate the current density distribution
 calc_current_density = True
 # calculate the flow distribution
 calc_flow_distribution = True
+# solver of the flow distribution, 'reference' corrects the reference
+# cell pressure drop once per iteration, 'newton' solves the header
+# pressures and cell flows together in each iteration
+flow_distribution_solver = 'reference'
+# convergence criteria of the newton flow distribution solver
+flow_distribution_criteria = 1.e-10
+# maximal number of newton iterations of the flow distribution
+flow_distribution_max_iteration = 20
 # calculate the activation voltage losses
 calc_activation_loss = True
 # calculate the membrane voltage losses
@@ -27,4 +101,6 @@ calc_gdl_loss = True
 calc_cl_loss = True
 # show voltage losses in the voltage-current-density-graph
 show_voltage_loss = False
+# print the intermediate results of each iteration
+show_iteration_output = False
 
@@ -1,19 +1,18 @@
-import data.stack_dict as st_dict
-import data.channel_dict as ch_dict
-import data.simulation_dict as sim
-import input.operating_conditions as op_con
+import data.configuration as conf
 import system.stack as st
+import system.anderson_mixing as and_mix
+import system.result_store as res_store
+import system.plot_output as plt_out
 import numpy as np
-import data.global_parameters as g_par
 import system.global_functions as g_func
-import input.geometry as geom
 import cProfile
 import matplotlib.pyplot as plt
 import os
 import errno
 import timeit
-np.set_printoptions(threshold=np.nan, linewidth=10000,
-                    precision=9, suppress=True)
+import copy
+import concurrent.futures as c_fut
+import sys
 
 
 def do_c_profile(func):
@@ -29,36 +28,114 @@ def do_c_profile(func):
     return profiled_func
 
 
+def solve_sweep_point(config, path_output, q, tar_cd):
+    """
+    Solves the load point q of a sweep in a worker process
+    and returns its break_program flag and its saved voltages.
+    """
+    plt.switch_backend('agg')
+    config.dict_simulation = dict(config.dict_simulation, sweep_workers=1,
+                                  async_output=False, plot_workers=1)
+    simulation = Simulation(config, path_output)
+    simulation.solve_load_point(q, tar_cd)
+    simulation.shutdown_block_pool()
+    return simulation.stack.break_program, simulation.get_voltages()
+
+
 class Simulation:
 
-    def __init__(self, dict_simulation):
+    def __init__(self, config, path_output=None):
         # Handover
+        self.config = copy.deepcopy(config)
+        # configuration of the simulation, copied as the number
+        # of elements is changed in its dicts by the grid sequencing
+        dict_simulation = self.config.dict_simulation
+        # simulation settings
+        self.path_output = path_output
+        if path_output is None:
+            self.path_output = os.path.join(os.path.dirname(__file__),
+                                            'output')
+        # directory of the output
+        self.tar_cd = list(self.config.op_con.target_current_density)
+        # target current densities of the load points
         self.it_crit = dict_simulation['iteration_criteria']
         # iteration criteria
         self.max_it = dict_simulation['maximal_iteration']
         # maximal number of iterations before force termination#
+        self.save_results = dict_simulation['save_results']
+        # switch to save the results of each load point
+        self.result_format = dict_simulation['result_format']
+        # format of the result container, 'npz' or 'npy'
         self.save_csv = dict_simulation['save_csv']
-        # switch to save the csv data
+        # switch to convert the saved results into csv data
         self.save_plot = dict_simulation['save_plot']
         # switch to save the plot data
+        self.async_output = dict_simulation['async_output']
+        # switch to write the results and plots of a load point
+        # in a background thread while the next load point is solved
+        self.output_queue_size = dict_simulation['output_queue_size']
+        # maximal number of load points waiting for their output
+        self.plot_workers = dict_simulation['plot_workers']
+        # number of processes rendering the plots
+        self.sweep_workers = dict_simulation['sweep_workers']
+        # number of processes solving the target current densities
+        # in parallel, only without continuation
         self.show_loss = dict_simulation['show_loss']
         # switch to show the single voltage losses in the u-i-graph
-        cell_numb = st_dict.dict_stack['cell_numb']
+        self.anderson = and_mix.AndersonMixing(
+            {'depth': dict_simulation['anderson_depth'],
+             'damping': dict_simulation['anderson_damping']})
+        # acceleration of the stack iteration
+        self.continuation = dict_simulation['continuation']
+        # switch to keep the stack over the current densities and start
+        # each current density from the results of the previous one
+        self.predictor = dict_simulation['continuation_predictor']
+        # switch to extrapolate the initial state
+        # from the results of the last two current densities
+        self.grid_levels = dict_simulation['grid_levels']
+        # number of element grids of the grid sequencing,
+        # each coarser grid has half the elements of the next finer one
+        self.grid_crit = dict_simulation['grid_criteria']
+        # convergence criteria of the coarse grids
+        self.block_workers = 1
+        if self.config.dict_temp_sys['solver'] != 'monolithic':
+            self.block_workers = self.config.dict_temp_sys['block_workers']
+        # number of worker threads of the block thermal solver
+        cell_numb = self.config.dict_stack['cell_numb']
         # number of stack cells
-        nodes = g_par.dict_case['nodes']
+        nodes = self.config.dict_case['nodes']
         # node points of the x-grid
 
         """General variables"""
-        self.delimiter = ','
-        self.csv_format = '%.9e'
         self.stack = None
         # object of the class Stack
+        self.block_pool = None
+        # worker threads of the block thermal solver,
+        # shared by the stacks of all grids and load points
         self.path_plot = None
         # path where the plots of the results gets saved
-        self.path_csv_data = None
-        # path where the csv data of the results gets saved
+        self.path_results = None
+        # path where the results of the load point get saved
+        parallel = self.sweep_workers > 1 and self.continuation is False
+        # the sweep workers write the output of their load points
+        self.output_pool = None
+        # background thread of the output, started with the first output
+        self.output_jobs = []
+        # pending output of the load points
+        self.plot_pool = None
+        # worker processes rendering the plots,
+        # started with the plots of the first load point
+        if self.save_plot is True and self.plot_workers > 1 \
+                and parallel is False:
+            self.plot_pool = plt_out.PlotPool(self.plot_workers)
         self.temp_old = None
         # defined temperature of the last iteration
+        self.tar_cd_conv = []
+        # last converged target current densities
+        self.state_conv = []
+        # stack states of the last converged target current densities
+        self.elements = self.config.dict_case['elements']
+        # number of elements along the channel of the results
         self.mdf_criteria_cat_process = []
         # array of the cathodic mdf criteria over the iterations
         self.mdf_criteria_ano_process = []
@@ -67,6 +144,8 @@ class Simulation:
         # array of the current density criteria over the iterations
         self.temp_criteria_process = []
         # array of the temperature criteria over the iterations
+        self.mdf_converged_process = []
+        # flow distribution convergence flags over the iterations
         self.mdf_criteria_process = []
         # common array of the mdf criteria over the iterations
         self.i_ca_criteria = None
@@ -75,16 +154,6 @@ class Simulation:
         # convergence criteria of the temperature
         self.v = []
         # cell voltage
-        self.mol_flow = np.full((6, cell_numb, nodes), 0.)
-        # molar flow of the species in the channels
-        # 0: oxygen, 1: cathode water, 2: cathode nitrogen,
-        # 3: hydrogen, 4: anode water, 5: anode nitrogen
-        self.gas_con = np.full((6, cell_numb, nodes), 0.)
-        # molar concentration of the species in the gas mixture
-        self.m_f = np.full((6, cell_numb, nodes), 0.)
-        # mass fraction of the species in the gas mixture
-        self.mol_f = np.full((6, cell_numb, nodes), 0.)
-        # molar fraction of the species in the gas mixture
         self.act_loss_cat = np.full((cell_numb, nodes - 1), 0.)
         # cathodic activation voltage loss
         self.act_loss_ano = np.full((cell_numb, nodes - 1), 0.)
@@ -99,76 +168,6 @@ class Simulation:
         # anodic gas diffusion layer diffusion voltage loss
         self.mem_loss = np.full((cell_numb, nodes - 1), 0.)
         # membrane voltage loss
-        self.v_loss = np.full((cell_numb, nodes - 1), 0.)
-        # voltage loss over the stack
-        self.v_cell = np.full((cell_numb, nodes - 1), 0.)
-        # cell voltage
-        self.cp = np.full((6, cell_numb, nodes), 0.)
-        # heat capacity of the species in the gas phase
-        self.lambda_gas = np.full((6, cell_numb, nodes), 0.)
-        # heat conductivity of the species in the gas phase
-        self.visc = np.full((6, cell_numb, nodes), 0.)
-        # viscosity of the species in the gas phase
-        self.r_gas_cat = np.full((cell_numb, nodes), 0.)
-        # gas constant of the gas phase in the cathode channels
-        self.r_gas_ano = np.full((cell_numb, nodes), 0.)
-        # gas constant of the gas phase in the anode channels
-        self.cp_gas_cat = np.full((cell_numb, nodes), 0.)
-        # heat capacitiy of the gas phase in the cathode channels
-        self.cp_gas_ano = np.full((cell_numb, nodes), 0.)
-        # heat capacity of the gas phase in the anode channels
-        self.visc_gas_cat = np.full((cell_numb, nodes), 0.)
-        # viscosity of the gas phase in the cathode channels
-        self.visc_gas_ano = np.full((cell_numb, nodes), 0.)
-        # viscosity of the gas phase in the anode channels
-        self.lambda_gas_cat = np.full((cell_numb, nodes), 0.)
-        # heat conductivity of the gas phase in the cathode channels
-        self.lambda_gas_ano = np.full((cell_numb, nodes), 0.)
-        # heat conductivity of the gas phase in the anode channels
-        self.rho_gas_cat = np.full((cell_numb, nodes), 0.)
-        # density of the gas in the cathode channels
-        self.rho_gas_cat = np.full((cell_numb, nodes), 0.)
-        # density of the gas in the anode channels
-        self.pr_gas_cat = np.full((cell_numb, nodes), 0.)
-        # prandtl number of the gas in the cathode channels
-        self.pr_gas_ano = np.full((cell_numb, nodes), 0.)
-        # prandtl number of the gas in the anode channels
-        self.u_gas_cat = np.full((cell_numb, nodes), 0.)
-        # velocity of the fluid in the cathode channels
-        self.u_gas_ano = np.full((cell_numb, nodes), 0.)
-        # velocity of the fluid in the anode channels
-        self.re_gas_cat = np.full((cell_numb, nodes), 0.)
-        # reynolds number of the fluid in the cathode channels
-        self.re_gas_ano = np.full((cell_numb, nodes), 0.)
-        # reynolds number of the fluid in the anode channels
-        self.p_cat = np.full((cell_numb, nodes), 0.)
-        # pressure in the cathode channels
-        self.p_ano = np.full((cell_numb, nodes), 0.)
-        # pressure in the anode channels
-        self.ht_coef_cat = np.full((cell_numb, nodes), 0.)
-        # heat convection coefficient in the cathode channels
-        self.ht_coef_ano = np.full((cell_numb, nodes), 0.)
-        # heat convection coefficient in the anode channels
-        self.m_flow_fluid_cat = np.full((cell_numb, nodes), 0.)
-        # mass flow of the fluid in the cathode channels
-        self.m_flow_fluid_ano = np.full((cell_numb, nodes), 0.)
-        # mass flow of the fluid in the anode channels
-        self.cp_fluid_cat = np.full((cell_numb, nodes), 0.)
-        # heat capacity of the cathode fluid
-        self.cp_fluid_ano = np.full((cell_numb, nodes), 0.)
-        # heat capacity of the anode fluid
-        self.temp_layer = []
-        # temperature layer of the stack
-        self.temp_fluid_ano = np.full((cell_numb, nodes), 0.)
-        # temperature of the fluid in the anode channels
-        self.temp_fluid_cat = np.full((cell_numb, nodes), 0.)
-        # temperature of the fluid in the cathode channels
-        self.temp_cool = np.full((cell_numb, nodes), 0.)
-        # temperature of the coolant
-        self.stoi_cat = np.full(cell_numb, 0.)
-        # inlet stoichiometry of the cathode channels
-        self.stoi_ano = np.full(cell_numb, 0.)
-        # inlet stoichiometry of the anode channels
         self.act_loss_ui_ano = []
         # average activation voltage loss of the anode
         self.act_loss_ui_cat = []
@@ -183,47 +182,229 @@ class Simulation:
         # average cathode gdl diffusion voltage losses
         self.mem_loss_ui = []
         # average membrane voltage losses
+        self.voltage_names = ['v', 'act_loss_ui_ano', 'act_loss_ui_cat',
+                              'cl_diff_loss_ui_ano', 'cl_diff_loss_ui_cat',
+                              'gdl_diff_loss_ui_ano', 'gdl_diff_loss_ui_cat',
+                              'mem_loss_ui']
+        # lists of the average voltages of the solved load points
 
     # @do_c_profile
     def update(self):
         """
         This function coordinates the program sequence
         """
-        for i, item in enumerate(op_con.target_current_density):
-            g_par.dict_case['tar_cd'] = op_con.target_current_density[i]
-            self.stack = st.Stack(st_dict.dict_stack)
-            statement = True
-            counter = 0
-            while statement is True:
-                self.save_old_value()
-                self.stack.update()
-                if self.stack.break_program is True:
+        n_points = len(self.tar_cd)
+        if self.sweep_workers > 1 and self.continuation is False:
+            n_solved = self.update_parallel()
+        else:
+            n_solved = n_points
+            for i, item in enumerate(self.tar_cd):
+                if self.solve_load_point(i, item) is True:
+                    n_solved = i
                     break
-                self.calc_convergence_criteria()
-                if len(op_con.target_current_density) < 1:
-                    print(counter)
-                counter = counter + 1
-                if ((self.i_ca_criteria < self.it_crit
-                     and self.temp_criteria < self.it_crit) and counter > 10)\
-                        or counter > self.max_it:
-                    statement = False
-            if self.stack.break_program is False:
-                self.mdf_criteria_process =\
-                    (np.array(self.mdf_criteria_ano_process)
-                     + np.array(self.mdf_criteria_cat_process)) * .5
-                self.save_voltages()
-                print(item)
-                if self.save_plot is True:
-                    self.output_plots(str(i))
-                if self.save_csv is True:
-                    self.output_csv(str(i))
+        self.shutdown_block_pool()
+        if n_solved < n_points:
+            self.tar_cd = self.tar_cd[:n_solved]
+            print(self.tar_cd, self.v)
+        self.flush_output()
+        if len(self.tar_cd) > 1:
+            self.plot_polarization_curve()
+
+    def solve_load_point(self, i, tar_cd):
+        """
+        Solves the load point i with the target current density tar_cd,
+        saves its voltages and writes its output.
+        Returns the break_program flag of the stack.
+        """
+        self.config.dict_case['tar_cd'] = tar_cd
+        if self.continuation is True and len(self.state_conv) > 0:
+            self.stack.set_state(self.calc_initial_state(tar_cd))
+        else:
+            self.update_coarse_grids()
+        counter = self.update_stack(self.it_crit)
+        if self.stack.break_program is False:
+            if counter > self.max_it:
+                self.tar_cd_conv = []
+                self.state_conv = []
             else:
-                op_con.target_current_density = \
-                    op_con.target_current_density[0:-i]
-                print(op_con.target_current_density, self.v)
+                self.save_converged_state(tar_cd)
+            self.mdf_criteria_process =\
+                (np.array(self.mdf_criteria_ano_process)
+                 + np.array(self.mdf_criteria_cat_process)) * .5
+            self.save_voltages()
+            print(tar_cd)
+            if self.save_results is True or self.save_plot is True:
+                self.submit_output(str(i), counter, tar_cd)
+            self.reset_criteria_process()
+        return self.stack.break_program
+
+    def update_parallel(self):
+        """
+        Solves the target current densities in self.sweep_workers
+        processes, each load point with a new stack, and collects
+        their voltages in the order of the target current densities.
+        The load points after the first one with an abort of the program
+        are discarded. Returns the number of collected load points.
+
+            Access to:
+            -self.tar_cd
+            -self.config
+            -self.path_output
+
+            Manipulate:
+            -self.v and the lists of the average voltage losses
+        """
+        n_solved = 0
+        with c_fut.ProcessPoolExecutor(max_workers=self.sweep_workers) \
+                as pool:
+            jobs = [pool.submit(solve_sweep_point, self.config,
+                                self.path_output, i, item)
+                    for i, item in enumerate(self.tar_cd)]
+            for item in jobs:
+                break_program, voltages = item.result()
+                if break_program is True:
+                    for job in jobs:
+                        job.cancel()
+                    break
+                for name in self.voltage_names:
+                    getattr(self, name).extend(voltages[name])
+                n_solved += 1
+        return n_solved
+
+    def update_stack(self, it_crit):
+        """
+        This function iterates the stack until the given convergence criteria
+        or the maximal number of iterations is reached
+        and returns the number of iterations.
+        """
+        self.anderson.reset()
+        statement = True
+        counter = 0
+        while statement is True:
+            self.save_old_value()
+            state = self.stack.get_state()
+            self.stack.update()
+            if self.stack.break_program is True:
                 break
-        if len(op_con.target_current_density) > 1:
-            self.plot_polarization_curve()
+            self.calc_convergence_criteria()
+            if len(self.tar_cd) < 1:
+                print(counter)
+            counter = counter + 1
+            if (self.i_ca_criteria < it_crit
+                    and self.temp_criteria < it_crit)\
+                    or counter > self.max_it:
+                statement = False
+            else:
+                self.stack.set_state(
+                    self.anderson.mix(state, self.stack.get_state()))
+        return counter
+
+    def update_coarse_grids(self):
+        """
+        This function sets up a new stack. For the grid sequencing
+        the stack is solved on the coarser grids first,
+        the results of each grid are the initial values of the next finer.
+        A coarse grid with an abort of the program is skipped.
+
+            Access to:
+            -self.grid_levels
+            -self.grid_crit
+            -self.elements
+
+            Manipulate:
+            -self.stack
+            -self.config
+        """
+        stack_coarse = None
+        for q in reversed(range(1, self.grid_levels)):
+            elements = max(self.elements // 2 ** q, 2)
+            if elements == self.elements:
+                continue
+            self.config.set_elements(elements)
+            self.stack = self.create_stack()
+            if stack_coarse is not None:
+                self.stack.interpolate_state(stack_coarse)
+            self.update_stack(self.grid_crit)
+            if self.stack.break_program is False:
+                stack_coarse = self.stack
+        self.config.set_elements(self.elements)
+        self.stack = self.create_stack()
+        if stack_coarse is not None:
+            self.stack.interpolate_state(stack_coarse)
+
+    def create_stack(self):
+        """
+        Sets up a new stack with the current configuration.
+        The worker threads of the block thermal solver are started
+        with the first stack and handed over to all following stacks.
+
+            Access to:
+            -self.config
+            -self.block_workers
+
+            Manipulate:
+            -self.block_pool
+        """
+        if self.block_workers > 1 and self.block_pool is None:
+            self.block_pool = \
+                c_fut.ThreadPoolExecutor(max_workers=self.block_workers)
+        return st.Stack(self.config.dict_stack, self.config, self.block_pool)
+
+    def shutdown_block_pool(self):
+        """
+        Stops the worker threads of the block thermal solver
+        after the last load point.
+
+            Manipulate:
+            -self.block_pool
+        """
+        if self.block_pool is not None:
+            self.block_pool.shutdown(wait=True)
+            self.block_pool = None
+
+    def save_converged_state(self, tar_cd):
+        """
+        Saves the converged stack state of the last two
+        target current densities for the continuation.
+        Without a saved state the next target current density
+        starts from a new stack.
+
+            Access to:
+            -self.stack
+
+            Manipulate:
+            -self.tar_cd_conv
+            -self.state_conv
+        """
+        self.tar_cd_conv = self.tar_cd_conv[-1:] + [tar_cd]
+        self.state_conv = self.state_conv[-1:] + [self.stack.get_state()]
+
+    def calc_initial_state(self, tar_cd):
+        """
+        Calculates the initial stack state of the given target current
+        density from the converged states of the previous ones.
+        The predictor linearly extrapolates the last two states,
+        otherwise the current density of the last state is scaled
+        to the new target current density. If the extrapolation changes
+        the sign of a state variable, the scaled last state is used.
+
+            Access to:
+            -self.tar_cd_conv
+            -self.state_conv
+            -self.predictor
+            -self.stack
+        """
+        state = np.copy(self.state_conv[-1])
+        if self.predictor is True and len(self.state_conv) > 1 \
+                and self.tar_cd_conv[1] != self.tar_cd_conv[0]:
+            fac = (tar_cd - self.tar_cd_conv[1]) \
+                / (self.tar_cd_conv[1] - self.tar_cd_conv[0])
+            state_pre = state + fac * (state - self.state_conv[0])
+            if np.all(state_pre * state >= 0.):
+                return state_pre
+        n_i = self.stack.i_cd.size
+        state[:n_i] *= tar_cd / self.tar_cd_conv[-1]
+        return state
 
     def plot_polarization_curve(self):
         """
@@ -231,11 +412,11 @@ class Simulation:
         current densities and average stack voltages.
         """
         try:
-            os.makedirs(os.path.join(os.path.dirname(__file__), 'output/'))
+            os.makedirs(self.path_output)
         except OSError as e:
             if e.errno != errno.EEXIST:
                 raise
-        cd_array = np.asarray(op_con.target_current_density) * 1.e-4
+        cd_array = np.asarray(self.tar_cd) * 1.e-4
         plt.plot(cd_array, self.v, marker='.', color='k', label='Simulation')
         if self.show_loss is True:
             plt.plot(cd_array, self.mem_loss_ui, color='b', marker='.',
@@ -260,8 +441,8 @@ class Simulation:
         plt.autoscale(tight=True, axis='both', enable=True)
         plt.ylim(0., 1.)
         plt.tight_layout()
-        plt.savefig(os.path.join(os.path.dirname(__file__),
-                                 'output/' + 'Polarization_curve' + '.jpg'))
+        plt.savefig(os.path.join(self.path_output,
+                                 'Polarization_curve' + '.jpg'))
         plt.close()
 
     def save_voltages(self):
@@ -285,6 +466,12 @@ class Simulation:
         self.gdl_diff_loss_ui_cat.append(np.average(self.gdl_diff_loss_cat))
         self.mem_loss_ui.append(np.average(self.mem_loss))
 
+    def get_voltages(self):
+        """
+        Returns the lists of the average voltages of the solved load points.
+        """
+        return {name: getattr(self, name) for name in self.voltage_names}
+
     def calc_convergence_criteria(self):
         """
         Calculates the convergence criteria according to (Koh, 2003)
@@ -301,6 +488,7 @@ class Simulation:
         self.mdf_criteria_cat_process.append(self.stack.cathode_mfd_criteria)
         self.mdf_criteria_ano_process.append(self.stack.anode_mfd_criteria)
         self.i_ca_criteria_process.append(self.i_ca_criteria)
+        self.mdf_converged_process.append(self.stack.mfd_converged)
 
     def save_old_value(self):
         """
@@ -309,256 +497,63 @@ class Simulation:
         """
         self.temp_old = self.stack.temp_sys.temp_layer[0][0, 0]
 
-    def plot_cell_var(self, y_var, y_label, x_label,
-                      y_scale, title, x_lim, x_var, y_lim):
-        """
-        Creates plots by given input values
-        """
-        for l, item in enumerate(self.stack.cells):
-            plt.plot(x_var, eval('self.stack.cells' +
-                                 '['+str(l)+']'+'.' + y_var),
-                     color=plt.cm.coolwarm(l / self.stack.cell_numb),
-                     marker='.')
-        plt.xlabel(x_label, fontsize=16)
-        plt.ylabel(y_label, fontsize=16)
-        plt.yscale(y_scale)
-        plt.tick_params(labelsize=14)
-        plt.autoscale(tight=True, axis='both', enable=True)
-        plt.xlim(x_lim[0], x_lim[1])
-        if y_lim is not False:
-            plt.ylim(y_lim[0], y_lim[1])
-        plt.tight_layout()
-        plt.grid()
-        plt.savefig(self.path_plot + title + '.png')
-        plt.close()
-
     def output_plots(self, q):
         """
-        Coordinates the plot sequence
+        Coordinates the plot sequence. The output fields of the cells
+        are extracted once and the figures are rendered
+        in the worker processes of self.plot_pool, if there are any.
+        Without them, the figures of the background output thread
+        are rendered with the non interactive Agg backend.
         """
-        self.path_plot = os.path.join(os.path.dirname(__file__),
-                                      'output/' + 'case' + q + '/plots' + '/')
+        self.path_plot = os.path.join(self.path_output,
+                                      'case' + q + '/plots' + '/')
         try:
             os.makedirs(self.path_plot)
         except OSError as e:
             if e.errno != errno.EEXIST:
                 raise
-        x_node = np.linspace(0., ch_dict.dict_cathode_channel['channel_length'],
-                             g_par.dict_case['nodes'])
+        nodes = self.elements + 1
+        x_lim = [0., self.config.dict_cathode_channel['channel_length']]
+        x_node = np.linspace(0., x_lim[1], nodes)
         x_ele = g_func.calc_elements_1_d(x_node)
-        g_func.output([self.mdf_criteria_process, self.i_ca_criteria_process,
-                       self.temp_criteria_process], 'ERR', 'Iteration', 'log',
-                      ['k', 'r', 'b'], 'Convergence', 0.,
-                      len(self.temp_criteria_process),
-                      ['Flow Distribution', 'Current Density', 'Temperature'],
-                      self.path_plot)
-        self.mdf_criteria_process = []
-        self.mdf_criteria_ano_process = []
-        self.mdf_criteria_cat_process = []
-        self.temp_criteria_process = []
-        self.i_ca_criteria_process = []
-        g_func.output_x(self.stack.i_cd, x_ele, 'Current Density $[A/m²]$',
-                        'Channel Location $[m]$', 'linear', 'Current Density',
-                        False,
-                        [0., ch_dict.dict_cathode_channel['channel_length']],
-                        self.path_plot)
+        x_label = 'Channel Location $[m]$'
+        jobs = [(g_func.output,
+                 ([self.mdf_criteria_process, self.i_ca_criteria_process,
+                   self.temp_criteria_process], 'ERR', 'Iteration', 'log',
+                  ['k', 'r', 'b'], 'Convergence', 0.,
+                  len(self.temp_criteria_process),
+                  ['Flow Distribution', 'Current Density', 'Temperature'],
+                  self.path_plot)),
+                (g_func.output_x,
+                 (self.stack.i_cd, x_ele, 'Current Density $[A/m²]$',
+                  x_label, 'linear', 'Current Density', False, x_lim,
+                  self.path_plot))]
         if self.stack.cell_numb > 1:
-            g_func.output([self.stack.manifold[0].cell_stoi,
-                           self.stack.manifold[1].cell_stoi],
-                          'Stoichiometry', 'Cell Number', 'linear', ['k', 'r'],
-                          'Stoichimetry Distribution', 0.,
-                          self.stack.cell_numb - 1, ['Cathode', 'Anode'],
-                          self.path_plot)
-            g_func.output([self.stack.manifold[0].cell_stoi/2.5],
-                          'Flow Distribution', 'Cell Number', 'linear', ['k'],
-                          'Distribution', 0.,
-                          self.stack.cell_numb - 1, ['Cathode'],
-                          self.path_plot)
-        self.plot_cell_var('v', 'Voltage $[V]$', 'Channel Location $[m]$',
-                           'linear', 'Cell Voltage',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_ele, [0.52, 0.54])
-        g_func.output_x(self.stack.temp_sys.temp_cool, x_node,
-                        'Coolant Temperature [K]', 'Channel Location $[m]$',
-                        'linear', 'Coolant Temperature', False,
-                        [0., ch_dict.dict_cathode_channel['channel_length']],
-                        self.path_plot)
-        self.plot_cell_var('temp[-1]',
-                           'Anode BPP - GDE Temperature $[K]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Anode Plate - GDE Temperature',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_ele, False)
-        self.plot_cell_var('temp[-2]', 'Anode GDE - MEM Temperature $[K]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Anode GDE - Membrane Temperature',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_ele, False)
-        self.plot_cell_var('temp[2]',
-                           'Cathode GDE - MEM Temperature $[K]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Cathode GDL Temperature',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_ele, False)
-        self.plot_cell_var('cathode.temp_fluid',
-                           'Cathode Fluid Temperature $[K]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Cathode_Channel_Temperature',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('temp[1]', 'Cathode BPP-GDE Temperature $[K]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Cathode GDE - Plate Temperature',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_ele, False)
-        self.plot_cell_var('anode.temp_fluid', 'Anode Fluid Temperature $[K]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Anode_Channel_Temperature',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('temp[0]',
-                           'BPP - BPP Temperature $[K]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Coolant Plate Temperature',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_ele, False)
-        self.plot_cell_var('cathode.mol_flow[0] * 1.e3',
-                           'Cathode Oxygen Molar Flow $[mmol/s]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Cathode Oxygen Molar Flow',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('cathode.mol_flow[1] * 1.e3',
-                           'Cathode Water Molar Flow $[mmol/s]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Cathode Water Molar Flow',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('cathode.mol_flow[2] * 1.e3',
-                           'Cathode Nitrogen Molar Flow $[mmol/s]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Cathode Nitrogen Molar Flow',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('anode.mol_flow[0] * 1.e3',
-                           'Anode Hydrogen Molar Flow $[mmol/s]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Anode Hydrogen Molar Flow',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('anode.mol_flow[1] * 1.e3',
-                           'Anode Water Molar Flow $[mmol/s]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Anode Water Molar Flow',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('anode.mol_flow[2] * 1.e3',
-                           'Anode Nitrogen Molar Flow $[mmol/s]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Anode Nitrogen Molar Flow',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('cathode.mol_f[0]', 'Oxygen  Molar Fraction',
-                           'Channel Location $[m]$', 'linear',
-                           'Oxygen_Molar_Fraction',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('cathode.mol_f[1]',
-                           'Cathode Gas Water Molar Fraction',
-                           'Channel Location $[m]$', 'linear',
-                           'Water Molar Fraction Cathode',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('cathode.mol_f[2]',
-                           'Cathode Nitrogen Molar Fraction',
-                           'Channel Location $[m]$', 'linear',
-                           'Nitrogen_Molar_Fraction_Cathode',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('anode.mol_f[0]', 'Hydrogen Molar Fraction',
-                           'Channel Location $[m]$', 'linear',
-                           'Hydrogen_Molar_Fraction_Anode',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('anode.mol_f[1]', 'Anode Gas Water  Molar Fraction',
-                           'Channel Location $[m]$', 'linear',
-                           'Water_Molar_Fraction_Anode',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('anode.mol_f[2]', 'Anode Nitrogen Molar Fraction',
-                           'Channel Location $[m]$', 'linear',
-                           'Nitrogen_Molar_Fraction_Anode',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('cathode.liq_w_flow * 1.e3',
-                           'Cathode Liquid Water Flow $[mmol/s]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Liquid Water Flow Cathode',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('cathode.cond_rate * 1.e3',
-                           'Cathode Water Condensation Rate $[mmol/s]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Water Condensation Rate Cathode',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('cathode.humidity', 'Cathode Relative Humidity',
-                           'Channel Location $[m]$', 'linear',
-                           'Relative Humidity Cathode',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('cathode.m_flow_gas * 1.e6',
-                           'Cathode Channel Gas Massflow $[mg/s]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Cathode_Channel__Gas_Massflow',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('cathode.m_flow_fluid * 1.e6',
-                           'Cathode Channel Fluid Massflow $[mg/s]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Cathode_Channel_Fluid_Massflow',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('cathode.g_fluid * 1.e3',
-                           'Cathode Capacity Flow $[mW/K]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Cathode Capacity Flow',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('cathode.m_flow_reac * 1.e6',
-                           'Oxygen Massflow $[mg/s]$', 'Channel Location $[m]$',
-                           'linear', 'Oxygen_massflow',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('cathode.m_flow_vap_w * 1.e6',
-                           'Cathode Vapour Massflow $[mg/s]$',
-                           'Channel Location $[m]$',
-                           'linear', 'Vapour Massflow',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('anode.m_flow_reac * 1.e6',
-                           'Hydrogen Massflow $[mg/s]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Hydrogen_massflow',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('cathode.cp_fluid',
-                           'Cathode Heat Capacity $[J/(kgK)]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Cathode Heat Capacity',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('cathode.p', 'Cathode Channel Pressure $[Pa]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Cathode Channel Pressure',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
-        self.plot_cell_var('anode.p', 'Anode Channel Pressure $[Pa]$',
-                           'Channel Location $[m]$', 'linear',
-                           'Anode Channel Pressure',
-                           [0., ch_dict.dict_cathode_channel['channel_length']],
-                           x_node, False)
+            jobs += [(g_func.output,
+                      ([self.stack.manifold[0].cell_stoi,
+                        self.stack.manifold[1].cell_stoi],
+                       'Stoichiometry', 'Cell Number', 'linear', ['k', 'r'],
+                       'Stoichimetry Distribution', 0.,
+                       self.stack.cell_numb - 1, ['Cathode', 'Anode'],
+                       self.path_plot)),
+                     (g_func.output,
+                      ([self.stack.manifold[0].cell_stoi / 2.5],
+                       'Flow Distribution', 'Cell Number', 'linear', ['k'],
+                       'Distribution', 0., self.stack.cell_numb - 1,
+                       ['Cathode'], self.path_plot))]
+        jobs.append((g_func.output_x,
+                     (self.stack.temp_sys.temp_cool, x_node,
+                      'Coolant Temperature [K]', x_label, 'linear',
+                      'Coolant Temperature', False, x_lim, self.path_plot)))
+        fields = plt_out.extract_fields(self.stack.cells)
+        for item in plt_out.cell_fields:
+            x_values = x_ele if item.grid == 'ele' else x_node
+            jobs.append((plt_out.plot_cells,
+                         (fields[item.name], x_values,
+                          plt_out.get_axis_label(item), x_label, item.name,
+                          x_lim, item.y_lim, self.path_plot)))
         # Z-Axis-Temperature Plot
+        geom = self.config.geom
         x_vec_z = np.array([0.,
                            geom.bipolar_plate_thickness,
                            geom.gas_diffusion_layer_thickness,
@@ -577,329 +572,148 @@ class Simulation:
                             geom.bipolar_plate_thickness])
         x = []
         for l in range(self.stack.cell_numb):
-            if l is 0:
+            if l == 0:
                 x.append(x_vec_z)
             elif 0 < l < self.stack.cell_numb - 1:
                 x.append(x_vec_e)
             else:
                 x.append(x_vec_l)
         x = np.cumsum(np.block(x))
-        t = self.stack.temp_sys.temp_layer
-        for w in range(g_par.dict_case['nodes'] - 1):
-            t_vec = []
-            for l in range(self.stack.cell_numb):
-                if l is not self.stack.cell_numb - 1:
-                    t_vec.append(np.array([t[l][0, w], t[l][1, w],
-                                           t[l][2, w], t[l][3, w], t[l][4, w]]))
-                else:
-                    t_vec.append(np.array([t[l][0, w], t[l][1, w], t[l][2, w],
-                                           t[l][3, w], t[l][4, w], t[l][5, w]]))
-            plt.plot(x, np.block(t_vec),
-                     color=plt.cm.coolwarm((w + 1.e-20)
-                                           / float(g_par.dict_case['nodes']
-                                                   - 1.)))
-        plt.xlim(0, x[-1])
-        plt.xlabel('Stack Location $[m]$', fontsize=16)
-        plt.ylabel('Temperature $[K]$', fontsize=16)
-        plt.tick_params(labelsize=14)
-        plt.autoscale(tight=True, axis='both', enable=True)
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.path_plot+'Z-Cut-Temperature' + '.png'))
-        plt.close()
+        jobs.append((plt_out.plot_z_cut,
+                     (list(self.stack.temp_sys.temp_layer), x,
+                      self.path_plot)))
+        if self.plot_pool is None:
+            if self.async_output is True:
+                plt.switch_backend('agg')
+            plt_out.run_jobs(jobs)
+        else:
+            self.plot_pool.run(jobs)
 
         for q in range(self.stack.cell_numb):
             print(np.average(self.stack.i_cd[q, :]))
 
-    def output_csv(self, q):
-        self.path_csv_data = os.path.join(os.path.dirname(__file__),
-                                          'output/' + 'case' + q
-                                          + '/csv_data' + '/')
+    def output(self, q, counter, tar_cd):
+        """
+        Writes the results and plots of the load point q.
+        """
+        if self.save_results is True:
+            self.output_results(q, counter, tar_cd)
+        if self.save_plot is True:
+            self.output_plots(q)
+
+    def submit_output(self, q, counter, tar_cd):
+        """
+        Writes the output of the load point q directly or, if
+        self.async_output is True, hands a snapshot of the converged stack
+        and of the configuration to the background thread.
+        If self.output_queue_size load points are pending,
+        the oldest one is waited for first.
+        An error of the output is raised again in the calling thread.
+
+            Access to:
+            -self.async_output
+            -self.output_queue_size
+
+            Manipulate:
+            -self.output_pool
+            -self.output_jobs
+            -self.plot_pool, started from the calling thread
+        """
+        if self.async_output is False:
+            self.output(q, counter, tar_cd)
+        else:
+            if self.plot_pool is not None:
+                self.plot_pool.start()
+            if self.output_pool is None:
+                self.output_pool = c_fut.ThreadPoolExecutor(max_workers=1)
+            snapshot = copy.copy(self)
+            snapshot.stack = res_store.snapshot_stack(self.stack)
+            snapshot.config = copy.deepcopy(self.config)
+            while len(self.output_jobs) >= max(self.output_queue_size, 1):
+                self.output_jobs.pop(0).result()
+            self.output_jobs.append(
+                self.output_pool.submit(snapshot.output, q, counter, tar_cd))
+
+    def flush_output(self):
+        """
+        Waits until the output of all load points is written,
+        stops the background thread and the plot processes
+        and raises an error of the output again.
+
+            Manipulate:
+            -self.output_jobs
+            -self.output_pool
+            -self.plot_pool
+        """
+        jobs = self.output_jobs
+        self.output_jobs = []
         try:
-            os.makedirs(self.path_csv_data)
-        except OSError as e:
-            if e.errno != errno.EEXIST:
-                raise
-        for w, item in enumerate(self.stack.cells):
-            self.mol_flow[0, w] = item.cathode.mol_flow[0]
-            self.mol_flow[1, w] = item.cathode.mol_flow[1]
-            self.mol_flow[2, w] = item.cathode.mol_flow[2]
-            self.mol_flow[3, w] = item.anode.mol_flow[0]
-            self.mol_flow[4, w] = item.anode.mol_flow[1]
-            self.mol_flow[5, w] = item.anode.mol_flow[2]
-            self.gas_con[0, w] = item.cathode.gas_con[0]
-            self.gas_con[1, w] = item.cathode.gas_con[1]
-            self.gas_con[2, w] = item.cathode.gas_con[2]
-            self.gas_con[3, w] = item.anode.gas_con[0]
-            self.gas_con[4, w] = item.anode.gas_con[1]
-            self.gas_con[5, w] = item.anode.gas_con[2]
-            self.m_f[0, w] = item.cathode.mass_f[0]
-            self.m_f[1, w] = item.cathode.mass_f[1]
-            self.m_f[2, w] = item.cathode.mass_f[2]
-            self.m_f[3, w] = item.anode.mass_f[0]
-            self.m_f[4, w] = item.anode.mass_f[1]
-            self.m_f[5, w] = item.anode.mass_f[2]
-            self.mol_f[0, w] = item.cathode.mol_f[0]
-            self.mol_f[1, w] = item.cathode.mol_f[1]
-            self.mol_f[2, w] = item.cathode.mol_f[2]
-            self.mol_f[3, w] = item.anode.mol_f[0]
-            self.mol_f[4, w] = item.anode.mol_f[1]
-            self.mol_f[5, w] = item.anode.mol_f[2]
-            self.v_loss[w] = item.v_loss
-            self.v_cell[w] = item.v
-            self.cp[0, w] = item.cathode.cp[0]
-            self.cp[1, w] = item.cathode.cp[1]
-            self.cp[2, w] = item.cathode.cp[2]
-            self.cp[3, w] = item.anode.cp[0]
-            self.cp[4, w] = item.anode.cp[1]
-            self.cp[5, w] = item.anode.cp[2]
-            self.lambda_gas[0, w] = item.cathode.lambda_gas[0]
-            self.lambda_gas[1, w] = item.cathode.lambda_gas[1]
-            self.lambda_gas[2, w] = item.cathode.lambda_gas[2]
-            self.lambda_gas[3, w] = item.anode.lambda_gas[0]
-            self.lambda_gas[4, w] = item.anode.lambda_gas[1]
-            self.lambda_gas[5, w] = item.anode.lambda_gas[2]
-            self.visc[0, w] = item.cathode.visc[0]
-            self.visc[1, w] = item.cathode.visc[1]
-            self.visc[2, w] = item.cathode.visc[2]
-            self.visc[3, w] = item.anode.visc[0]
-            self.visc[4, w] = item.anode.visc[1]
-            self.visc[5, w] = item.anode.visc[2]
-            self.r_gas_cat[w] = item.cathode.r_gas
-            self.r_gas_ano[w] = item.anode.r_gas
-            self.cp_gas_cat[w] = item.cathode.cp_gas
-            self.cp_gas_ano[w] = item.anode.cp_gas
-            self.visc_gas_cat[w] = item.cathode.visc_gas
-            self.visc_gas_ano[w] = item.anode.visc_gas
-            self.lambda_gas_cat[w] = item.cathode.lambda_gas
-            self.lambda_gas_ano[w] = item.anode.lambda_gas
-            self.rho_gas_cat[w] = item.cathode.rho_gas
-            self.rho_gas_cat[w] = item.anode.rho_gas
-            self.u_gas_cat[w] = item.cathode.u
-            self.u_gas_ano[w] = item.anode.u
-            self.p_cat[w] = item.cathode.p
-            self.p_ano[w] = item.anode.p
-            self.ht_coef_cat[w] = item.cathode.ht_coef
-            self.ht_coef_ano[w] = item.anode.ht_coef
-            self.cp_fluid_cat[w] = item.cathode.cp_fluid
-            self.cp_fluid_ano[w] = item.anode.cp_fluid
-            self.m_flow_fluid_cat[w] = item.cathode.m_flow_fluid
-            self.m_flow_fluid_ano[w] = item.anode.m_flow_fluid
-            self.temp_fluid_cat[w] = item.cathode.temp_fluid
-            self.temp_fluid_ano[w] = item.anode.temp_fluid
-            self.stoi_cat[w] = item.cathode.stoi
-            self.stoi_ano[w] = item.anode.stoi
-            for q in range(5):
-                self.temp_layer.append(
-                    self.stack.temp_cpl_stack.temp_layer[w][q, :])
-        np.savetxt(self.path_csv_data + 'Temperature Layer.csv',
-                   self.temp_layer, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Coolant Temperature.csv',
-                   self.stack.temp_cpl_stack.temp_cool,
-                   delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Current Density.csv', self.stack.i_ca,
-                   delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Cathode Gas Temperature.csv',
-                   self.temp_fluid_cat, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Anode Gas Temperature.csv',
-                   self.temp_fluid_ano, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Cathode Channel Average Velocity.csv',
-                   self.u_gas_cat, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Anode Channel Average Velocity.csv',
-                   self.u_gas_ano, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Cathode Channel Pressure.csv',
-                   self.p_cat, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Anode Channel Pressure.csv',
-                   self.p_ano, delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Oxygen Molar Flow.csv',
-                   self.mol_flow[0], delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Cathode Water Molar Flow.csv',
-                   self.mol_flow[1], delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Cathode Nitrogen Molar Flow.csv',
-                   self.mol_flow[2], delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Hydrogen Molar Flow.csv',
-                   self.mol_flow[3], delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Anode Water Molar Flow.csv',
-                   self.mol_flow[4], delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Oxygen Molar Concentration.csv',
-                   self.gas_con[0], delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Cathode Water Molar Concentration.csv',
-                   self.gas_con[1], delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Nitrogen Molar Concentration.csv',
-                   self.gas_con[2], delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Hydrogen Molar Concentration.csv',
-                   self.gas_con[3], delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Anode Water Molar Concentration.csv',
-                   self.gas_con[4], delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Oxygen Molar Fraction.csv',
-                   self.mol_f[0], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Cathode Water Molar Fraction.csv',
-                   self.mol_f[1], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Nitrogen Molar Fraction.csv',
-                   self.mol_f[2], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Hydrogen Molar Fraction.csv',
-                   self.mol_f[3], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Anode Water Molar Fraction.csv',
-                   self.mol_f[4], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Oxygen Mass Fraction.csv',
-                   self.mol_f[0], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Cathode Mass Fraction.csv',
-                   self.m_f[1], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Nitrogen Mass Fraction.csv',
-                   self.m_f[2], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Hydrogen Mass Fraction.csv',
-                   self.m_f[3], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Anode Water Mass Fraction.csv',
-                   self.m_f[4], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Cathode Activation Loss.csv',
-                   self.act_loss_cat, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Anode Activation Loss.csv',
-                   self.act_loss_ano, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Cathode Layer Diffusion Loss.csv',
-                   self.cl_diff_loss_cat, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Anode Layer Diffusion Loss.csv',
-                   self.cl_diff_loss_ano, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Cathode GDL Diffusion Loss.csv',
-                   self.gdl_diff_loss_cat, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Anode GDL Diffusion ´Loss.csv',
-                   self.gdl_diff_loss_ano, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Membrane Conductivity Loss.csv',
-                   self.mem_loss, delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Voltage Loss.csv', self.v_loss,
-                   delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Cell Voltage.csv', self.v_cell,
-                   delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Oxygen Heat Capacity.csv',
-                   self.cp[0], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Cathode Gas Water Heat Capacity.csv',
-                   self.cp[1], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Nitrogen Heat Capacity.csv',
-                   self.cp[2], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Hydrogen Heat Capacity.csv',
-                   self.cp[3], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Anode Gas Water Heat Capacity.csv',
-                   self.cp[4], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Oxygen Dynamic Viscosity.csv',
-                   self.visc[0], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Cathode Gas Water Dynamic Viscosity.csv',
-                   self.visc[1], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Nitrogen Dynamic Viscosity.csv',
-                   self.visc[2], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Hydrogen Dynamic Viscosity.csv',
-                   self.visc[3], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Anode Gas Water Dynamic Viscosity.csv',
-                   self.visc[4], delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Oxygen Thermal Conductivity.csv',
-                   self.lambda_gas[0], delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Cathode Gas Water Thermal Conductivity.csv',
-                   self.lambda_gas[1], delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Nitrogen Thermal Conductivity.csv',
-                   self.lambda_gas[2], delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Hydrogen Thermal Conductivity.csv',
-                   self.lambda_gas[3], delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Anode Water Gas Thermal Conductivity.csv',
-                   self.lambda_gas[4], delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Cathode Channel Mixture Heat Capacity.csv',
-                   self.cp_gas_cat, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Anode Channel Mixture Heat Capacity.csv',
-                   self.cp_gas_ano, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Cathode Channel Mixture Gas Constant.csv',
-                   self.r_gas_cat, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Anode Channel Mixture Gas Constant.csv',
-                   self.r_gas_ano, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Cathode Channel Mixture Dynamic Viscosity.csv',
-                   self.visc_gas_cat,
-                   delimiter=self.delimiter, fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Anode Channel Mixture Dynamic Viscosity.csv',
-                   self.visc_gas_ano, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Cathode Channel Mixture Heat Conductivity.csv',
-                   self.lambda_gas_cat, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Anode Channel Mixture Heat Conductivity.csv',
-                   self.lambda_gas_ano, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Cathode Channel Two Phase Heat Capacity.csv',
-                   self.cp_fluid_cat, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Anode Channel Two Phase Heat Capacity.csv',
-                   self.cp_fluid_ano, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Cathode Channel Gas Phase Density.csv',
-                   self.rho_gas_cat, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Anode Channel Gas Phase Density.csv',
-                   self.rho_gas_cat, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Cathode Channel Two Phase Mass Flow.csv',
-                   self.m_flow_fluid_cat, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Anode Channel Two Phase Mass Flow.csv',
-                   self.m_flow_fluid_ano, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data + 'Air Stoichiometry Distribution.csv',
-                   self.stoi_cat, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Hydrogen Stoichiometry Distribution.csv',
-                   self.stoi_ano, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Cathode Channel Heat Convection Coefficient.csv',
-                   self.ht_coef_cat, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-        np.savetxt(self.path_csv_data
-                   + 'Anode Channel Heat Convection Coefficient.csv',
-                   self.ht_coef_ano, delimiter=self.delimiter,
-                   fmt=self.csv_format)
-
-
-start = timeit.default_timer()
-Simulation_runs = Simulation(sim.simulation)
-Simulation_runs.update()
-stop = timeit.default_timer()
-print('Simulation time:', stop-start)
+            for item in jobs:
+                item.result()
+        finally:
+            if self.output_pool is not None:
+                self.output_pool.shutdown(wait=True)
+                self.output_pool = None
+            if self.plot_pool is not None:
+                self.plot_pool.shutdown()
+
+    def reset_criteria_process(self):
+        """
+        Starts new convergence histories for the next load point.
+        The lists are replaced, not cleared, as the output
+        of the last load point may still be using them.
+        """
+        self.mdf_criteria_process = []
+        self.mdf_criteria_ano_process = []
+        self.mdf_criteria_cat_process = []
+        self.temp_criteria_process = []
+        self.i_ca_criteria_process = []
+        self.mdf_converged_process = []
+
+    def output_results(self, q, counter, tar_cd):
+        """
+        Saves all result fields of the load point, the input settings,
+        the number of iterations and the convergence history
+        in one result container and converts it into csv data
+        if self.save_csv is True.
+
+            Access to:
+            -self.stack
+            -self.result_format
+            -self.save_csv
+            -self.i_ca_criteria_process
+            -self.temp_criteria_process
+            -self.mdf_criteria_process
+            -self.mdf_converged_process
+
+            Manipulate:
+            -self.path_results
+        """
+        path = os.path.join(self.path_output, 'case' + q)
+        results = res_store.gather_results(self.stack)
+        meta = {'tar_cd': tar_cd,
+                'iterations': counter,
+                'converged': counter <= self.max_it,
+                'i_cd_criteria': list(self.i_ca_criteria_process),
+                'temp_criteria': list(self.temp_criteria_process),
+                'mdf_criteria': list(self.mdf_criteria_process),
+                'flow_distribution_converged':
+                    list(self.mdf_converged_process),
+                'settings':
+                    res_store.get_settings(self.config.get_settings())}
+        self.path_results = \
+            res_store.save_results(os.path.join(path, 'results'), results,
+                                   meta, self.result_format)
+        if self.save_csv is True:
+            res_store.export_csv(os.path.join(path, 'csv_data'),
+                                 results, meta)
+
+
+if __name__ == '__main__':
+    np.set_printoptions(threshold=sys.maxsize, linewidth=10000,
+                        precision=9, suppress=True)
+    start = timeit.default_timer()
+    Simulation_runs = Simulation(conf.Configuration())
+    Simulation_runs.update()
+    stop = timeit.default_timer()
+    print('Simulation time:', stop-start)
@@ -0,0 +1,93 @@
+import numpy as np
+
+
+class AndersonMixing:
+
+    def __init__(self, dict_anderson):
+        # Handover
+        self.depth = dict_anderson['depth']
+        # number of previous iterations used for the mixing,
+        # 0 results in the damped fixed point iteration
+        self.damping = dict_anderson['damping']
+        # damping factor of the mixing, 1 is undamped
+        # Variables
+        self.scale = None
+        # reference magnitude of each state variable
+        self.f_old = None
+        # scaled residual of the last iteration
+        self.g_old = None
+        # scaled fixed point evaluation of the last iteration
+        self.d_f = []
+        # residual differences of the previous iterations
+        self.d_g = []
+        # fixed point evaluation differences of the previous iterations
+
+    def reset(self):
+        """
+        Clears the iteration history, e.g. for a new operating point.
+
+            Manipulate:
+            -self.scale
+            -self.f_old
+            -self.g_old
+            -self.d_f
+            -self.d_g
+        """
+        self.scale = None
+        self.f_old = None
+        self.g_old = None
+        self.d_f = []
+        self.d_g = []
+
+    def mix(self, x, g):
+        """
+        Calculates the next state of the fixed point iteration x = g(x)
+        according to (Walker, 2011).
+        The state variables are scaled by their initial magnitude,
+        bounded below by 1e-3 of the largest magnitude,
+        so that variables of different units are weighted alike.
+        If the mixing changes the sign of a state variable,
+        the history is cleared and the damped fixed point step is used.
+        A not finite residual clears the history and returns g.
+
+            Access to:
+            -self.depth
+            -self.damping
+
+            Manipulate:
+            -self.scale
+            -self.f_old
+            -self.g_old
+            -self.d_f
+            -self.d_g
+        """
+        if self.scale is None:
+            self.scale = np.maximum(np.abs(g), 1.e-3 * np.max(np.abs(g)))
+        x = x / self.scale
+        g = g / self.scale
+        f = g - x
+        if not np.all(np.isfinite(f)):
+            scale = self.scale
+            self.reset()
+            return g * scale
+        if self.f_old is not None and self.depth > 0:
+            self.d_f.append(f - self.f_old)
+            self.d_g.append(g - self.g_old)
+            if len(self.d_f) > self.depth:
+                self.d_f.pop(0)
+                self.d_g.pop(0)
+        self.f_old = f
+        self.g_old = g
+        x_new = g - (1. - self.damping) * f
+        if len(self.d_f) > 0:
+            mat_f = np.array(self.d_f).T
+            mat_g = np.array(self.d_g).T
+            gamma = np.linalg.lstsq(mat_f, f, rcond=None)[0]
+            x_mix = x_new - np.dot(mat_g, gamma) \
+                + (1. - self.damping) * np.dot(mat_f, gamma)
+            if np.all(x_mix * g >= 0.):
+                x_new = x_mix
+            else:
+                self.d_f = []
+                self.d_g = []
+        return x_new * self.scale
@@ -1,17 +1,23 @@
 import numpy as np
-import system.global_functions as g_func
-import data.global_parameters as g_par
 import system.half_cell as h_c
-import data.half_cell_dict as hc_dict
+import system.membrane as mem
 
 
 class Cell:
 
-    def __init__(self, dict_cell):
+    def __init__(self, dict_cell, config, cell_numb=None, membrane=None):
         # Handover
-        self.anode = h_c.HalfCell(hc_dict.dict_anode)
+        self.dict_case = config.dict_case
+        # case parameters of the simulation
+        self.cell_numb = cell_numb
+        # number of cells evaluated at once in (cell, node) arrays,
+        # None for a single cell with node arrays
+        dim = () if cell_numb is None else (cell_numb,)
+        # leading shape of the cell dependent arrays
+        self.anode = h_c.HalfCell(config.dict_anode, config, cell_numb)
         # anode - object of the class HalfCell
-        self.cathode = h_c.HalfCell(hc_dict.dict_cathode)
+        self.cathode = h_c.HalfCell(config.dict_cathode, config,
+                                    cell_numb)
         # cathode - object of the class HalfCell
         self.th_mem = dict_cell['th_mem']
         # thickness membrane
@@ -23,25 +29,8 @@ class Cell:
         # heat conductivity of the membrane
         self.temp_cool_in = dict_cell['temp_cool_in']
         # coolant inlet temperature
-        self.mem_base_r = dict_cell['mem_base_r']
-        # basic electrical resistance of the membrane
-        self.mem_acl_r = dict_cell['mem_acl_r']
-        # thermal related electrical resistance gain of the membrane
         self.calc_mem_loss = dict_cell['calc_mem_loss']
 
-        """membrane resistance parameter (Goßling)"""
-        self.fac_res_fit = 0.5913
-        self.fac_res_basic = 0.03
-        self.res_25 = 101249.82 * self.th_mem \
-            + 36.24 * self.th_mem\
-            + 2805.83 * self.th_mem + 0.021
-        self.res_65 = 3842453.95 * self.th_mem\
-            - 0.2775 * self.th_mem\
-            + 2.181 * self.th_mem + 0.029
-        self.fac_m = (np.log10(self.res_65) - np.log10(self.res_25)) / (
-                    (1000. / (65. + 273.15)) - (1000. / 25. + 273.15))
-        self.fac_n = np.log10(self.res_65) - self.fac_m * 1000. / (65. + 273.15)
-
         """heat conductivity along and through the cell layers"""
         self.width_channels = self.cathode.channel.width\
             * self.cathode.channel_numb\
@@ -72,9 +61,15 @@ class Cell:
                         + self.lambda_gde[1] * self.cathode.th_gde))\
             / (2. * self.cathode.channel.dx)
         # heat conductivity alon the gas diffusion electrode and membrane
+        self.membrane = membrane
+        # membrane - object of the class Membrane,
+        # shared by the cells of a stack
+        if self.membrane is None:
+            self.membrane = mem.Membrane(config.dict_membrane, config,
+                                         self.active_area_dx)
 
         """boolean alarms"""
-        self.v_alarm = False
+        self.v_alarm = np.full(dim, False)
         # True if :voltage loss > cell voltage
         self.break_program = False
         # True if the program aborts because of some critical impact
@@ -84,35 +79,45 @@ class Cell:
             + 2. * self.cathode.th_bpp\
             + 2. * self.cathode.th_gde
         # height of the cell
-        nodes = g_par.dict_case['nodes']
+        nodes = self.dict_case['nodes']
         # number of nodes along the channel
-        self.w_cross_flow = np.zeros(nodes-1)
+        self.w_cross_flow = np.zeros(dim + (nodes - 1,))
         # water cross flux through the membrane
-        self.omega_ca = np.zeros(nodes)
+        self.omega_ca = np.zeros(dim + (nodes,))
         # area specific membrane resistance
-        self.v_loss = np.full(nodes - 1, 0.)
+        self.v_loss = np.full(dim + (nodes - 1,), 0.)
         # voltage loss
-        self.temp = np.full((5, nodes - 1), dict_cell['temp_init'])
+        self.temp = np.full((5,) + dim + (nodes - 1,),
+                            dict_cell['temp_init'])
         # layer temperature
-        self.temp_mem = np.zeros(nodes)
+        self.temp_mem = np.zeros(dim + (nodes,))
         # membrane temperature
-        self.i_cd = np.full((nodes - 1), 0.)
+        self.i_cd = np.full(dim + (nodes - 1,), 0.)
         # current density
-        self.omega = np.full(nodes-1, 0.)
+        self.omega = np.full(dim + (nodes - 1,), 0.)
         # membrane resistance
-        self.mem_loss = np.full((nodes - 1), 0.)#
+        self.mem_loss = np.full(dim + (nodes - 1,), 0.)#
         # voltage loss at the membrane
-        self.v = np.full((nodes - 1), 0.)
+        self.v = np.full(dim + (nodes - 1,), 0.)
         # cell voltage
-        self.resistance = np.full((nodes - 1), 0.)
+        self.resistance = np.full(dim + (nodes - 1,), 0.)
         # cell resistance
 
     def update(self):
         """
         This function coordinates the program sequence
         """
+        self.update_half_cells()
+        if self.break_program is False:
+            self.update_membrane()
+            self.update_voltage()
+
+    def update_half_cells(self):
+        """
+        This function updates the membrane temperature and the half cells
+        """
         self.temp_mem = .5 * (self.temp[2] + self.temp[3])
-        if g_par.dict_case['pem_type'] is False:
+        if self.dict_case['pem_type'] is False:
             self.cathode.set_pem_type(False)
             self.anode.set_pem_type(False)
             self.cathode.set_water_cross_flux(self.w_cross_flow)
@@ -128,141 +133,72 @@ class Cell:
         if self.anode.break_program is True\
                 or self.cathode.break_program is True:
             self.break_program = True
-        else:
-            if g_par.dict_case['pem_type'] is False:
-                self.calc_cross_water_flux()
-                self.calc_mem_resistivity_springer()
-            else:
-                self.calc_mem_resistivity_kvesic()
-            self.calc_membrane_loss()
-            self.calc_voltage()
-            self.calc_resistance()
 
-    # def set_current_density(self, i_cd):
-    #     """
-    #     This function sets the current density.
-    #     The current density can be obtained
-    #     from the electrical coupling.
-    #
-    #         Manipulate:
-    #         - self.i_ca, scalar
-    #     """
-    #     self.i_cd = i_cd
-
-    def calc_cross_water_flux(self):
+    def update_membrane(self):
         """
-        Calculates the water cross flux through the membrane
-        according to (Springer, 1991).
-
-            Access to:
-            -g_par.dict_case['vap_m_t_coef']
-            -self.cathode.free_w
-            -self.anode.free_w
-            -g_par.dict_case['mol_con_m']
-            -g_par.dict_uni['F']
-            -self.i_ca
-            -self.temp_mem
-            -self.th_mem
-
-            Manipulate:
-            -self.w_cross_flow
+        This function updates the membrane resistivity and water cross flux
         """
-        vap_coeff = g_par.dict_case['vap_m_temp_coeff']
-        humidity = [self.cathode.humidity, self.anode.humidity]
-        humidity_ele = np.array([g_func.calc_elements_1_d(humidity[0]),
-                                 g_func.calc_elements_1_d(humidity[1])])
-        a = 0.043 + 17.81 * humidity_ele
-        b = -39.85 * humidity_ele ** 2. + 36. * humidity_ele ** 3.
-        free_w_content = a + b
-        zeta_plus = free_w_content[0] + free_w_content[1] \
-                    + self.i_cd / (2. * vap_coeff
-                                   * g_par.dict_case['mol_con_m']
-                                   * g_par.dict_uni['F'])
-        zeta_negative =\
-            (free_w_content[0]
-             - free_w_content[1]
-             + 5. * self.i_cd / (2. * vap_coeff * g_par.dict_case['mol_con_m']
-                                 * g_par.dict_uni['F'])) \
-            / (1. + g_func.dw(self.temp_mem) * zeta_plus
-               / (self.th_mem * vap_coeff))
-        m_c = 0.5 * (zeta_plus + zeta_negative)
-        m_a = 0.5 * (zeta_plus - zeta_negative)
-        self.w_cross_flow = \
-            self.i_cd / g_par.dict_uni['F'] + g_par.dict_case['mol_con_m'] \
-            * g_func.dw(self.temp_mem) * (m_a ** 2. - m_c ** 2.) \
-            / (2. * self.th_mem)
+        self.membrane.update(self.temp_mem, self.cathode.humidity,
+                             self.anode.humidity, self.i_cd)
+        self.set_membrane_values(self.membrane)
 
-    def calc_mem_resistivity_kvesic(self):
+    def update_voltage(self):
+        """
+        This function updates the voltage losses and the cell voltage
         """
-        Calculates the membrane resistivity and resistance
-        according to (Kvesic, 2013).
+        self.calc_membrane_loss()
+        self.calc_voltage()
+        self.calc_resistance()
 
-            Access to:
-            -self.mem_base_r
-            -self.mem_acl_r
-            -self.temp_mem
-            -self.omega_ca
-            -self.cathode.cathode.active_area_dx_ch
+    def set_membrane_values(self, membrane, q=None):
+        """
+        This function sets the results of a Membrane object,
+        of the cell q if the membrane was evaluated for several cells.
 
             Manipulate:
             -self.omega_ca
             -self.omega
+            -self.w_cross_flow
         """
-        self.omega_ca = (self.mem_base_r
-                         - self.mem_acl_r * self.temp_mem) * 1.e-4
-        self.omega = self.omega_ca / self.active_area_dx
-
-    def calc_mem_resistivity_gossling(self):
-        """
-        Calculates the membrane resitace for NT-PEMFC according to Goßling
-        """
-        lambda_x = np.full(g_par.dict_case['nodes'], 0.)
-        res_t = np.exp(self.fac_m * 1.e3 / self.temp_mem + self.fac_n)
-        r_avg = (self.cathode.humidity + self.anode.humidity) * 0.5
-        for q in range(g_par.dict_case['nodes']):
-            if r_avg[q] > 0:
-                lambda_x[q] = 0.3 + 6. * r_avg[q] * (
-                            1. - np.tanh(r_avg[q] - 0.5)) + 3.9 * np.sqrt(
-                    r_avg[q]) * (1. + np.tanh((r_avg[q] - 0.89) / 0.23))
-            else:
-                lambda_x[q] = -1. / (r_avg[q] - (3. + 1. / 3.))
-        a = -0.007442
-        b = 0.006053
-        c = 0.0004702
-        d = 1.144
-        e = 8.
-        res_lambda = a + b * lambda_x + c * np.exp(d * (lambda_x - e))
-        res = res_lambda * res_t / 0.01415
-        rp = self.th_mem / res
-        self.omega_ca = 1.e-4 * (self.fac_res_basic
-                                 + rp * self.fac_res_fit)
-        self.omega = self.omega_ca / self.active_area_dx
+        names = ['omega_ca', 'omega']
+        if membrane.calc_cross_flux is True:
+            names.append('w_cross_flow')
+        for name in names:
+            var = getattr(membrane, name)
+            if q is not None and np.ndim(var) > 0:
+                var = var[q]
+            setattr(self, name, var)
 
-    def calc_mem_resistivity_springer(self):
+    def set_cell_values(self, cell, q):
         """
-        Calculates the membrane resistivity
-        for NT-PEMFC according to (Springer, 1991).
-
-            Access to:
-            -self.cathode.humidity
-            -self.anode.humidity
-            -self.temp_mem
-            -self.th_mem
-            -self.cathode.cathode.active_area_dx_ch
+        This function sets the results of the cell q of the cell arrays
+        to the Cell object of a single cell.
 
             Manipulate:
-            -self.omega_ca
-            -self.omega
+            -cell
+            -cell.cathode
+            -cell.anode
         """
-        humidity = (self.cathode.humidity + self.anode.humidity) * 0.5
-        humidity_ele = g_func.calc_elements_1_d(humidity)
-        a = 0.043 + 17.81 * humidity_ele
-        b = -39.85 * humidity_ele ** 2. + 36. * humidity_ele ** 3.
-        free_water_content = a + b
-        mem_el_con = 0.005139 * free_water_content - 0.00326
-        mem_el_con_temp =\
-            np.exp(1268 * (0.0033 - 1. / self.temp_mem)) * mem_el_con
-        self.omega_ca = self.th_mem / mem_el_con_temp * 1.e-4
+        for name in ('w_cross_flow', 'omega_ca', 'v_loss', 'temp', 'temp_mem',
+                     'i_cd', 'omega', 'mem_loss', 'v', 'resistance'):
+            var = getattr(self, name)
+            if np.ndim(var) > 0:
+                var = var[..., q, :]
+            setattr(cell, name, var)
+        cell.v_alarm = self.v_alarm[q]
+        self.cathode.set_cell_values(cell.cathode, q)
+        self.anode.set_cell_values(cell.anode, q)
+
+    # def set_current_density(self, i_cd):
+    #     """
+    #     This function sets the current density.
+    #     The current density can be obtained
+    #     from the electrical coupling.
+    #
+    #         Manipulate:
+    #         - self.i_ca, scalar
+    #     """
+    #     self.i_cd = i_cd
 
     def calc_membrane_loss(self):
         """
@@ -292,7 +228,7 @@ class Cell:
             -self.mem_loss
             -self.cathode.v_loss
             -self.anode.v_loss
-            -g_par.dict_case['e_0']
+            -self.dict_case['e_0']
 
             Manipulate:
             -self.v_loss
@@ -300,10 +236,11 @@ class Cell:
             -self.v_alarm
         """
         self.v_loss = self.mem_loss + self.cathode.v_loss + self.anode.v_loss
-        if any(self.v_loss) >= g_par.dict_case['e_0']:
-            self.v_alarm = True
-        self.v_loss = np.minimum(self.v_loss, g_par.dict_case['e_0'])
-        self.v = g_par.dict_case['e_0'] - self.v_loss
+        self.v_alarm = np.logical_or(self.v_alarm,
+                                     np.any(self.v_loss, axis=-1)
+                                     >= self.dict_case['e_0'])
+        self.v_loss = np.minimum(self.v_loss, self.dict_case['e_0'])
+        self.v = self.dict_case['e_0'] - self.v_loss
 
     def calc_resistance(self):
         """
@@ -313,11 +250,11 @@ class Cell:
             -self.v_loss
             -self.i_ca
             -self.cathode.th_bpp
-            -g_par.dict_case['plate_resistivity']
+            -self.dict_case['plate_resistivity']
 
             Manipulate:
             -self.resistance
         """
         self.resistance = self.v_loss / self.i_cd + 2. \
-                          * g_par.dict_case['bpp_resistivity'] \
+                          * self.dict_case['bpp_resistivity'] \
                           * self.cathode.th_bpp
@@ -1,12 +1,10 @@
-from data.global_parameters import dict_case
-
 
 class Channel:
 
-    def __init__(self, dict_ch):
+    def __init__(self, dict_ch, config):
         self.length = dict_ch['channel_length']
         # channel length
-        self.dx = self.length / float(dict_case['elements'])
+        self.dx = self.length / float(config.dict_case['elements'])
         # element length
         self.p_out = dict_ch['p_in']
         # inlet pressure
@@ -1,12 +1,14 @@
 import numpy as np
-import data.global_parameters as g_par
+import scipy.linalg as sp_l
 import system.global_functions as g_func
 
 
 class ElectricalCoupling:
 
-    def __init__(self, dict_electrical_coupling_const):
+    def __init__(self, dict_electrical_coupling_const, config):
         # Handover
+        self.dict_case = config.dict_case
+        # case parameters of the simulation
         self.cell_numb = dict_electrical_coupling_const['cell_numb']
         # number of the stack cells
         self.dx = dict_electrical_coupling_const['dx']
@@ -15,15 +17,17 @@ class ElectricalCoupling:
         # thickness of the bipolar plate
         self.width_channels = dict_electrical_coupling_const['width_channels']
         # width of the channel
+        self.show_it_output = dict_electrical_coupling_const['show_it_output']
+        # switch to print the current density of each iteration
         # Variables
-        self.nodes = g_par.dict_case['nodes']
+        self.nodes = self.dict_case['nodes']
         # number of the nodes along the channel
         self.elements = self.nodes - 1
         # number of the elements along the channel
         self.v_end_plate = 0.
         # accumulated voltage loss over the stack at the lower end plate
         c_x = self.width_channels * self.th_plate \
-            / (self.dx * g_par.dict_case['bpp_resistivity'])
+            / (self.dx * self.dict_case['bpp_resistivity'])
         # electrical conductance of the bipolar plate in x-direction
         self.v_loss = []
         # 2-d-array of of the voltage loss over the stack in z-direction
@@ -35,8 +39,9 @@ class ElectricalCoupling:
         self.cell_r = np.full((self.cell_numb, self.elements), 0.)
         # 2-d-array of the combined cell & bipolar plate
         # resistance in z-direction
-        self.mat = np.full((self.elements, self.cell_numb + 1), 0.)
-        # electrical conductance matrix
+        self.mat = None
+        # electrical conductance matrix in banded storage,
+        # row self.elements + i - j holds the entry [i, j]
         self.rhs = np.full((self.cell_numb + 1) * self.elements, 0.)
         # right hand side terms, here the current
         self.i_cd = np.full((self.cell_numb, self.elements), 0.)
@@ -50,9 +55,13 @@ class ElectricalCoupling:
         # bipolar conductance side 1-d-array of the over one cell
         c_x_stack_sr = np.tile(2. * c_x_cell_sr, self.cell_numb - 1)
         # bipolar conductance side 1-d-array of the over the stack
-        self.mat_const = - np.diag(c_x_stack)\
-            + np.diag(c_x_stack_sr[:-1], 1)\
-            + np.diag(c_x_stack_sr[:-1], -1)
+        self.mat_const = \
+            np.full((2 * self.elements + 1, len(c_x_stack)), 0.)
+        # constant in-plane conductance matrix in banded storage,
+        # the bandwidth is given by the number of elements
+        self.mat_const[self.elements] -= c_x_stack
+        self.mat_const[self.elements - 1, 1:] += c_x_stack_sr[:-1]
+        self.mat_const[self.elements + 1, :-1] += c_x_stack_sr[:-1]
 
     def update_values(self, dict_electrical_coupling_dyn):
         """
@@ -83,7 +92,9 @@ class ElectricalCoupling:
 
     def update_mat(self):
         """
-        This function updates the conductance matrix
+        This function updates the conductance matrix in banded storage.
+        Only the main diagonal and the outermost bands
+        of the cell conductance change over the iterations.
 
             Access to:
             -self.mat_const
@@ -94,12 +105,11 @@ class ElectricalCoupling:
             Manipulate:
             -self.mat
         """
-        self.mat = self.mat_const\
-            - np.diag(self.cell_c_mid, 0)\
-            + np.diag(self.cell_c[:-self.elements][self.elements:],
-                      self.elements)\
-            + np.diag(self.cell_c[:-self.elements][self.elements:],
-                      -self.elements)
+        cell_c_side = self.cell_c[:-self.elements][self.elements:]
+        self.mat = np.copy(self.mat_const)
+        self.mat[self.elements] -= self.cell_c_mid
+        self.mat[0, self.elements:] += cell_c_side
+        self.mat[-1, :-self.elements] += cell_c_side
 
     def update_right_side(self):
         """
@@ -134,18 +144,20 @@ class ElectricalCoupling:
             -self.cell_r
             -self.cell_numb
             -self.nodes
-            -g_par.dict_case['tar_cd']
+            -self.dict_case['tar_cd']
 
             Manipulate:
             -self.i_ca
         """
-        v_new = np.linalg.tensorsolve(self.mat, self.rhs)
+        v_new = sp_l.solve_banded((self.elements, self.elements),
+                                  self.mat, self.rhs, check_finite=False)
         v_new = np.hstack((np.full(self.elements, self.v_end_plate),
                            v_new, np.full(self.elements, 0.)))
         v_dif = v_new[:-self.elements] - v_new[self.elements:]
         i_ca_vec = v_dif / self.cell_r
         i_cd = g_func.to_array(i_ca_vec, self.cell_numb, self.elements)
-        print(i_cd)
-        self.i_cd = i_cd / np.average(i_cd) * g_par.dict_case['tar_cd']
-        print(self.i_cd)
-        print(g_par.dict_case['tar_cd'])
+        self.i_cd = i_cd / np.average(i_cd) * self.dict_case['tar_cd']
+        if self.show_it_output is True:
+            print(i_cd)
+            print(self.i_cd)
+            print(self.dict_case['tar_cd'])
@@ -19,9 +19,28 @@ def to_array(var, m, n):
 
 def calc_dif(vec):
     """
-    Calculates the difference between the i+1 and i position of an 1-d-array.
+    Calculates the difference between the i+1 and i position
+    along the last axis of an array.
     """
-    return vec[:-1] - vec[1:]
+    return vec[..., :-1] - vec[..., 1:]
+
+
+def calc_fwd_sum(vec):
+    """
+    Calculates the cumulative sum from the first position
+    along the last axis of an array.
+    Replaces the product with a lower triangular matrix of ones.
+    """
+    return np.cumsum(vec, axis=-1)
+
+
+def calc_bwd_sum(vec):
+    """
+    Calculates the cumulative sum from the last position
+    along the last axis of an array.
+    Replaces the product with an upper triangular matrix of ones.
+    """
+    return np.cumsum(vec[..., ::-1], axis=-1)[..., ::-1]
 
 
 def calc_rho(p, r, t):
@@ -41,15 +60,24 @@ def calc_reynolds_number(roh, v, d, visc):
 def calc_fan_fri_fac(re):
     """
     Calculates the fanning friction factor between a wall
-    and a fluid for the laminar and turbulent case.
+    and a fluid for the laminar and turbulent case,
+    elementwise for arrays of any shape.
     """
-    f = np.full(len(re), 0.)
-    for q, item in enumerate(re):
-        if 0. <= re[q] <= 2100.:
-            f[q] = 16./re[q]
-        else:
-            f[q] = 0.079 * re[q]**-0.25
-    return f
+    re = np.asarray(re)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where((re >= 0.) & (re <= 2100.),
+                        16. / re, 0.079 * re ** -0.25)
+
+
+def calc_fan_fri_fac_deriv(re):
+    """
+    Calculates the derivative of the fanning friction factor
+    of calc_fan_fri_fac with respect to the reynolds number.
+    """
+    re = np.asarray(re)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where((re >= 0.) & (re <= 2100.),
+                        -16. / np.square(re), -0.01975 * re ** -1.25)
 
 
 def calc_head_p_drop(rho, v1, v2, f, kf, le, dh):
@@ -62,58 +90,80 @@ def calc_head_p_drop(rho, v1, v2, f, kf, le, dh):
     return rho * (a + b)
 
 
+def calc_head_p_drop_deriv(rho, v1, v2, f, kf, le, dh):
+    """
+    Calculates the derivatives of the t-junction pressure drop
+    of calc_head_p_drop with respect to rho, v1, v2 and f.
+    """
+    g = 2. * f * le / dh + kf * .5
+    d_rho = (np.square(v1) - np.square(v2)) * .5 + np.square(v2) * g
+    d_v1 = rho * v1
+    d_v2 = rho * v2 * (2. * g - 1.)
+    d_f = rho * np.square(v2) * 2. * le / dh
+    return d_rho, d_v1, d_v2, d_f
+
+
 def calc_visc_mix(visc, mol_f, mol_m):
     """
     Calculates the mixture viscosity of a gas acording to Herning ad Zipperer.
+    The species are given along the first axis.
     """
-    visc = np.array(visc).transpose()
-    mol_f = np.array(mol_f).transpose()
-    visc_mix = []
-    for q, item in enumerate(visc):
-        denominator = sum(item * mol_f[q] * np.sqrt(mol_m))
-        divisor = sum(mol_f[q] * np.sqrt(mol_m))
-        visc_mix.append(denominator / divisor)
-    return visc_mix
+    visc = np.asarray(visc)
+    mol_f = np.asarray(mol_f)
+    sqrt_m = np.reshape(np.sqrt(mol_m), (-1,) + (1,) * (mol_f.ndim - 1))
+    var = mol_f * sqrt_m
+    return np.sum(visc * var, axis=0) / np.sum(var, axis=0)
 
 
-def calc_psi(visc, mol_w):
+def calc_psi_const(mol_w):
+    """
+    Calculates the temperature independent factors of the wilke coefficients
+    from the molar masses, [q, w] for the species combination q, w.
+    """
+    mol_w = np.asarray(mol_w)
+    a = (mol_w / mol_w[:, None]) ** 0.25
+    b = np.sqrt(8.) * (1. + mol_w[:, None] / mol_w) ** 0.5
+    return a, b
+
+
+def calc_psi(visc, mol_w, psi_const=None):
     """
     Calculates the wilke coefficients for each species combination of a gas.
+    The species combination q, w is given along the first two axes.
     """
-    psi = []
-    for q in range(len(visc)):
-        for w in range(len(visc)):
-            a = (1. + (visc[q] / visc[w])**0.5
-                 * (mol_w[w] / mol_w[q])**0.25)**2.
-            b = np.sqrt(8.) * (1. + mol_w[q] / mol_w[w])**0.5
-            psi.append(a / b)
+    if psi_const is None:
+        psi_const = calc_psi_const(mol_w)
+    visc = np.asarray(visc)
+    index = (slice(None), slice(None)) + (None,) * (visc.ndim - 1)
+    a = psi_const[0][index]
+    b = psi_const[1][index]
+    sqrt_visc = np.sqrt(visc)
+    psi = sqrt_visc[:, None] / sqrt_visc[None, :]
+    psi *= a
+    psi += 1.
+    np.square(psi, out=psi)
+    psi /= b
     return psi
 
 
-def calc_lambda_mix(lambdax, mol_f, visc, mol_w):
+def calc_lambda_mix(lambdax, mol_f, visc, mol_w, psi_const=None):
     """
     Calculates the heat conductivity of a gas mixture,
     according to Wilkes equation.
+    The species are given along the first axis.
     """
     mol_f[1:] = np.minimum(1.e-20, mol_f[1:])
-    psi = calc_psi(visc, mol_w)
-    counter = 0
-    outcome = 0.
-    for q in range(len(visc)):
-        a = mol_f[q] * lambdax[q]
-        b = 1.e-20
-        for w in range(len(visc)):
-            b = b + mol_f[q] * psi[counter]
-            counter = counter + 1
-        outcome = outcome + a / b
-    return outcome
+    psi = calc_psi(visc, mol_w, psi_const)
+    b = 1.e-20 + mol_f * np.sum(psi, axis=1)
+    return np.sum(mol_f * lambdax / b, axis=0)
 
 
 def calc_elements_1_d(node_vec):
     """
-    Calculates an element 1-d-array from a node 1-d-array.
+    Calculates an element 1-d-array from a node 1-d-array,
+    along the last axis for arrays of several node 1-d-arrays.
     """
-    return np.array((node_vec[:-1] + node_vec[1:])) * .5
+    return np.array((node_vec[..., :-1] + node_vec[..., 1:])) * .5
 
 
 def calc_elements_2d(node_mat):
@@ -129,8 +179,8 @@ def calc_nodes_2_d(ele_mat):
     uses the [:, 1], [:, -2] entries of the calculated node 2-d-array
     to fill the first als last row of the node 2-d-array.
     """
-    mat = np.array((ele_mat[:, :-1] + ele_mat[:, 1:])) * .5
-    return np.hstack([mat[:, [0]], mat, mat[:, [-1]]])
+    mat = np.array((ele_mat[..., :-1] + ele_mat[..., 1:])) * .5
+    return np.concatenate([mat[..., [0]], mat, mat[..., [-1]]], axis=-1)
 
 
 # def i_e_polate_nodes_2_d(ele_vec):
@@ -148,10 +198,36 @@ def calc_nodes_1_d(ele_vec):
     """
     Calculates an node 1-d-array from an element 1-d-array,
     uses the [:, 1], [:, -2] entries of the calculated node 1-d-array
-    to fill the first als last row of the node 1-d-array.
+    to fill the first als last row of the node 1-d-array,
+    along the last axis for arrays of several element 1-d-arrays.
+    """
+    vec = np.array((ele_vec[..., :-1] + ele_vec[..., 1:])) * .5
+    return np.concatenate([vec[..., [0]], vec, vec[..., [-1]]], axis=-1)
+
+
+def interpolate_nodes(node_mat, nodes):
+    """
+    Linearly interpolates an array along its last axis,
+    from its node points onto the given number of equally spaced node points.
+    """
+    node_mat = np.asarray(node_mat)
+    x_old = np.linspace(0., 1., node_mat.shape[-1])
+    x_new = np.linspace(0., 1., nodes)
+    return np.apply_along_axis(lambda y: np.interp(x_new, x_old, y),
+                               -1, node_mat)
+
+
+def interpolate_elements(ele_mat, elements):
+    """
+    Linearly interpolates an array along its last axis,
+    from its element centers onto the centers of the given number
+    of equally spaced elements, the outer elements are extrapolated constant.
     """
-    vec = np.array((ele_vec[:-1] + ele_vec[1:])) * .5
-    return np.hstack([vec[0], vec, vec[-1]])
+    ele_mat = np.asarray(ele_mat)
+    x_old = (np.arange(ele_mat.shape[-1]) + .5) / ele_mat.shape[-1]
+    x_new = (np.arange(elements) + .5) / elements
+    return np.apply_along_axis(lambda y: np.interp(x_new, x_old, y),
+                               -1, ele_mat)
 
 
 # def calc_fluid_water_enthalpy(t):
@@ -216,3 +292,39 @@ def calc_fluid_temp_out(temp_in, temp_wall, g, k):
     The function is limited to cases with g > 0.5 * k.
     """
     return (temp_in * (g - .5 * k) + temp_wall * k) / (g + k * .5)
+
+
+def calc_fluid_temp_march(temp_in, temp_wall, g, k):
+    """
+    Calculates the fluid node temperatures along the last axis
+    by the element relation of calc_fluid_temp_out,
+    starting from the inlet temperature of each channel.
+    The linear recurrence is evaluated with cumulative products and sums
+    for all channels at once. If the cumulative products leave the
+    floating point range, the elements are marched one after another.
+    """
+    a = np.broadcast_to((g - .5 * k) / (g + .5 * k), np.shape(temp_wall))
+    b = temp_wall * k / (g + .5 * k)
+    temp_in = np.broadcast_to(temp_in, np.shape(temp_wall)[:-1])
+    prod = np.cumprod(a, axis=-1)
+    if np.all(a > 0.) and np.all(prod > 1.e-100):
+        temp = prod * (temp_in[..., None] + np.cumsum(b / prod, axis=-1))
+    else:
+        temp = np.empty(np.shape(b))
+        temp_out = temp_in
+        for w in range(temp.shape[-1]):
+            temp_out = a[..., w] * temp_out + b[..., w]
+            temp[..., w] = temp_out
+    return np.concatenate((temp_in[..., None], temp), axis=-1)
+
+
+def calc_band_storage(rows, cols, values, bands, n):
+    """
+    Sorts the entries [rows, cols] of a n x n matrix with the given
+    (lower, upper) bandwidths into the banded storage
+    of scipy.linalg.solve_banded, row bands[1] + i - j
+    holds the entry [i, j].
+    """
+    mat = np.full((bands[0] + bands[1] + 1, n), 0.)
+    mat[bands[1] + rows - cols, cols] = values
+    return mat
@@ -1,12 +1,8 @@
 import warnings
 import system.global_functions as g_func
-import data.water_properties as w_prop
-import data.gas_properties as g_fit
 import numpy as np
 import data.global_parameters as g_par
 import system.channel as ch
-import data.channel_dict as ch_dict
-import input.physical_properties as phy_prop
 
 
 warnings.filterwarnings("ignore")
@@ -14,15 +10,22 @@ warnings.filterwarnings("ignore")
 
 class HalfCell:
 
-    def __init__(self, dict_hc):
-        nodes = g_par.dict_case['nodes']
+    def __init__(self, dict_hc, config, cell_numb=None):
+        self.dict_case = config.dict_case
+        # case parameters of the simulation
+        nodes = self.dict_case['nodes']
         # number of nodes along the channel
+        self.cell_numb = cell_numb
+        # number of cells evaluated at once in (cell, node) arrays,
+        # None for a single cell with node arrays
+        dim = () if cell_numb is None else (cell_numb,)
+        # leading shape of the cell dependent arrays
 
         # check if the object is an anode or a cathode
         # catalyst layer specific handover
         if dict_hc['cl_type'] is True:
-            self.channel = ch.Channel(ch_dict.dict_cathode_channel)
-            self.o2_con_in = phy_prop.oxygen_inlet_concentration
+            self.channel = ch.Channel(config.dict_cathode_channel, config)
+            self.o2_con_in = config.phy_prop.oxygen_inlet_concentration
             # volumetric inlet oxygen ratio
             self.n2o2ratio = (1. - self.o2_con_in) / self.o2_con_in
             # volumetric nitrogen to oxygen ratio
@@ -33,8 +36,8 @@ class HalfCell:
             self.mol_mass = np.array([32., 18., 28.]) * 1.e-3
             # molar mass
         else:
-            self.channel = ch.Channel(ch_dict.dict_anode_channel)
-            self.h2_con_in = phy_prop.hydrogen_inlet_concentration
+            self.channel = ch.Channel(config.dict_anode_channel, config)
+            self.h2_con_in = config.phy_prop.hydrogen_inlet_concentration
             # volumetric inlet hydrogen ratio
             self.n2h2ratio = (1. - self.h2_con_in) / self.h2_con_in
             # volumetric hydrogen to oxygen ratio
@@ -80,22 +83,22 @@ class HalfCell:
         # tafel slope of the electrode
         self.i_sigma = np.sqrt(2. * self.vol_ex_cd * self.prot_con_cl  # could use a better name see (Kulikovsky, 2013) not sure if 2-D exchange current densisty
                                * self.tafel_slope)
-        self.index_cat = g_par.dict_case['nodes'] - 1
+        self.index_cat = np.full(dim, self.dict_case['nodes'] - 1)
         # index of the first element with negative cell voltage
         self.i_ca_char = self.prot_con_cl * self.tafel_slope / self.th_cl  # not sure if the name is ok, i_ca_char is the characteristic current densisty, see (Kulikovsky, 2013)
-        self.act_loss = np.zeros(nodes - 1)
+        self.act_loss = np.zeros(dim + (nodes - 1,))
         # activation voltage loss
-        self.gdl_diff_loss = np.zeros(nodes - 1)
+        self.gdl_diff_loss = np.zeros(dim + (nodes - 1,))
         # diffusion voltage loss at the gas diffusion layer
-        self.cl_diff_loss = np.zeros(nodes - 1)
+        self.cl_diff_loss = np.zeros(dim + (nodes - 1,))
         # diffusion voltage loss at the catalyst layer
-        self.v_loss = np.zeros(nodes-1)
+        self.v_loss = np.zeros(dim + (nodes - 1,))
         # sum of the activation and diffusion voltage loss
-        self.beta = np.zeros(nodes - 1)
+        self.beta = np.zeros(dim + (nodes - 1,))
         # dimensionless parameter
-        self.var = np.zeros(nodes - 1)
+        self.var = np.zeros(dim + (nodes - 1,))
         # term used in multiple functions
-        self.i_ca_square = np.zeros(nodes - 1)
+        self.i_ca_square = np.zeros(dim + (nodes - 1,))
         # current density²
 
         """general parameter"""
@@ -114,94 +117,101 @@ class HalfCell:
         # stoichiometry of the reactant at the channel inlet
         self.p_drop_bends = 0.
         # pressure drop in the channel through bends
-        self.w_cross_flow = np.zeros(nodes - 1)
+        self.w_cross_flow = np.zeros(dim + (nodes - 1,))
         # cross water flux through the membrane
-        self.g_fluid = np.zeros(nodes)
+        self.g_fluid = np.zeros(dim + (nodes,))
         # heat capacity flow of the species mixture including fluid water
-        self.cp_fluid = np.zeros(nodes)
+        self.cp_fluid = np.zeros(dim + (nodes,))
         # heat capacity of the species mixture including fluid water
-        self.Re = np.zeros(nodes)
+        self.Re = np.zeros(dim + (nodes,))
         # reynolds number
-        self.liq_w_flow = np.zeros(nodes)
+        self.liq_w_flow = np.zeros(dim + (nodes,))
         # molar liquid water flux
-        self.p = np.full(nodes, self.channel.p_out)
+        self.p = np.full(dim + (nodes,), self.channel.p_out)
         # channel pressure
-        self.cond_rate = np.zeros(nodes)
+        self.cond_rate = np.zeros(dim + (nodes,))
         # condensation rate of water
-        self.humidity = np.zeros(nodes)
+        self.humidity = np.zeros(dim + (nodes,))
         # gas mixture humidity
-        self.free_w = np.zeros(nodes)
+        self.free_w = np.zeros(dim + (nodes,))
         # fre water content in the membrane, (Chang, 2007)
-        self.i_ca = np.full(nodes - 1, g_par.dict_case['tar_cd'])
+        self.i_ca = np.full(dim + (nodes - 1,), self.dict_case['tar_cd'])
         # current density
-        self.u = np.zeros(nodes)
+        self.u = np.zeros(dim + (nodes,))
         # channel velocity
-        self.fwd_mat = np.tril(np.full((nodes - 1, nodes - 1), 1.))
-        # forward matrix
-        self.bwd_mat = np.triu(np.full((nodes - 1, nodes - 1), 1.))
-        # backward matrix
-        self.m_flow_gas = np.zeros(nodes)
+        self.m_flow_gas = np.zeros(dim + (nodes,))
         # mass flow of the gas mixture
-        self.m_flow_reac = np.zeros(nodes)
+        self.m_flow_reac = np.zeros(dim + (nodes,))
         # reactant mass flow
-        self.m_flow_liq_w = np.zeros(nodes)
+        self.m_flow_liq_w = np.zeros(dim + (nodes,))
         # liquid water mass flow
-        self.m_flow_vap_w = np.zeros(nodes)
+        self.m_flow_vap_w = np.zeros(dim + (nodes,))
         # steam mass flow
-        self.m_flow_reac_delta = np.zeros(nodes)
+        self.m_flow_reac_delta = np.zeros(dim + (nodes,))
         # change of the reactant mass fow over dx
-        self.m_flow_vap_water_delta = np.zeros(nodes)
+        self.m_flow_vap_water_delta = np.zeros(dim + (nodes,))
         # change of the steam mass flow over dx
-        self.m_flow_fluid = np.zeros(nodes)
+        self.m_flow_fluid = np.zeros(dim + (nodes,))
         # fluid mass flow
-        self.q_gas = np.zeros(nodes)
+        self.q_gas = np.zeros(dim + (nodes,))
         # molar flux of the gas phase
-        self.mol_flow = np.full((self.spec_num, nodes), 0.)
+        self.mol_flow = np.full((self.spec_num,) + dim + (nodes,), 0.)
         # molar flow of each species, 0: Reactant, 1: Water 2: Nitrogen
-        self.gas_con = np.full((self.spec_num, nodes), 0.)
+        self.gas_con = np.full((self.spec_num,) + dim + (nodes,), 0.)
         # molar concentration of each species, 0: Reactant, 1: Water 2: Nitrogen
-        self.gas_con_ele = np.full((nodes-1), 0.)
+        self.gas_con_ele = np.full(dim + (nodes - 1,), 0.)
         # element based molar concentration of the reactant
-        self.temp_fluid = np.full(nodes, self.channel.temp_in)
+        self.temp_fluid = np.full(dim + (nodes,), self.channel.temp_in)
         # temperature of the fluid in the channel
-        self.rho_gas = np.full(nodes, 1.)
+        self.rho_gas = np.full(dim + (nodes,), 1.)
         # density of the gas phase
-        self.visc_gas = np.full(nodes, 1.e-5)
+        self.visc_gas = np.full(dim + (nodes,), 1.e-5)
         # viscosity of the gas phase
         self.Nu = 3.66
         # nusselt number
-        self.mol_f = np.full((self.spec_num, nodes), 0.)
+        self.mol_f = np.full((self.spec_num,) + dim + (nodes,), 0.)
         # molar fraction of the species in the gas phase
-        self.mass_f = np.full((self.spec_num, nodes), 0.)
+        self.mass_f = np.full((self.spec_num,) + dim + (nodes,), 0.)
         # mass fraction of the species in the gas phase
-        self.r_gas = np.full((self.spec_num, nodes), 0.)
+        self.r_gas = np.full((self.spec_num,) + dim + (nodes,), 0.)
         # gas constant of the gas phase
         self.r_species = np.full(self.spec_num, 0.)
         # gas constant of the species
-        self.cp = np.full((self.spec_num, nodes), 0.)
+        self.cp = np.full((self.spec_num,) + dim + (nodes,), 0.)
         # heat capacity of the species in the gas phase
-        self.lambdas = np.full((self.spec_num, nodes), 0.)
+        self.lambdas = np.full((self.spec_num,) + dim + (nodes,), 0.)
         # heat conductivity of the species in the gas phase
-        self.visc = np.full((self.spec_num, nodes), 0.)
+        self.visc = np.full((self.spec_num,) + dim + (nodes,), 0.)
         # viscosity of the species in the gas phase
-        self.temp_fluid_ele = np.full((nodes - 1), 0.)
+        self.temp_fluid_ele = np.full(dim + (nodes - 1,), 0.)
         # element based temperature of the gas phase
-        self.cp_ele = np.full((nodes-1), 0.)
+        self.cp_ele = np.full(dim + (nodes - 1,), 0.)
         # element based heat capacity of the reactant
-        self.cp_gas = np.zeros(nodes)
+        self.cp_gas = np.zeros(dim + (nodes,))
         # heat capacity of the gas phase
-        self.ht_coef = np.zeros(nodes)
+        self.ht_coef = np.zeros(dim + (nodes,))
         # convection coefficient between the gas phase and the channel
-        self.k_ht_coef_ca = np.zeros(nodes)
+        self.k_ht_coef_ca = np.zeros(dim + (nodes,))
         # heat conductivity between the gas phase and the channel
-        self.cp_gas_ele = np.full((nodes - 1), 0.)
+        self.cp_gas_ele = np.full(dim + (nodes - 1,), 0.)
         # element based heat capacity
-        self.lambda_gas = np.zeros(nodes)
+        self.lambda_gas = np.zeros(dim + (nodes,))
         # heat conductivity of the gas phase
-        self.Pr = np.zeros(nodes)
+        self.Pr = np.zeros(dim + (nodes,))
         # prandtl number of the gas phase
+        self.p_sat = np.zeros(dim + (nodes,))
+        # saturation pressure of the water vapour at the fluid temperature
         for q, item in enumerate(self.mol_mass):
             self.r_species[q] = g_par.dict_uni['R'] / item
+        self.psi_const = g_func.calc_psi_const(self.mol_mass)
+        # temperature independent factors of the wilke coefficients
+        if self.cl_type is True:
+            self.gas_mix = config.gas_mix['cathode']
+        else:
+            self.gas_mix = config.gas_mix['anode']
+        # species property fits of the gas phase
+        self.water = config.water
+        # property fits of liquid water
 
     def update(self):
         """
@@ -240,6 +250,32 @@ class HalfCell:
         self.calc_transport_loss_diffusion_layer()
         self.calc_electrode_loss()
 
+    def set_cell_values(self, half_cell, q):
+        """
+        This function sets the results of the cell q of the cell arrays
+        to the HalfCell object of a single cell.
+
+            Manipulate:
+            -half_cell
+        """
+        for name in ('act_loss', 'gdl_diff_loss', 'cl_diff_loss', 'v_loss',
+                     'var', 'i_ca_square', 'w_cross_flow', 'g_fluid',
+                     'cp_fluid', 'Re', 'liq_w_flow', 'p', 'cond_rate',
+                     'humidity', 'i_ca', 'u', 'm_flow_gas', 'm_flow_reac',
+                     'm_flow_liq_w', 'm_flow_vap_w', 'm_flow_reac_delta',
+                     'm_flow_vap_water_delta', 'm_flow_fluid', 'q_gas',
+                     'mol_flow', 'gas_con', 'gas_con_ele', 'temp_fluid',
+                     'rho_gas', 'visc_gas', 'mol_f', 'mass_f', 'r_gas', 'cp',
+                     'lambdas', 'visc', 'temp_fluid_ele', 'cp_ele', 'cp_gas',
+                     'ht_coef', 'k_ht_coef_ca', 'cp_gas_ele', 'lambda_gas',
+                     'Pr', 'temp', 'p_sat'):
+            var = getattr(self, name)
+            if np.ndim(var) > 0:
+                var = var[..., q, :]
+            setattr(half_cell, name, var)
+        for name in ('stoi', 'p_drop_bends', 'index_cat'):
+            setattr(half_cell, name, getattr(self, name)[q])
+
     def set_current_density(self, i_ca):
         """
         This function sets the current density.
@@ -319,8 +355,8 @@ class HalfCell:
 
             Access too:
             -self.stoi
-            -g_par.dict_case['tar_cd']
-            -g_par.dict_case['F']
+            -self.dict_case['tar_cd']
+            -self.dict_case['F']
             -self.channel.plane
             -self.channel.plane_dx
             -self.i_ca
@@ -334,20 +370,21 @@ class HalfCell:
         """
 
         f = g_par.dict_uni['F']
-        var1 = self.stoi * g_par.dict_case['tar_cd'] \
-            * self.active_area_ch / (self.val_num * f)
+        var1 = np.expand_dims(self.stoi * self.dict_case['tar_cd']
+                              * self.active_area_ch / (self.val_num * f), -1)
         if self.cl_type is True:
-            self.mol_flow[0, 0] = var1
-            self.mol_flow[0, 1:] = var1 - np.matmul(self.fwd_mat, self.i_ca) \
+            self.mol_flow[0, ..., :1] = var1
+            self.mol_flow[0, ..., 1:] = \
+                var1 - g_func.calc_fwd_sum(self.i_ca) \
                 * self.active_area_dx_ch / (self.val_num * f)
 
         else:
-            self.mol_flow[0, -1] = var1
-            self.mol_flow[0, :-1] = var1 - np.matmul(self.bwd_mat, self.i_ca) \
+            self.mol_flow[0, ..., -1:] = var1
+            self.mol_flow[0, ..., :-1] = \
+                var1 - g_func.calc_bwd_sum(self.i_ca) \
                 * self.active_area_dx_ch \
                 / (self.val_num * f)
-        self.mol_flow[0] = np.maximum(self.mol_flow[0],
-                                      np.zeros(g_par.dict_case['elements'] + 1))
+        self.mol_flow[0] = np.maximum(self.mol_flow[0], 0.)
 
     def calc_water_flow(self):
         """"
@@ -375,55 +412,58 @@ class HalfCell:
             -self.index_cat
         """
 
-        sat_p = w_prop.water.calc_p_sat(self.channel.temp_in)
+        sat_p = self.water.calc_p_sat(self.channel.temp_in)
         plane_dx = self.active_area_dx_ch
         b = 0.
         if self.cl_type is True:
-            q_0_water = self.mol_flow[0][0] \
+            q_0_water = self.mol_flow[0, ..., :1] \
                         * (1. + self.n2o2ratio) \
                         * sat_p \
                         * self.channel.humidity_in \
-                        / (self.channel.p_out
+                        / (np.expand_dims(self.channel.p_out, -1)
                            - self.channel.humidity_in
                            * sat_p)
             a = plane_dx \
                 / (self.val_num * g_par.dict_uni['F'] * 0.5) \
-                * np.matmul(self.fwd_mat, self.i_ca)
+                * g_func.calc_fwd_sum(self.i_ca)
             # production
             if self.ht_pem is False:
                 b = plane_dx \
-                    * np.matmul(self.fwd_mat, self.w_cross_flow)
+                    * g_func.calc_fwd_sum(self.w_cross_flow)
                 # crossover
-            self.mol_flow[1, 0] = q_0_water
-            self.mol_flow[1, 1:] = a + b + q_0_water
-            self.mol_flow[2] = np.full(g_par.dict_case['nodes'],
-                                       self.mol_flow[0][0] * self.n2o2ratio)
+            self.mol_flow[1, ..., :1] = q_0_water
+            self.mol_flow[1, ..., 1:] = a + b + q_0_water
+            self.mol_flow[2] = self.mol_flow[0, ..., :1] * self.n2o2ratio
         else:
-            q_0_water = self.mol_flow[0][0] \
+            q_0_water = self.mol_flow[0, ..., :1] \
                         * (1. + self.n2h2ratio) \
                         * sat_p \
                         * self.channel.humidity_in \
-                        / (self.channel.p_out
+                        / (np.expand_dims(self.channel.p_out, -1)
                            - self.channel.humidity_in
                            * sat_p)
             if self.ht_pem is False:
                 b = plane_dx \
-                    * np.matmul(-self.bwd_mat, self.w_cross_flow)
-            self.mol_flow[1, -1] = q_0_water
-            self.mol_flow[1, :-1] = b + q_0_water
-            self.mol_flow[2] = np.full(g_par.dict_case['nodes'],
-                                       self.mol_flow[0][-1] * self.n2h2ratio)
+                    * -g_func.calc_bwd_sum(self.w_cross_flow)
+            self.mol_flow[1, ..., -1:] = q_0_water
+            self.mol_flow[1, ..., :-1] = b + q_0_water
+            self.mol_flow[2] = self.mol_flow[0, ..., -1:] * self.n2h2ratio
         self.mol_flow[1] = np.maximum(self.mol_flow[1], 0.)
-        self.mol_flow[1] = np.choose(self.mol_flow[0] > 1.e-50,
-                                     [np.zeros(g_par.dict_case['nodes']),
-                                      self.mol_flow[1]])
+        self.mol_flow[1] = np.where(self.mol_flow[0] > 1.e-50,
+                                    self.mol_flow[1], 0.)
         if self.cl_type is True:
-            for w in range(1, g_par.dict_case['nodes']):
-                if self.mol_flow[1, w] < 1.e-49:
-                    self.index_cat = w - 1
-                    self.mol_flow[1, -self.index_cat - 1:] = \
-                        self.mol_flow[1, self.index_cat]
-                    break
+            # the water flow behind the first dry node of each channel
+            dry = self.mol_flow[1, ..., 1:] < 1.e-49
+            is_dry = np.any(dry, axis=-1)
+            self.index_cat = np.where(is_dry, np.argmax(dry, axis=-1),
+                                      self.index_cat)
+            index_cat = np.expand_dims(self.index_cat, -1)
+            nodes = self.dict_case['nodes']
+            self.mol_flow[1] = \
+                np.where(np.expand_dims(is_dry, -1)
+                         & (np.arange(nodes) >= nodes - index_cat - 1),
+                         np.take_along_axis(self.mol_flow[1], index_cat, -1),
+                         self.mol_flow[1])
 
     def calc_pressure_drop_bends(self):
         """
@@ -435,15 +475,16 @@ class HalfCell:
             -self.rho
             -self.u
             -self.channel.bend_num
-            -gpar.dict_case['nodes']
+            -self.dict_case['nodes']
 
             Manipulate:
             -self.p_drop_bends
         """
 
         self.p_drop_bends = self.channel.bend_fri_fac \
-                            * np.average(self.rho_gas) * np.average(self.u) ** 2. \
-                            * self.channel.n_bends / (g_par.dict_case['nodes'] - 1) * .5
+                            * np.average(self.rho_gas, axis=-1) \
+                            * np.average(self.u, axis=-1) ** 2. \
+                            * self.channel.n_bends / (self.dict_case['nodes'] - 1) * .5
 
     def calc_pressure(self):
         """
@@ -454,8 +495,6 @@ class HalfCell:
             -self.u
             -self.Re
             -self.rho_gas
-            -self.fwd_mat
-            -self.bwd_mat
             -self.channel.d_h
             -self.channel.dx
             -self.p_drop_bends
@@ -464,26 +503,26 @@ class HalfCell:
             -self.p
         """
 
-        p_out = self.channel.p_out
+        p_out = np.expand_dims(self.channel.p_out, -1)
         rho_ele = g_func.calc_elements_1_d(self.rho_gas)
         u_ele = g_func.calc_elements_1_d(self.u)
         Re_ele = g_func.calc_elements_1_d(self.Re)
         if self.cl_type is True:
-            mat = self.bwd_mat
-            self.p[-1] = p_out
-            self.p[:-1] = p_out + 32. / self.channel.d_h \
-                * np.matmul(mat, rho_ele * u_ele ** 2. / Re_ele) \
+            sum_func = g_func.calc_bwd_sum
+            self.p[..., -1:] = p_out
+            self.p[..., :-1] = p_out + 32. / self.channel.d_h \
+                * sum_func(rho_ele * u_ele ** 2. / Re_ele) \
                 * self.channel.dx\
-                + np.linspace(self.p_drop_bends * (g_par.dict_case['nodes']),0,
-                              g_par.dict_case['nodes']-1)
+                + np.linspace(self.p_drop_bends * (self.dict_case['nodes']),0,
+                              self.dict_case['nodes']-1, axis=-1)
         else:
-            mat = self.fwd_mat
-            self.p[0] = p_out
-            self.p[1:] = p_out + 32. / self.channel.d_h \
-                * np.matmul(mat, rho_ele * u_ele ** 2. / Re_ele) \
+            sum_func = g_func.calc_fwd_sum
+            self.p[..., :1] = p_out
+            self.p[..., 1:] = p_out + 32. / self.channel.d_h \
+                * sum_func(rho_ele * u_ele ** 2. / Re_ele) \
                 * self.channel.dx\
-                + np.linspace(0, self.p_drop_bends * (g_par.dict_case['nodes']),
-                              g_par.dict_case['nodes']-1)
+                + np.linspace(0, self.p_drop_bends * (self.dict_case['nodes']),
+                              self.dict_case['nodes']-1, axis=-1)
 
     def calc_con(self):
         """
@@ -497,26 +536,23 @@ class HalfCell:
 
             Manipulate:
             -self.gas_con
-        """
-
-        for w in range(g_par.dict_case['nodes']):
-            id_lw = self.p[w] / (g_par.dict_uni['R'] * self.temp_fluid[w])
-            var4 = np.sum(self.mol_flow[:, w])
-            var2 = self.mol_flow[1][w] / var4
-            self.gas_con[1][w] = id_lw * var2
-            a = w_prop.water.calc_p_sat(self.temp_fluid[w])
-            e = g_par.dict_uni['R'] * self.temp_fluid[w]
-            if self.gas_con[1][w] >= a / e:  # saturated
-                b = self.mol_flow[0][w] + self.mol_flow[2][w]
-                c = self.mol_flow[0][w] / b
-                d = self.mol_flow[2][w] / b
-                self.gas_con[0][w] = (self.p[w] - a) / e * c
-                self.gas_con[2][w] = (self.p[w] - a) / e * d
-                self.gas_con[1][w] = a / e
-            else:  # not saturated
-                var5 = id_lw / var4
-                self.gas_con[0][w] = var5 * self.mol_flow[0][w]
-                self.gas_con[2][w] = var5 * self.mol_flow[2][w]
+            -self.p_sat
+        """
+
+        self.p_sat = self.water.calc_p_sat(self.temp_fluid)
+        r_t = g_par.dict_uni['R'] * self.temp_fluid
+        con_sat = self.p_sat / r_t
+        # saturation concentration of the water vapour
+        con_total = self.p / r_t / np.sum(self.mol_flow, axis=0)
+        # total concentration per molar flow
+        con_w = con_total * self.mol_flow[1]
+        sat = con_w >= con_sat
+        # saturated nodes, the gas phase is diluted by the vapour pressure
+        con_gas = (self.p - self.p_sat) / r_t \
+            / (self.mol_flow[0] + self.mol_flow[2])
+        self.gas_con[0] = np.where(sat, con_gas, con_total) * self.mol_flow[0]
+        self.gas_con[2] = np.where(sat, con_gas, con_total) * self.mol_flow[2]
+        self.gas_con[1] = np.where(sat, con_sat, con_w)
         self.gas_con_ele = g_func.calc_elements_1_d(self.gas_con[0])
 
     def calc_mass_fraction(self):
@@ -558,8 +594,7 @@ class HalfCell:
             Access to:
             -self.temp_fluid
             -self.p
-            -self.cl_type
-            -g_fit.object.methods
+            -self.gas_mix
 
             Manipulate:
             -self.cp
@@ -568,21 +603,8 @@ class HalfCell:
             -self.cp_ele
         """
 
-        if self.cl_type is True:
-            self.cp[0] = g_fit.oxygen.calc_cp(self.temp_fluid)
-            self.lambdas[0] = g_fit.oxygen.calc_lambda(self.temp_fluid, self.p)
-            self.visc[0] = g_fit.oxygen.calc_visc(self.temp_fluid)
-        else:
-            self.cp[0] = g_fit.hydrogen.calc_cp(self.temp_fluid)
-            self.lambdas[0] = g_fit.hydrogen.calc_lambda(self.temp_fluid,
-                                                         self.p)
-            self.visc[0] = g_fit.hydrogen.calc_visc(self.temp_fluid)
-        self.cp[1] = g_fit.water.calc_cp(self.temp_fluid)
-        self.cp[2] = g_fit.nitrogen.calc_cp(self.temp_fluid)
-        self.lambdas[1] = g_fit.water.calc_lambda(self.temp_fluid, self.p)
-        self.lambdas[2] = g_fit.nitrogen.calc_lambda(self.temp_fluid, self.p)
-        self.visc[1] = g_fit.water.calc_visc(self.temp_fluid)
-        self.visc[2] = g_fit.nitrogen.calc_visc(self.temp_fluid)
+        self.cp, self.visc, self.lambdas = \
+            self.gas_mix.calc_properties(self.temp_fluid, self.p)
         self.cp_ele = g_func.calc_elements_1_d(self.cp[0])
 
     def calc_gas_properties(self):
@@ -621,7 +643,8 @@ class HalfCell:
                                              self.mol_f,
                                              self.mol_mass)
         self.lambda_gas = g_func.calc_lambda_mix(self.lambdas, self.mol_f,
-                                                 self.visc, self.mol_mass)
+                                                 self.visc, self.mol_mass,
+                                                 self.psi_const)
         self.rho_gas = g_func.calc_rho(self.p, self.r_gas, self.temp_fluid)
         self.Pr = self.visc_gas * self.cp_gas / self.lambda_gas
 
@@ -685,11 +708,11 @@ class HalfCell:
             -self.cp_gas
             -self.m_flow_liq_w
             -self.m_flow_fluid
-            -g_par.dict_uni['cp_liq']
+            -self.dict_case['cp_liq']
         """
 
         self.cp_fluid = (self.m_flow_gas * self.cp_gas + self.m_flow_liq_w
-                         * g_par.dict_uni['cp_liq']) / self.m_flow_fluid
+                         * self.dict_case['cp_liq']) / self.m_flow_fluid
         self.g_fluid = self.m_flow_fluid * self.cp_fluid
 
     def calc_re(self):
@@ -758,9 +781,11 @@ class HalfCell:
         """
 
         if self.cl_type is True:
-            self.cond_rate = g_func.calc_nodes_1_d(np.ediff1d(self.liq_w_flow))
+            self.cond_rate = \
+                g_func.calc_nodes_1_d(np.diff(self.liq_w_flow, axis=-1))
         else:
-            self.cond_rate = -g_func.calc_nodes_1_d(np.ediff1d(self.liq_w_flow))
+            self.cond_rate = \
+                -g_func.calc_nodes_1_d(np.diff(self.liq_w_flow, axis=-1))
 
     def calc_rel_humidity(self):
         """
@@ -769,6 +794,7 @@ class HalfCell:
             Access to:
             -self.gas_con
             -self.temp_fluid
+            -self.p_sat
             -g_par.dict_uni['R']
 
             Manipulate:
@@ -776,7 +802,7 @@ class HalfCell:
         """
 
         self.humidity = self.gas_con[1] * g_par.dict_uni['R'] \
-                        * self.temp_fluid / w_prop.water.calc_p_sat(self.temp_fluid)
+                        * self.temp_fluid / self.p_sat
 
     def sum_flows(self):
         """
@@ -810,10 +836,11 @@ class HalfCell:
         -self.i_ca_square
         """
 
-        i_lim = 4. * g_par.dict_uni['F'] * self.gas_con[0, :-1] \
+        i_lim = 4. * g_par.dict_uni['F'] * self.gas_con[0, ..., :-1] \
             * self.diff_coeff_gdl / self.th_gdl
         self.var = 1.\
-            - self.i_ca / (i_lim * self.gas_con_ele / self.gas_con[0, :-1])
+            - self.i_ca / (i_lim * self.gas_con_ele
+                           / self.gas_con[0, ..., :-1])
         self.i_ca_square = self.i_ca ** 2.
 
     def calc_activation_loss(self):
@@ -835,7 +862,8 @@ class HalfCell:
 
         self.act_loss = self.tafel_slope \
             * np.arcsinh((self.i_ca / self.i_sigma) ** 2.
-                         / (2. * (self.gas_con_ele / self.gas_con[0, :-1])
+                         / (2. * (self.gas_con_ele
+                                  / self.gas_con[0, ..., :-1])
                             * (1. - np.exp(-self.i_ca /
                                            (2. * self.i_ca_char)))))
 
@@ -889,7 +917,7 @@ class HalfCell:
         nan_list = np.isnan(self.gdl_diff_loss)
         bol = nan_list.any()
         if bol == True:
-            self.gdl_diff_loss[np.argwhere(nan_list)[0, 0]:] = 1.e50
+            self.gdl_diff_loss[np.cumsum(nan_list, axis=-1) > 0] = 1.e50
 
     def calc_electrode_loss(self):
         """
@@ -1,9 +1,80 @@
 import numpy as np
+import scipy.linalg as sp_l
 import data.global_parameters as g_par
 import system.global_functions as g_func
 import copy as copy
 
 
+def calc_header_hydraulics(manifolds):
+    """
+    Calculates the header velocities, gas densities, reynolds numbers,
+    fanning friction factors, the outlet header pressures
+    and the summed up pressure drops along the inlet headers
+    of several manifolds in one batched evaluation
+    of the [manifold][head inlet/outlet][cell number] arrays.
+
+        Access to:
+        - g_par.dict_uni['R'], the universal gas constant
+        - .head_mol_flow, .head_temp, .head_p, .head_r, .cell_visc
+        - .cross_area, .hydraulic_diameter, .kf, .cell_height
+
+        Manipulate:
+        - .head_u
+        - .head_density
+        - .head_Re
+        - .head_fan_fri
+        - .head_p[1]
+        - .head_p_in_drop
+    """
+
+    def gather(name):
+        return np.array([getattr(item, name) for item in manifolds])
+
+    head_p = gather('head_p')
+    head_temp = gather('head_temp')
+    cross_area = gather('cross_area')[:, None, None]
+    d_h = gather('hydraulic_diameter')[:, None, None]
+    kf = gather('kf')[:, None]
+    cell_height = gather('cell_height')
+    head_u = gather('head_mol_flow') * g_par.dict_uni['R'] * head_temp \
+        / (cross_area * head_p)
+    head_density = g_func.calc_rho(head_p, gather('head_r'), head_temp)
+    head_re = g_func.calc_reynolds_number(head_density, head_u, d_h,
+                                          gather('cell_visc'))
+    head_fan_fri = g_func.calc_fan_fri_fac(head_re)
+    drop_out = g_func.calc_head_p_drop(head_density[:, 1, -2::-1],
+                                       head_u[:, 1, :0:-1],
+                                       head_u[:, 1, -2::-1],
+                                       head_fan_fri[:, 1, -2::-1],
+                                       kf, cell_height[:, -2::-1], d_h[:, 0])
+    drop_in = g_func.calc_head_p_drop(head_density[:, 0, :-1],
+                                      head_u[:, 0, :-1],
+                                      head_u[:, 0, 1:],
+                                      head_fan_fri[:, 0, :-1],
+                                      kf, cell_height[:, :-1], d_h[:, 0])
+    p_out = g_func.calc_fwd_sum(drop_out) + head_p[:, 1, -1:]
+    p_in_drop = g_func.calc_fwd_sum(drop_in)
+    for q, item in enumerate(manifolds):
+        item.head_u = head_u[q]
+        item.head_density = head_density[q]
+        item.head_Re = head_re[q]
+        item.head_fan_fri = head_fan_fri[q]
+        item.head_p[1, -2::-1] = p_out[q]
+        item.head_p_in_drop = p_in_drop[q]
+
+
+def update_manifolds(manifolds):
+    """
+    Updates several manifolds, e.g. the cathode and the anode manifold,
+    with one batched evaluation of the header hydraulics.
+    """
+    for item in manifolds:
+        item.update_header_mixing()
+    calc_header_hydraulics(manifolds)
+    for item in manifolds:
+        item.update_distribution()
+
+
 class Manifold:
 
     def __init__(self, dict_manifold_const):
@@ -16,6 +87,16 @@ class Manifold:
         self.cell_ch_length = dict_manifold_const['cell_channel_length']
         self.cell_ch_ca = dict_manifold_const['cell_channel_cross_area']
         self.head_p = np.full((2, self.cell_num), dict_manifold_const['p_out'])
+        self.solver = dict_manifold_const['solver']
+        # flow distribution solver, 'reference' corrects the reference
+        # cell pressure drop once per update, 'newton' solves the header
+        # pressures and cell flows together
+        self.newton_criteria = dict_manifold_const['newton_criteria']
+        # convergence criteria of the newton flow distribution solver
+        self.newton_max_it = dict_manifold_const['newton_max_iteration']
+        # maximal number of newton iterations
+        self.show_it_output = dict_manifold_const['show_it_output']
+        # True if the iteration output should be printed
         self.head_stoi = 1.5
         self.cell_mass_flow = None
         self.cell_mol_flow = None
@@ -33,8 +114,6 @@ class Manifold:
         self.cell_ref_p_drop_cor = 0.
         self.p_cor_fac = 0.
         # Initialize arrays
-        self.fwd_mat = np.tril(np.full((self.cell_num, self.cell_num), 1.))
-        self.fwd_mat_ele = self.fwd_mat[:-1, :-1]
         self.head_mol_flow = np.full((2, self.cell_num), 0.)
         self.head_f_mass_flow = np.full((2, self.cell_num), 0.)
         self.head_g_mass_flow = np.full((2, self.cell_num), 0.)
@@ -45,10 +124,24 @@ class Manifold:
         self.head_density = np.full((2, self.cell_num), 0.)
         self.head_Re = np.full((2, self.cell_num), 0.)
         self.head_fan_fri = np.full((2, self.cell_num), 0.)
+        self.head_p_in_drop = np.full(self.cell_num - 1, 0.)
+        # summed up pressure drop along the inlet header
         self.p_dist_fac = np.full(self.cell_num, 0.)
         self.cell_stoi = np.full(self.cell_num, 1.5)
         self.cell_mol_flow_old = np.full(self.cell_num, 0.)
         self.criteria = 0.
+        self.newton_it = 0
+        # number of newton iterations of the last flow distribution solve
+        self.newton_converged = True
+        # False if the last flow distribution solve reached
+        # the maximal number of newton iterations
+        self.newton_scale = None
+        # scale of the newton variables [cell flow, inlet header flow,
+        # outlet header flow, inlet header pressure, outlet header pressure]
+        self.newton_res_scale = None
+        # scale of the newton residuals
+        self.newton_const = None
+        # constants of the newton residuals
 
     def update_values(self, dict_manifold_dyn):
         self.cell_f_mass_flow = dict_manifold_dyn['f_mass_flow']
@@ -65,16 +158,34 @@ class Manifold:
         This function coordinates the program sequence.
         """
 
+        self.update_header_mixing()
+        calc_header_hydraulics([self])
+        self.update_distribution()
+
+    def update_header_mixing(self):
+        """
+        This function mixes up the cell flows to the header flows.
+        """
+
         self.calc_header_fluid_mass_flows()
         self.calc_header_mol_flows()
         self.calc_header_heat_capacity()
         self.calc_header_temperature()
-        self.calc_header_velocity()
         self.calc_header_gas_constant()
-        self.calc_header_gas_density()
-        self.calc_header_reynolds_numb()
-        self.calc_header_fanning_friction_factor()
-        self.calc_header_p_out()
+
+    def update_distribution(self):
+        """
+        This function calculates the flow distribution over the cells
+        from the header hydraulics with the selected solver.
+        """
+
+        if self.solver == 'newton':
+            self.calc_ref_p_drop()
+            self.calc_ref_permeability()
+            self.solve_flow_distribution()
+            self.calc_new_cell_stoi()
+            self.calc_criteria()
+            return
         self.calc_ref_p_drop()
         self.calc_ref_permeability()
         self.calc_header_p_in()
@@ -99,10 +210,10 @@ class Manifold:
         """
 
         for q in range(2):
-            self.head_f_mass_flow[q] = np.matmul(self.fwd_mat,
-                                                 self.cell_f_mass_flow[q])
-            self.head_g_mass_flow[q] = np.matmul(self.fwd_mat,
-                                                 self.cell_g_mass_flow[q])
+            self.head_f_mass_flow[q] = g_func.calc_fwd_sum(
+                self.cell_f_mass_flow[q])
+            self.head_g_mass_flow[q] = g_func.calc_fwd_sum(
+                self.cell_g_mass_flow[q])
 
 
     def calc_header_mol_flows(self):
@@ -118,8 +229,7 @@ class Manifold:
         """
 
         for q in range(2):
-            self.head_mol_flow[q] = np.matmul(self.fwd_mat,
-                                              self.cell_mol_flow[q])
+            self.head_mol_flow[q] = g_func.calc_fwd_sum(self.cell_mol_flow[q])
 
     def calc_header_heat_capacity(self):
         """
@@ -138,8 +248,9 @@ class Manifold:
         """
 
         self.head_cp[0] = self.cell_cp[0]
-        self.head_cp[1] = np.matmul(self.fwd_mat, self.cell_f_mass_flow[1]
-                                    * self.cell_cp[1]) / self.head_f_mass_flow[1]
+        self.head_cp[1] = g_func.calc_fwd_sum(self.cell_f_mass_flow[1]
+                                              * self.cell_cp[1]) \
+            / self.head_f_mass_flow[1]
 
     def calc_header_temperature(self):
         """
@@ -159,32 +270,11 @@ class Manifold:
         """
 
         self.head_temp[0] = self.cell_temp[0]
-        self.head_temp[1] = np.matmul(self.fwd_mat,
-                                      self.cell_f_mass_flow[1] * self.cell_cp[1] *
-                                      self.cell_temp[1])\
+        self.head_temp[1] = g_func.calc_fwd_sum(self.cell_f_mass_flow[1]
+                                                * self.cell_cp[1]
+                                                * self.cell_temp[1])\
                             / (self.head_cp[1] * self.head_f_mass_flow[1])
 
-    def calc_header_velocity(self):
-        """
-        This function calculates the header inlet and outlet
-        velocities over the z-axis, based on the ideal gas law
-
-            Access to:
-            - g_par.dict_uni['R], the universal gas constant
-            - self.cross_area, cross area of the header channel
-            - self.head_mol_flow, 2-D-array, [cell inlet/outlet][cell number]
-            - self.head_t 2-D-array, [cell inlet/outlet][cell number]
-            - self.head_p 2-D-array, [cell inlet/outlet][cell number]
-
-            Manipulate:
-            - self.head_u, 2-D-array, [head inlet/outlet][cell number]
-        """
-
-        for q in range(2):
-            self.head_u[q] = self.head_mol_flow[q]\
-                             * g_par.dict_uni['R'] * self.head_temp[q]\
-                             / (self.cross_area * self.head_p[q])
-
     def calc_header_gas_constant(self):
         """
         This function mixes up the given cell outlet gas constant
@@ -202,91 +292,10 @@ class Manifold:
         """
 
         self.head_r[0] = self.cell_R_avg[0]
-        self.head_r[1] = np.matmul(self.fwd_mat,
-                                   self.cell_g_mass_flow[1] * self.cell_R_avg[1])\
+        self.head_r[1] = g_func.calc_fwd_sum(self.cell_g_mass_flow[1]
+                                             * self.cell_R_avg[1])\
             / self.head_g_mass_flow[1]
 
-    def calc_header_gas_density(self):
-        """
-        This function calculates the header gas densities over the z axis,
-        based on the ideal gas law.
-
-            Access to:
-            - self.head_p, 2-D-array, [cell inlet/outlet][cell number]
-            - self.head_r, 2-D-array, [cell inlet/outlet][cell number]
-            - self.head_t, 2-D-array, [cell inlet/outlet][cell number]
-
-            Manipulate:
-            - self.head_density, 2-D-array, [head inlet/outlet][cell number]
-        """
-
-        for q in range(2):
-            self.head_density[q] = g_func.calc_rho(self.head_p[q],
-                                                   self.head_r[q],
-                                                   self.head_temp[q])
-
-    def calc_header_reynolds_numb(self):
-        """
-        This function calculates the header gas reynolds number.
-
-            Access to:
-            - self.head_density, 2-D-array, [cell inlet/outlet][cell number]
-            - self.head_u, 2-D-array, [cell inlet/outlet][cell number]
-            - self.cell_visc, 2-D-array, [cell inlet/outlet][cell number]
-            - self.hydraulic_diameter, hydraulic diameter of the header channel
-
-            Manipulate:
-            - self.head_Re, 2-D-array, [head inlet/outlet][cell number]
-        """
-        # it should be considered to use self.head_visc
-        #  here for the molar fraction and molar mass is needed
-        for q in range(2):
-            self.head_Re[q] = g_func.calc_reynolds_number(self.head_density[q],
-                                                          self.head_u[q],
-                                                          self.hydraulic_diameter,
-                                                          self.cell_visc[q])
-
-    def calc_header_fanning_friction_factor(self):
-        """
-        This function calculates the header fanning friction factor.
-
-            Access to:
-            - self.head_Re, 2-D-array, [head inlet/outlet][cell number]
-
-
-            Manipulate:
-            - self.head_fan_fri, 2-D-array, [head inlet/outlet][cell number]
-        """
-
-        for q in range(2):
-            self.head_fan_fri[q] = g_func.calc_fan_fri_fac(self.head_Re[q])
-
-    def calc_header_p_out(self):
-        """
-        This function calculates the the header outlet pressure.
-
-            Access to:
-            - self.head_density, 2-D-array, [head inlet/outlet][cell number]
-            - self.head_u, 2-D-array, [head inlet/outlet][cell number]
-            - self.head_fan_fri, 2-D-array, [head inlet/outlet][cell number]
-            - self.kf, pressure loss coefficient
-            - self.cell_height, combined height of all cell_layer,
-              2-D-array, [head inlet/outlet][cell number]
-            - self.hydraulic_diameter, hydraulic diameter of the header channel
-
-            Manipulate:
-            self.head_p[1], 2-D-array, [head_outlet][cell_number]
-        """
-        drop = g_func.calc_head_p_drop(self.head_density[1][::-1][1:],
-                                       self.head_u[1][::-1][:-1],
-                                       self.head_u[1][::-1][1:],
-                                       self.head_fan_fri[1][::-1][1:],
-                                       self.kf,
-                                       self.cell_height[::-1][1:],
-                                       self.hydraulic_diameter)
-        self.head_p[1][::-1][1:] = np.matmul(self.fwd_mat_ele, drop)\
-            + self.head_p[1, -1]
-
     def calc_ref_p_drop(self):
         """
         This function calculates the pressure drop of the zeroth cell
@@ -335,27 +344,15 @@ class Manifold:
            Access to:
            -self.cell_ref_p_drop, reference cell pressure drop
            -self.head_p, 2-D-Array, [head inlet/outlet][cell number]
-           -self.head_density, 2-D-array, [head inlet/outlet][cell number]
-           -self.head_u, 2-D-Array, [head inlet/outlet][cell number]
-           -self.head_fan_fri, 2-D-array, [head inlet/outlet][cell number]
-           -self.kf, pressure loss coefficient
-           -self.cell_height, 1-a-Array, [cell number]
-           self.hydraulic_diameter, hydraulic diameter of the header channel
+           -self.head_p_in_drop, 1-D-Array, summed up pressure drop
+            along the inlet header from calc_header_hydraulics()
 
            Manipulate:
            -self.head_p, 2-D-array, [head inlet/outlet][cell number]
         """
 
         self.head_p[0, 0] = self.cell_ref_p_drop + self.head_p[1, 0]
-        drop = g_func.calc_head_p_drop(self.head_density[0, :-1],
-                                       self.head_u[0, :-1],
-                                       self.head_u[0, 1:],
-                                       self.head_fan_fri[0, :-1],
-                                       self.kf,
-                                       self.cell_height[:-1],
-                                       self.hydraulic_diameter)
-        self.head_p[0, 1:] = \
-            self.head_p[0, 0] + np.matmul(self.fwd_mat_ele, drop)
+        self.head_p[0, 1:] = self.head_p[0, 0] + self.head_p_in_drop
 
     def calc_pressure_distribution_factor(self):
         """
@@ -423,6 +420,214 @@ class Manifold:
                                                     * self.p_cor_fac)\
             * self.channel_num
 
+    def solve_flow_distribution(self):
+        """
+        This function solves the cell flows and the header pressures
+        with newton iterations to self.newton_criteria.
+        The unknowns of each cell are ordered
+        [cell flow, inlet header flow, outlet header flow,
+        inlet header pressure, outlet header pressure],
+        so that the jacobian is banded with a bandwidth of 5.
+        The jacobian is calculated analytically by calc_flow_jacobian().
+        The cell flows are proportional to the pressure difference
+        between the headers with the permeability of the reference cell,
+        the gas consumption of the cells and the header gas properties
+        are kept constant.
+
+            Access to:
+            -self.cell_mol_flow, 2-D-array, [cell inlet/outlet][cell number]
+            -self.head_mol_flow, 2-D-array, [head inlet/outlet][cell number]
+            -self.head_p, 2-D-array, [head inlet/outlet][cell number]
+            -self.ref_perm, permeability of the reference cell
+            -self.p_cor_fac, correction factor
+
+            Manipulate:
+            -self.head_p, 2-D-array, [head inlet/outlet][cell number]
+            -self.head_mol_flow, 2-D-array, [head inlet/outlet][cell number]
+            -self.cell_mol_flow, 2-D-array, [cell inlet/outlet][cell number]
+            -self.cell_mol_flow_old, 1-D-array, [cell number]
+            -self.cell_ref_p_drop, reference pressure drop in Pa
+            -self.p_dist_fac, 1-D-Array [cell number]
+            -self.newton_it, number of newton iterations
+            -self.newton_converged, False if the newton iterations
+             did not reach self.newton_criteria
+        """
+
+        n_total = self.head_mol_flow[0, -1]
+        flow_scale = n_total / self.cell_num
+        p_scale = self.head_p[1, -1]
+        self.newton_scale = np.array([flow_scale, n_total, n_total,
+                                      p_scale, p_scale])
+        self.newton_res_scale = \
+            np.tile(np.array([flow_scale, flow_scale, flow_scale,
+                              p_scale, p_scale]), (self.cell_num, 1))
+        self.newton_res_scale[-1, 3] = n_total
+        perm = self.ref_perm * self.cell_ch_ca[0] * self.channel_num \
+            / (np.average(self.cell_visc) * self.cell_ch_length[0]
+               * self.p_cor_fac)
+        self.newton_const = \
+            {'n_total': n_total, 'p_out': self.head_p[1, -1], 'perm': perm,
+             'consumption': self.cell_mol_flow[0] - self.cell_mol_flow[1]}
+        n_start = self.cell_mol_flow[0] * n_total \
+            / np.sum(self.cell_mol_flow[0])
+        x = np.stack((n_start, g_func.calc_fwd_sum(n_start),
+                      g_func.calc_fwd_sum(n_start
+                                          - self.newton_const['consumption']),
+                      self.head_p[0], self.head_p[1]), axis=-1)
+        x = (x / self.newton_scale).flatten()
+        res = self.calc_flow_residual(x)
+        self.newton_it = 0
+        self.newton_converged = False
+        while self.newton_it < self.newton_max_it:
+            step = sp_l.solve_banded((5, 5), self.calc_flow_jacobian(x),
+                                     -res, check_finite=False)
+            x = x + step
+            res = self.calc_flow_residual(x)
+            self.newton_it += 1
+            if np.max(np.abs(step)) < self.newton_criteria:
+                self.newton_converged = True
+                break
+        if self.newton_converged is False and self.show_it_output is True:
+            print('flow distribution not converged after',
+                  self.newton_it, 'newton iterations, scaled residual:',
+                  np.max(np.abs(res)))
+        n, q_in, q_out, p_in, p_out = \
+            (np.reshape(x, (self.cell_num, 5)) * self.newton_scale).T
+        self.head_p[0] = p_in
+        self.head_p[1] = p_out
+        self.head_mol_flow[0] = q_in
+        self.head_mol_flow[1] = q_out
+        self.cell_mol_flow_old = copy.deepcopy(self.cell_mol_flow[0])
+        self.cell_mol_flow[0] = n
+        self.cell_ref_p_drop = p_in[0] - p_out[0]
+        self.calc_pressure_distribution_factor()
+
+    def calc_flow_residual(self, x):
+        """
+        This function calculates the scaled residuals
+        of the newton flow distribution solver.
+        The header drops are calculated as in calc_header_hydraulics()
+        with the header temperatures, gas constants and viscosities
+        of the last mixing.
+
+            Access to:
+            -self.newton_scale
+            -self.newton_res_scale
+            -self.newton_const
+            -self.head_temp, 2-D-array, [head inlet/outlet][cell number]
+            -self.head_r, 2-D-array, [head inlet/outlet][cell number]
+            -self.cell_visc, 2-D-array, [cell inlet/outlet][cell number]
+        """
+
+        n, q_in, q_out, p_in, p_out = \
+            (np.reshape(x, (self.cell_num, 5)) * self.newton_scale).T
+        head_q = np.array([q_in, q_out])
+        head_p = np.array([p_in, p_out])
+        head_u = head_q * g_par.dict_uni['R'] * self.head_temp \
+            / (self.cross_area * head_p)
+        head_density = g_func.calc_rho(head_p, self.head_r, self.head_temp)
+        head_fan_fri = g_func.calc_fan_fri_fac(
+            g_func.calc_reynolds_number(head_density, head_u,
+                                        self.hydraulic_diameter,
+                                        self.cell_visc))
+        res = np.empty((self.cell_num, 5))
+        res[:, 0] = n - self.newton_const['perm'] * (p_in - p_out)
+        res[:, 1] = q_in - n
+        res[1:, 1] -= q_in[:-1]
+        res[:, 2] = q_out - n + self.newton_const['consumption']
+        res[1:, 2] -= q_out[:-1]
+        res[:-1, 3] = p_in[1:] - p_in[:-1] \
+            - g_func.calc_head_p_drop(head_density[0, :-1], head_u[0, :-1],
+                                      head_u[0, 1:], head_fan_fri[0, :-1],
+                                      self.kf, self.cell_height[:-1],
+                                      self.hydraulic_diameter)
+        res[-1, 3] = q_in[-1] - self.newton_const['n_total']
+        res[:-1, 4] = p_out[:-1] - p_out[1:] \
+            - g_func.calc_head_p_drop(head_density[1, :-1], head_u[1, 1:],
+                                      head_u[1, :-1], head_fan_fri[1, :-1],
+                                      self.kf, self.cell_height[:-1],
+                                      self.hydraulic_diameter)
+        res[-1, 4] = p_out[-1] - self.newton_const['p_out']
+        return (res / self.newton_res_scale).flatten()
+
+    def calc_flow_jacobian(self, x):
+        """
+        This function calculates the jacobian of the scaled residuals
+        of calc_flow_residual() analytically, in the banded storage
+        of scipy.linalg.solve_banded with 5 lower and 5 upper bands.
+        The header velocities depend on the header flows and pressures,
+        the densities on the pressures and the reynolds numbers
+        only on the header flows.
+
+            Access to:
+            -self.newton_scale
+            -self.newton_res_scale
+            -self.newton_const
+            -self.head_temp, 2-D-array, [head inlet/outlet][cell number]
+            -self.head_r, 2-D-array, [head inlet/outlet][cell number]
+            -self.cell_visc, 2-D-array, [cell inlet/outlet][cell number]
+        """
+
+        n, q_in, q_out, p_in, p_out = \
+            (np.reshape(x, (self.cell_num, 5)) * self.newton_scale).T
+        head_q = np.array([q_in, q_out])
+        head_p = np.array([p_in, p_out])
+        du_dq = g_par.dict_uni['R'] * self.head_temp \
+            / (self.cross_area * head_p)
+        head_u = head_q * du_dq
+        du_dp = -head_u / head_p
+        head_density = g_func.calc_rho(head_p, self.head_r, self.head_temp)
+        drho_dp = head_density / head_p
+        dre_dq = head_density * du_dq * self.hydraulic_diameter \
+            / self.cell_visc
+        head_fan_fri = g_func.calc_fan_fri_fac(head_q * dre_dq)
+        df_dq = g_func.calc_fan_fri_fac_deriv(head_q * dre_dq) * dre_dq
+        cells = np.arange(self.cell_num)
+        first, last = cells[:-1], cells[-1:]
+        ones = np.full(self.cell_num, 1.)
+        entries = [(cells, 0, cells, 0, ones),
+                   (cells, 0, cells, 3, -self.newton_const['perm'] * ones),
+                   (cells, 0, cells, 4, self.newton_const['perm'] * ones),
+                   (cells, 1, cells, 1, ones), (cells, 1, cells, 0, -ones),
+                   (cells[1:], 1, first, 1, -ones[1:]),
+                   (cells, 2, cells, 2, ones), (cells, 2, cells, 0, -ones),
+                   (cells[1:], 2, first, 2, -ones[1:]),
+                   (last, 3, last, 1, ones[-1:]),
+                   (last, 4, last, 4, ones[-1:])]
+        # inlet header, velocity of the cell at v1 and the next one at v2
+        d_rho, d_v1, d_v2, d_f = \
+            g_func.calc_head_p_drop_deriv(head_density[0, :-1],
+                                          head_u[0, :-1], head_u[0, 1:],
+                                          head_fan_fri[0, :-1], self.kf,
+                                          self.cell_height[:-1],
+                                          self.hydraulic_diameter)
+        entries += [(first, 3, first, 1,
+                     -d_v1 * du_dq[0, :-1] - d_f * df_dq[0, :-1]),
+                    (first, 3, first, 3,
+                     -1. - d_rho * drho_dp[0, :-1] - d_v1 * du_dp[0, :-1]),
+                    (first, 3, cells[1:], 1, -d_v2 * du_dq[0, 1:]),
+                    (first, 3, cells[1:], 3, 1. - d_v2 * du_dp[0, 1:])]
+        # outlet header, velocity of the next cell at v1 and the cell at v2
+        d_rho, d_v1, d_v2, d_f = \
+            g_func.calc_head_p_drop_deriv(head_density[1, :-1],
+                                          head_u[1, 1:], head_u[1, :-1],
+                                          head_fan_fri[1, :-1], self.kf,
+                                          self.cell_height[:-1],
+                                          self.hydraulic_diameter)
+        entries += [(first, 4, first, 2,
+                     -d_v2 * du_dq[1, :-1] - d_f * df_dq[1, :-1]),
+                    (first, 4, first, 4,
+                     1. - d_rho * drho_dp[1, :-1] - d_v2 * du_dp[1, :-1]),
+                    (first, 4, cells[1:], 2, -d_v1 * du_dq[1, 1:]),
+                    (first, 4, cells[1:], 4, -1. - d_v1 * du_dp[1, 1:])]
+        rows = np.concatenate([5 * item[0] + item[1] for item in entries])
+        cols = np.concatenate([5 * item[2] + item[3] for item in entries])
+        values = np.concatenate([item[4] for item in entries]) \
+            * np.tile(self.newton_scale, self.cell_num)[cols] \
+            / self.newton_res_scale.flatten()[rows]
+        return g_func.calc_band_storage(rows, cols, values, (5, 5),
+                                        5 * self.cell_num)
+
     def calc_new_cell_stoi(self):
         """
         This function calculates the new cell inlet stoichiometries.
@@ -0,0 +1,197 @@
+import numpy as np
+import system.global_functions as g_func
+import data.global_parameters as g_par
+
+
+class Membrane:
+
+    def __init__(self, dict_membrane, config, active_area_dx):
+        # Handover
+        self.dict_case = config.dict_case
+        # case parameters of the simulation
+        self.model = dict_membrane['model']
+        # membrane resistivity model, 'kvesic', 'springer' or 'gossling'
+        self.calc_cross_flux = dict_membrane['calc_cross_flux']
+        # switch to calculate the water cross flux through the membrane
+        self.th_mem = dict_membrane['th_mem']
+        # thickness membrane
+        self.mem_base_r = dict_membrane['mem_base_r']
+        # basic electrical resistance of the membrane
+        self.mem_acl_r = dict_membrane['mem_acl_r']
+        # thermal related electrical resistance gain of the membrane
+        self.active_area_dx = active_area_dx
+        # active area of an element
+        self.calc_resistivity = \
+            {'kvesic': self.calc_resistivity_kvesic,
+             'springer': self.calc_resistivity_springer,
+             'gossling': self.calc_resistivity_gossling}[self.model]
+        # resistivity function of the selected model
+
+        """membrane resistance parameter (Goßling)"""
+        self.fac_res_fit = 0.5913
+        self.fac_res_basic = 0.03
+        self.res_25 = 101249.82 * self.th_mem \
+            + 36.24 * self.th_mem\
+            + 2805.83 * self.th_mem + 0.021
+        self.res_65 = 3842453.95 * self.th_mem\
+            - 0.2775 * self.th_mem\
+            + 2.181 * self.th_mem + 0.029
+        self.fac_m = (np.log10(self.res_65) - np.log10(self.res_25)) / (
+                    (1000. / (65. + 273.15)) - (1000. / (25. + 273.15)))
+        self.fac_n = np.log10(self.res_65) - self.fac_m * 1000. / (65. + 273.15)
+
+        # Variables
+        self.temp_mem = None
+        # membrane temperature
+        self.humidity = None
+        # element humidity of the cathode and anode
+        self.i_cd = None
+        # current density
+        self.omega_ca = None
+        # area specific membrane resistance
+        self.omega = 0.
+        # membrane resistance
+        self.w_cross_flow = 0.
+        # water cross flux through the membrane
+
+    def update(self, temp_mem, humidity_cat, humidity_ano, i_cd):
+        """
+        Calculates the membrane resistivity of the selected model
+        and the water cross flux for the element arrays of one cell
+        or the (cell, element) arrays of several cells in one call.
+        The humidity is given at the nodes.
+
+            Manipulate:
+            -self.temp_mem
+            -self.humidity
+            -self.i_cd
+            -self.omega_ca
+            -self.omega
+            -self.w_cross_flow
+        """
+        self.temp_mem = temp_mem
+        self.humidity = g_func.calc_elements_1_d(np.array([humidity_cat,
+                                                           humidity_ano]))
+        self.i_cd = i_cd
+        if self.calc_cross_flux is True:
+            self.calc_cross_water_flux()
+        self.calc_resistivity()
+
+    @staticmethod
+    def calc_free_water_content(humidity):
+        """
+        Calculates the free water content of the membrane
+        in equilibrium with the humidity according to (Springer, 1991).
+        """
+        return 0.043 + 17.81 * humidity \
+            - 39.85 * humidity ** 2. + 36. * humidity ** 3.
+
+    def calc_cross_water_flux(self):
+        """
+        Calculates the water cross flux through the membrane
+        according to (Springer, 1991).
+
+            Access to:
+            -self.dict_case['vap_m_temp_coeff']
+            -self.dict_case['mol_con_m']
+            -g_par.dict_uni['F']
+            -self.humidity
+            -self.i_cd
+            -self.temp_mem
+            -self.th_mem
+
+            Manipulate:
+            -self.w_cross_flow
+        """
+        vap_coeff = self.dict_case['vap_m_temp_coeff']
+        free_w_content = self.calc_free_water_content(self.humidity)
+        zeta_plus = free_w_content[0] + free_w_content[1] \
+            + self.i_cd / (2. * vap_coeff * self.dict_case['mol_con_m']
+                           * g_par.dict_uni['F'])
+        dw = g_func.dw(self.temp_mem)
+        zeta_negative =\
+            (free_w_content[0]
+             - free_w_content[1]
+             + 5. * self.i_cd / (2. * vap_coeff * self.dict_case['mol_con_m']
+                                 * g_par.dict_uni['F'])) \
+            / (1. + dw * zeta_plus / (self.th_mem * vap_coeff))
+        m_c = 0.5 * (zeta_plus + zeta_negative)
+        m_a = 0.5 * (zeta_plus - zeta_negative)
+        self.w_cross_flow = \
+            self.i_cd / g_par.dict_uni['F'] + self.dict_case['mol_con_m'] \
+            * dw * (m_a ** 2. - m_c ** 2.) / (2. * self.th_mem)
+
+    def calc_resistivity_kvesic(self):
+        """
+        Calculates the membrane resistivity and resistance
+        according to (Kvesic, 2013).
+
+            Access to:
+            -self.mem_base_r
+            -self.mem_acl_r
+            -self.temp_mem
+            -self.active_area_dx
+
+            Manipulate:
+            -self.omega_ca
+            -self.omega
+        """
+        self.omega_ca = (self.mem_base_r
+                         - self.mem_acl_r * self.temp_mem) * 1.e-4
+        self.omega = self.omega_ca / self.active_area_dx
+
+    def calc_resistivity_gossling(self):
+        """
+        Calculates the membrane resitace for NT-PEMFC according to Goßling
+
+            Access to:
+            -self.humidity
+            -self.temp_mem
+            -self.th_mem
+            -self.active_area_dx
+
+            Manipulate:
+            -self.omega_ca
+            -self.omega
+        """
+        res_t = np.exp(self.fac_m * 1.e3 / self.temp_mem + self.fac_n)
+        r_avg = (self.humidity[0] + self.humidity[1]) * 0.5
+        lambda_x = np.where(r_avg > 0,
+                            0.3 + 6. * r_avg * (1. - np.tanh(r_avg - 0.5))
+                            + 3.9 * np.sqrt(np.maximum(r_avg, 0.))
+                            * (1. + np.tanh((r_avg - 0.89) / 0.23)),
+                            -1. / (r_avg - (3. + 1. / 3.)))
+        a = -0.007442
+        b = 0.006053
+        c = 0.0004702
+        d = 1.144
+        e = 8.
+        res_lambda = a + b * lambda_x + c * np.exp(d * (lambda_x - e))
+        res = res_lambda * res_t / 0.01415
+        rp = self.th_mem / res
+        self.omega_ca = 1.e-4 * (self.fac_res_basic
+                                 + rp * self.fac_res_fit)
+        self.omega = self.omega_ca / self.active_area_dx
+
+    def calc_resistivity_springer(self):
+        """
+        Calculates the membrane resistivity
+        for NT-PEMFC according to (Springer, 1991).
+        As before, the membrane resistance self.omega is not set
+        by this model.
+
+            Access to:
+            -self.humidity
+            -self.temp_mem
+            -self.th_mem
+
+            Manipulate:
+            -self.omega_ca
+        """
+        free_water_content = \
+            self.calc_free_water_content((self.humidity[0]
+                                          + self.humidity[1]) * 0.5)
+        mem_el_con = 0.005139 * free_water_content - 0.00326
+        mem_el_con_temp =\
+            np.exp(1268 * (0.0033 - 1. / self.temp_mem)) * mem_el_con
+        self.omega_ca = self.th_mem / mem_el_con_temp * 1.e-4
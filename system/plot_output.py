@@ -0,0 +1,223 @@
+import numpy as np
+import collections
+import concurrent.futures as c_fut
+import os
+from matplotlib import pyplot as plt
+
+
+OutputField = collections.namedtuple('OutputField',
+                                     ['name', 'accessor', 'label', 'units',
+                                      'scale', 'grid', 'y_lim'],
+                                     defaults=(1., 'node', False))
+# output field of the stack cells, name is the file name of the plot,
+# accessor returns the field of a cell, scale converts it into the units,
+# grid is 'node' or 'ele'
+
+cell_fields = (
+    OutputField('Cell Voltage', lambda cell: cell.v,
+                'Voltage', 'V', grid='ele', y_lim=(0.52, 0.54)),
+    OutputField('Anode Plate - GDE Temperature', lambda cell: cell.temp[-1],
+                'Anode BPP - GDE Temperature', 'K', grid='ele'),
+    OutputField('Anode GDE - Membrane Temperature',
+                lambda cell: cell.temp[-2],
+                'Anode GDE - MEM Temperature', 'K', grid='ele'),
+    OutputField('Cathode GDL Temperature', lambda cell: cell.temp[2],
+                'Cathode GDE - MEM Temperature', 'K', grid='ele'),
+    OutputField('Cathode_Channel_Temperature',
+                lambda cell: cell.cathode.temp_fluid,
+                'Cathode Fluid Temperature', 'K'),
+    OutputField('Cathode GDE - Plate Temperature', lambda cell: cell.temp[1],
+                'Cathode BPP-GDE Temperature', 'K', grid='ele'),
+    OutputField('Anode_Channel_Temperature',
+                lambda cell: cell.anode.temp_fluid,
+                'Anode Fluid Temperature', 'K'),
+    OutputField('Coolant Plate Temperature', lambda cell: cell.temp[0],
+                'BPP - BPP Temperature', 'K', grid='ele'),
+    OutputField('Cathode Oxygen Molar Flow',
+                lambda cell: cell.cathode.mol_flow[0],
+                'Cathode Oxygen Molar Flow', 'mmol/s', 1.e3),
+    OutputField('Cathode Water Molar Flow',
+                lambda cell: cell.cathode.mol_flow[1],
+                'Cathode Water Molar Flow', 'mmol/s', 1.e3),
+    OutputField('Cathode Nitrogen Molar Flow',
+                lambda cell: cell.cathode.mol_flow[2],
+                'Cathode Nitrogen Molar Flow', 'mmol/s', 1.e3),
+    OutputField('Anode Hydrogen Molar Flow',
+                lambda cell: cell.anode.mol_flow[0],
+                'Anode Hydrogen Molar Flow', 'mmol/s', 1.e3),
+    OutputField('Anode Water Molar Flow', lambda cell: cell.anode.mol_flow[1],
+                'Anode Water Molar Flow', 'mmol/s', 1.e3),
+    OutputField('Anode Nitrogen Molar Flow',
+                lambda cell: cell.anode.mol_flow[2],
+                'Anode Nitrogen Molar Flow', 'mmol/s', 1.e3),
+    OutputField('Oxygen_Molar_Fraction', lambda cell: cell.cathode.mol_f[0],
+                'Oxygen Molar Fraction', None),
+    OutputField('Water Molar Fraction Cathode',
+                lambda cell: cell.cathode.mol_f[1],
+                'Cathode Gas Water Molar Fraction', None),
+    OutputField('Nitrogen_Molar_Fraction_Cathode',
+                lambda cell: cell.cathode.mol_f[2],
+                'Cathode Nitrogen Molar Fraction', None),
+    OutputField('Hydrogen_Molar_Fraction_Anode',
+                lambda cell: cell.anode.mol_f[0],
+                'Hydrogen Molar Fraction', None),
+    OutputField('Water_Molar_Fraction_Anode', lambda cell: cell.anode.mol_f[1],
+                'Anode Gas Water Molar Fraction', None),
+    OutputField('Nitrogen_Molar_Fraction_Anode',
+                lambda cell: cell.anode.mol_f[2],
+                'Anode Nitrogen Molar Fraction', None),
+    OutputField('Liquid Water Flow Cathode',
+                lambda cell: cell.cathode.liq_w_flow,
+                'Cathode Liquid Water Flow', 'mmol/s', 1.e3),
+    OutputField('Water Condensation Rate Cathode',
+                lambda cell: cell.cathode.cond_rate,
+                'Cathode Water Condensation Rate', 'mmol/s', 1.e3),
+    OutputField('Relative Humidity Cathode',
+                lambda cell: cell.cathode.humidity,
+                'Cathode Relative Humidity', None),
+    OutputField('Cathode_Channel__Gas_Massflow',
+                lambda cell: cell.cathode.m_flow_gas,
+                'Cathode Channel Gas Massflow', 'mg/s', 1.e6),
+    OutputField('Cathode_Channel_Fluid_Massflow',
+                lambda cell: cell.cathode.m_flow_fluid,
+                'Cathode Channel Fluid Massflow', 'mg/s', 1.e6),
+    OutputField('Cathode Capacity Flow', lambda cell: cell.cathode.g_fluid,
+                'Cathode Capacity Flow', 'mW/K', 1.e3),
+    OutputField('Oxygen_massflow', lambda cell: cell.cathode.m_flow_reac,
+                'Oxygen Massflow', 'mg/s', 1.e6),
+    OutputField('Vapour Massflow', lambda cell: cell.cathode.m_flow_vap_w,
+                'Cathode Vapour Massflow', 'mg/s', 1.e6),
+    OutputField('Hydrogen_massflow', lambda cell: cell.anode.m_flow_reac,
+                'Hydrogen Massflow', 'mg/s', 1.e6),
+    OutputField('Cathode Heat Capacity', lambda cell: cell.cathode.cp_fluid,
+                'Cathode Heat Capacity', 'J/(kgK)'),
+    OutputField('Cathode Channel Pressure', lambda cell: cell.cathode.p,
+                'Cathode Channel Pressure', 'Pa'),
+    OutputField('Anode Channel Pressure', lambda cell: cell.anode.p,
+                'Anode Channel Pressure', 'Pa'))
+# plotted output fields of the stack cells
+
+
+def init_worker():
+    """
+    Sets the non interactive Agg backend in a plot worker process.
+    """
+    plt.switch_backend('agg')
+
+
+def extract_fields(cells, fields=cell_fields):
+    """
+    Extracts the given output fields of all cells
+    into (cell, node) or (cell, element) arrays in their plot units.
+    """
+    return {item.name: np.array([item.accessor(cell) for cell in cells])
+            * item.scale for item in fields}
+
+
+def get_axis_label(field):
+    """
+    Returns the axis label of an output field with its units.
+    """
+    if field.units is None:
+        return field.label
+    return field.label + ' $[' + field.units + ']$'
+
+
+def plot_cells(y_values, x_values, y_label, x_label, title, x_lim, y_lim,
+               path):
+    """
+    Plots a (cell, x) array with one colored line per cell.
+    """
+    for l in range(len(y_values)):
+        plt.plot(x_values, y_values[l],
+                 color=plt.cm.coolwarm(l / len(y_values)), marker='.')
+    plt.xlabel(x_label, fontsize=16)
+    plt.ylabel(y_label, fontsize=16)
+    plt.yscale('linear')
+    plt.tick_params(labelsize=14)
+    plt.autoscale(tight=True, axis='both', enable=True)
+    plt.xlim(x_lim[0], x_lim[1])
+    if y_lim is not False:
+        plt.ylim(y_lim[0], y_lim[1])
+    plt.tight_layout()
+    plt.grid()
+    plt.savefig(path + title + '.png')
+    plt.close()
+
+
+def plot_z_cut(temp_layer, x_layer, path):
+    """
+    Plots the layer temperatures of each element over the stack height.
+    The temperature list contains the (layer, element) array of each cell.
+    """
+    t = np.concatenate(temp_layer)
+    n_ele = t.shape[-1]
+    for w in range(n_ele):
+        plt.plot(x_layer, t[:, w],
+                 color=plt.cm.coolwarm((w + 1.e-20) / float(n_ele)))
+    plt.xlim(0, x_layer[-1])
+    plt.xlabel('Stack Location $[m]$', fontsize=16)
+    plt.ylabel('Temperature $[K]$', fontsize=16)
+    plt.tick_params(labelsize=14)
+    plt.autoscale(tight=True, axis='both', enable=True)
+    plt.tight_layout()
+    plt.savefig(os.path.join(path + 'Z-Cut-Temperature' + '.png'))
+    plt.close()
+
+
+class PlotPool:
+
+    def __init__(self, workers):
+        # Handover
+        self.workers = workers
+        # number of worker processes
+        self.pool = None
+        # process pool, started with the first plot jobs
+
+    def start(self):
+        """
+        Starts the worker processes, if they are not running yet.
+        The processes are forked at once, so that this has to be called
+        from the main thread before the plot jobs are handed
+        to the background output thread.
+
+            Manipulate:
+            -self.pool
+        """
+        if self.pool is None:
+            self.pool = c_fut.ProcessPoolExecutor(max_workers=self.workers,
+                                                  initializer=init_worker)
+            self.pool.submit(init_worker).result()
+
+    def run(self, jobs):
+        """
+        Runs the plot jobs in the worker processes and waits for them.
+        """
+        self.start()
+        run_jobs(jobs, self.pool)
+
+    def shutdown(self):
+        """
+        Stops the worker processes after the last plot jobs.
+
+            Manipulate:
+            -self.pool
+        """
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
+
+def run_jobs(jobs, pool=None):
+    """
+    Runs the plot jobs (function, arguments) in the given process pool
+    or, without a pool, one after the other.
+    An error of a job is raised again in the calling thread.
+    """
+    if pool is None:
+        for func, args in jobs:
+            func(*args)
+    else:
+        futures = [pool.submit(func, *args) for func, args in jobs]
+        for item in futures:
+            item.result()
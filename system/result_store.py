@@ -0,0 +1,194 @@
+import numpy as np
+import numbers
+import types
+import copy
+import json
+import os
+import errno
+
+
+"""Result fields of a load point"""
+cell_fields = ('i_cd', 'v', 'v_loss', 'mem_loss', 'omega', 'omega_ca',
+               'temp_mem', 'w_cross_flow')
+# field names of the cell objects, stored as (cell, ...) arrays
+half_cell_fields = ('mol_flow', 'gas_con', 'mol_f', 'mass_f', 'cp', 'visc',
+                    'lambdas', 'r_gas', 'cp_gas', 'visc_gas', 'lambda_gas',
+                    'rho_gas', 'u', 'p', 'humidity', 'ht_coef', 'cp_fluid',
+                    'm_flow_fluid', 'm_flow_gas', 'liq_w_flow', 'cond_rate',
+                    'temp_fluid', 'stoi', 'act_loss', 'cl_diff_loss',
+                    'gdl_diff_loss', 'v_loss')
+# field names of the half cell objects, stored as (cell, ...) arrays
+# with the prefix 'cathode_' or 'anode_'
+manifold_fields = ('cell_stoi', 'head_p', 'head_mol_flow', 'head_temp')
+# field names of the manifold objects, stored
+# with the prefix 'manifold_cathode_' or 'manifold_anode_'
+meta_name = 'meta'
+# name of the metadata entry of the result container
+
+
+def gather_results(stack):
+    """
+    Gathers the result fields of all stack cells, the layer and coolant
+    temperatures and the manifold results into named arrays.
+
+        Access to:
+        - stack.cells, stack.temp_sys, stack.manifold
+        - cell_fields, half_cell_fields, manifold_fields
+    """
+
+    def gather(items, name):
+        return np.array([np.asarray(getattr(item, name), dtype=float)
+                         for item in items])
+
+    results = {}
+    for name in cell_fields:
+        results[name] = gather(stack.cells, name)
+    for prefix in ('cathode', 'anode'):
+        half_cells = [getattr(item, prefix) for item in stack.cells]
+        for name in half_cell_fields:
+            results[prefix + '_' + name] = gather(half_cells, name)
+    results['v_cell'] = np.array(stack.v_cell)
+    results['temp_layer'] = \
+        np.array([item[:5] for item in stack.temp_sys.temp_layer])
+    results['temp_end_plate'] = np.array(stack.temp_sys.temp_layer[-1][5])
+    results['temp_cool'] = np.array(stack.temp_sys.temp_cool)
+    for prefix, item in zip(('cathode', 'anode'), stack.manifold):
+        for name in manifold_fields:
+            results['manifold_' + prefix + '_' + name] = \
+                np.array(getattr(item, name), dtype=float)
+    return results
+
+
+def copy_values(obj):
+    """
+    Returns a namespace with copies of the array, number and array list
+    attributes of the given object, e.g. without solver objects
+    that cannot be copied.
+    """
+    values = {}
+    for name, value in vars(obj).items():
+        if isinstance(value, list):
+            keep = all(isinstance(item, (np.ndarray, numbers.Number))
+                       for item in value)
+        else:
+            keep = isinstance(value, (np.ndarray, numbers.Number))
+        if keep is True:
+            values[name] = copy.deepcopy(value)
+    return types.SimpleNamespace(**values)
+
+
+def snapshot_stack(stack):
+    """
+    Returns a copy of the result values of the stack, its cells,
+    half cells, manifolds and temperature system with the attribute
+    structure of the stack, which is not changed by further iterations.
+    """
+    snapshot = copy_values(stack)
+    snapshot.cells = []
+    for item in stack.cells:
+        cell = copy_values(item)
+        cell.cathode = copy_values(item.cathode)
+        cell.anode = copy_values(item.anode)
+        snapshot.cells.append(cell)
+    snapshot.manifold = [copy_values(item) for item in stack.manifold]
+    snapshot.temp_sys = copy_values(stack.temp_sys)
+    return snapshot
+
+
+def get_settings(inputs):
+    """
+    Returns the json serializable settings of the given
+    {input name: {name: value}} dict in the same structure.
+    """
+    settings = {}
+    for input_name, values in inputs.items():
+        items = {}
+        for name, value in values.items():
+            if name.startswith('_'):
+                continue
+            if isinstance(value, np.ndarray):
+                value = value.tolist()
+            try:
+                json.dumps(value)
+            except TypeError:
+                continue
+            items[name] = value
+        settings[input_name] = items
+    return settings
+
+
+def make_dir(path):
+    """
+    Creates the given directory if it does not exist,
+    an empty path refers to the current directory.
+    """
+    if path == '':
+        return
+    try:
+        os.makedirs(path)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+
+def save_results(path, results, meta, file_format='npz'):
+    """
+    Stores the named result arrays and the metadata of a load point
+    in one container. 'npz' writes one compressed .npz file,
+    'npy' writes a directory of .npy files, which can be memory mapped,
+    and the metadata as meta.json. Returns the path of the container.
+    """
+    meta_str = json.dumps(meta, default=float)
+    if file_format == 'npy':
+        make_dir(path)
+        for name, value in results.items():
+            np.save(os.path.join(path, name + '.npy'), value)
+        with open(os.path.join(path, meta_name + '.json'), 'w') as file:
+            file.write(meta_str)
+    else:
+        if not path.endswith('.npz'):
+            path = path + '.npz'
+        make_dir(os.path.dirname(path))
+        np.savez_compressed(path, **results, **{meta_name: np.array(meta_str)})
+    return path
+
+
+def load_results(path, mmap_mode=None):
+    """
+    Loads a result container written by save_results
+    and returns the named result arrays and the metadata.
+    The mmap_mode is passed to np.load for the .npy files
+    of a result directory.
+    """
+    if os.path.isdir(path):
+        results = {}
+        for name in sorted(os.listdir(path)):
+            if name.endswith('.npy'):
+                results[name[:-4]] = np.load(os.path.join(path, name),
+                                             mmap_mode=mmap_mode)
+        with open(os.path.join(path, meta_name + '.json')) as file:
+            meta = json.load(file)
+    else:
+        with np.load(path) as data:
+            results = {name: data[name] for name in data.files
+                       if name != meta_name}
+            meta = json.loads(str(data[meta_name]))
+    return results, meta
+
+
+def export_csv(path, results, meta=None, delimiter=',', fmt='%.9e'):
+    """
+    Converts the named result arrays into one csv file per field.
+    Arrays with more than two dimensions are written
+    with their leading axes flattened into the rows.
+    """
+    make_dir(path)
+    for name, value in results.items():
+        value = np.asarray(value)
+        if value.ndim > 2:
+            value = value.reshape(-1, value.shape[-1])
+        np.savetxt(os.path.join(path, name + '.csv'), np.atleast_1d(value),
+                   delimiter=delimiter, fmt=fmt)
+    if meta is not None:
+        with open(os.path.join(path, meta_name + '.json'), 'w') as file:
+            json.dump(meta, file, indent=1, default=float)
@@ -1,27 +1,27 @@
 import numpy as np
 import copy as copy
-import data.global_parameters as g_par
+import system.global_functions as g_func
 import system.cell as cl
-import data.cell_dict as c_dict
 import system.manifold as m_fold
 import data.manifold_dict as m_fold_dict
 import system.electrical_coupling as el_cpl
 import data.electrical_coupling_dict as el_cpl_dict
 import system.temperature_system as therm_cpl
-import data.temperature_system_dict as therm_dict
 
 
 class Stack:
 
-    def __init__(self, dict_stack):
+    def __init__(self, dict_stack, config, block_pool=None):
         # Handover
+        self.dict_case = config.dict_case
+        # case parameters of the simulation
         self.cell_numb = dict_stack['cell_numb']
         # number of cells of the stack
         self.stoi_cat = dict_stack['stoi_cat']
         # inlet stoichiometry of the cathode header
         self.stoi_ano = dict_stack['stoi_ano']
         # inlet stoichiometry of the anode header
-        nodes = g_par.dict_case['nodes']
+        nodes = self.dict_case['nodes']
         # node points along the x-axis
         self.alpha_env = dict_stack['alpha_env']
         # environment convection coefficient
@@ -31,27 +31,38 @@ class Stack:
         # switch to calculate the current density distribution
         self.calc_flow_dis = dict_stack['calc_flow_distribution']
         # switch to calculate the flow distribution
+        self.vectorized = dict_stack['vectorized_cells']
+        # switch to evaluate all cells at once in (cell, node) arrays
 
-        self.cells = []
+        self.cells = [cl.Cell(config.dict_cell, config)]
         # list of the stack cells
-        for w in range(self.cell_numb):
-            x = cl.Cell(c_dict.dict_cell)
+        self.membrane = self.cells[0].membrane
+        # membranes of all stack cells in (cell, element) arrays,
+        # one object shared by all cells
+        for w in range(1, self.cell_numb):
+            x = cl.Cell(config.dict_cell, config, membrane=self.membrane)
             self.cells.append(x)
         self.set_stoichiometry(np.full(self.cell_numb, self.stoi_cat),
                                np.full(self.cell_numb, self.stoi_ano))
+        self.cell_array = None
+        # all stack cells in (cell, node) arrays,
+        # the results are set to the objects in self.cells
+        if self.vectorized is True:
+            self.cell_array = cl.Cell(config.dict_cell, config,
+                                      self.cell_numb, self.membrane)
 
         # Initialize the manifolds
-        self.manifold = [m_fold.Manifold(m_fold_dict.dict_mfold_cat),
-                         m_fold.Manifold(m_fold_dict.dict_mfold_ano)]
+        self.manifold = [m_fold.Manifold(config.dict_mfold_cat),
+                         m_fold.Manifold(config.dict_mfold_ano)]
         self.manifold[0].head_stoi = self.stoi_cat
         self.manifold[1].head_stoi = self.stoi_ano
 
         # Initialize the electrical coupling
         self.el_cpl_stack = el_cpl\
-            .ElectricalCoupling(el_cpl_dict.dict_electrical_coupling)
+            .ElectricalCoupling(config.dict_electrical_coupling, config)
 
         """boolean alarms"""
-        self.v_alarm = False
+        self.v_alarm = np.full(self.cell_numb, False)
         # True if :voltage loss > cell voltage
         self.break_program = False
         # True if the program aborts because of some critical impact
@@ -61,64 +72,77 @@ class Stack:
         # convergence criteria of the air manifold
         self.anode_mfd_criteria = 0.
         # convergence criteria of the h2 gas mix manifold
+        self.mfd_converged = True
+        # False if the flow distribution solve of a manifold
+        # did not converge in the last update
         self.i_cd = np.full((self.cell_numb, nodes - 1),
-                            g_par.dict_case['tar_cd'])
+                            self.dict_case['tar_cd'])
         # current density
         self.i_cd_old = copy.deepcopy(self.i_cd)
         # current density of the last iteration
         self.i = np.full((self.cell_numb, nodes - 1), 20.)
         # current
-        self.v_cell = []
+        self.v_cell = np.full((self.cell_numb, nodes - 1), 0.)
         # cell voltage
-        self.v_loss = []
+        self.v_loss = np.full((self.cell_numb, nodes - 1), 0.)
         # cell voltage loss
-        self.v_loss_cat = []
-        # cathode voltage loss
-        self.v_loss_ano = []
-        # anode voltage loss
-        self.stack_cell_r = []
+        self.v_loss_hc = np.full((2, self.cell_numb, nodes - 1), 0.)
+        # cathode and anode voltage loss
+        self.v_loss_cat, self.v_loss_ano = self.v_loss_hc
+        # views of the cathode and anode voltage loss
+        self.stack_cell_r = np.full((self.cell_numb, nodes - 1), 0.)
         # cell resistance in z-direction
-        self.q_sum_cat = []
-        # molar flow at the inlet and outlet of the cathode channels
-        self.q_sum_ano = []
-        # molar flow  at the inlet and outlet of the anode channels
-        self.m_sum_cat = []
-        # mass flow at the inlet and outlet of the cathode channels
-        self.m_sum_ano = []
-        # mass flow at the inlet and outlet of the anode channels
-        self.cp_cat = []
-        # heat capacity in the cathode channels
-        self.cp_ano = []
-        # heat capacity in the anode channels
-        self.visc_cat = []
-        # viscosity at the inlet and outlet of the cathode channels
-        self.visc_ano = []
-        # viscosity at the inlet and outlet of the anode channels
-        self.p_cat = []
-        # pressure at the inlet and outlet of the cathode channels
-        self.p_ano = []
-        # pressure at the inlet and outlet of the anode channels
-        self.r_cat = []
-        # gas constant of air fluid at the inlet
-        # and outlet of the cathode channels
-        self.r_ano = []
-        # gas constant of the hydrogen fluid at the
-        # inlet and outlet of the anode channels
-        self.temp_fluid_cat = []
-        # inlet and outlet temperature of the cathode channel fluid
-        self.temp_fluid_ano = np.zeros(self.cell_numb)
-        # inlet and outlet temperature of the anode channel fluid
+        self.q_sum = np.full((2, 2, self.cell_numb), 0.)
+        # molar flow at the inlet and outlet of the cathode
+        # and anode channels
+        self.q_sum_cat, self.q_sum_ano = self.q_sum
+        # views of the cathode and anode molar flow
+        self.m_sum_f = np.full((2, 2, self.cell_numb), 0.)
+        # fluid mass flow at the inlet and outlet of the cathode
+        # and anode channels
+        self.m_sum_f_cat, self.m_sum_f_ano = self.m_sum_f
+        # views of the cathode and anode fluid mass flow
+        self.m_sum_g = np.full((2, 2, self.cell_numb), 0.)
+        # gas mass flow at the inlet and outlet of the cathode
+        # and anode channels
+        self.m_sum_g_cat, self.m_sum_g_ano = self.m_sum_g
+        # views of the cathode and anode gas mass flow
+        self.cp = np.full((2, 2, self.cell_numb), 0.)
+        # heat capacity at the inlet and outlet of the cathode
+        # and anode channels
+        self.cp_cat, self.cp_ano = self.cp
+        # views of the cathode and anode heat capacity
+        self.visc = np.full((2, 2, self.cell_numb), 0.)
+        # viscosity at the inlet and outlet of the cathode
+        # and anode channels
+        self.visc_cat, self.visc_ano = self.visc
+        # views of the cathode and anode viscosity
+        self.p = np.full((2, 2, self.cell_numb), 0.)
+        # pressure at the inlet and outlet of the cathode
+        # and anode channels
+        self.p_cat, self.p_ano = self.p
+        # views of the cathode and anode pressure
+        self.r = np.full((2, 2, self.cell_numb), 0.)
+        # gas constant of the fluid at the inlet and outlet
+        # of the cathode and anode channels
+        self.r_cat, self.r_ano = self.r
+        # views of the cathode and anode gas constant
+        self.temp_fluid = np.full((2, 2, self.cell_numb), 0.)
+        # inlet and outlet temperature of the cathode
+        # and anode channel fluid
+        self.temp_fluid_cat, self.temp_fluid_ano = self.temp_fluid
+        # views of the cathode and anode fluid temperature
         self.k_alpha_env = np.full((2, 3, self.cell_numb), 0.)
         # convection conductance to the environment
-        self.k_alpha_ch = None
+        self.k_alpha_ch = np.full((2, self.cell_numb, nodes), 0.)
         # convection conductance between the channel and the fluid
         self.cond_rate = np.full((2, self.cell_numb, nodes), 0.)
         # molar condensation rate
-        self.omega = np.full((self.cell_numb, nodes), 0.)
+        self.omega = np.full((self.cell_numb, nodes - 1), 0.)
         # electrical resistance of the membrane
         self.m_reac_flow_delta = np.full((self.cell_numb, nodes), 0.)
         # mass flow of the consumed oxygen in the cathode channels
-        self.g_fluid = []
+        self.g_fluid = np.full((2, self.cell_numb, nodes), 0.)
         # heat capacity flow of the channel fluids
         self.cp_h2 = np.full((self.cell_numb, nodes), 0.)
         k_p, k_g, k_m = [], [], []
@@ -151,22 +175,30 @@ class Stack:
                 self.alpha_env * item.cathode.channel.dx\
                 * item.cathode.th_bpp / fac
         # Initialize the thermal coupling
-        therm_dict.dict_temp_sys['k_layer'] = self.k_layer
-        therm_dict.dict_temp_sys['k_alpha_env'] = self.k_alpha_env
         self.temp_sys = therm_cpl.\
-            TemperatureSystem(therm_dict.dict_temp_sys)
+            TemperatureSystem(dict(config.dict_temp_sys,
+                                   k_layer=self.k_layer,
+                                   k_alpha_env=self.k_alpha_env), config,
+                              block_pool)
 
     def update(self):
         """
         This function coordinates the program sequence
         """
-        for j in range(self.cell_numb):
-            #self.cells[j].set_current_density(self.i_cd[j, :])
-            self.cells[j].i_cd = self.i_cd[j, :]
-            self.cells[j].update()
-            if self.cells[j].break_program is True:
-                self.break_program = True
-                break
+        if self.vectorized is True:
+            self.update_cell_array()
+        else:
+            for j in range(self.cell_numb):
+                #self.cells[j].set_current_density(self.i_cd[j, :])
+                self.cells[j].i_cd = self.i_cd[j, :]
+                self.cells[j].update_half_cells()
+                if self.cells[j].break_program is True:
+                    self.break_program = True
+                    break
+            if self.break_program is False:
+                self.update_membranes()
+                for item in self.cells:
+                    item.update_voltage()
         if self.break_program is False:
             self.stack_dynamic_properties()
             if self.calc_temp is True:
@@ -178,6 +210,69 @@ class Stack:
             if self.calc_cd is True:
                 self.update_electrical_coupling()
 
+    def update_cell_array(self):
+        """
+        This function updates all cells at once in (cell, node) arrays.
+        The inputs are gathered from the objects in self.cells
+        and the results are set back to them.
+
+            Access to:
+            -self.cells
+            -self.i_cd
+
+            Manipulate:
+            -self.cell_array
+            -self.cells
+            -self.break_program
+        """
+
+        cells = self.cell_array
+        cells.i_cd = self.i_cd
+        cells.temp = np.stack([item.temp for item in self.cells], axis=1)
+        cells.w_cross_flow = \
+            np.array([item.w_cross_flow for item in self.cells])
+        for half_cells, name in ((cells.cathode, 'cathode'),
+                                 (cells.anode, 'anode')):
+            items = [getattr(item, name) for item in self.cells]
+            half_cells.temp_fluid = np.array([item.temp_fluid
+                                              for item in items])
+            half_cells.stoi = np.array([item.stoi for item in items])
+            half_cells.channel.p_out = np.array([item.channel.p_out
+                                                 for item in items])
+            half_cells.p = np.array([item.p for item in items])
+            half_cells.index_cat = np.array([item.index_cat
+                                             for item in items])
+        cells.update()
+        if cells.break_program is True:
+            self.break_program = True
+        else:
+            for q, item in enumerate(self.cells):
+                cells.set_cell_values(item, q)
+
+    def update_membranes(self):
+        """
+        This function updates the membrane resistivity and water cross flux
+        of all stack cells in one call.
+
+            Access to:
+            -self.cells
+
+            Manipulate:
+            -self.membrane
+            -.omega_ca
+            -.omega
+            -.w_cross_flow
+        """
+
+        self.membrane.update(np.array([item.temp_mem for item in self.cells]),
+                             np.array([item.cathode.humidity
+                                       for item in self.cells]),
+                             np.array([item.anode.humidity
+                                       for item in self.cells]),
+                             np.array([item.i_cd for item in self.cells]))
+        for q, item in enumerate(self.cells):
+            item.set_membrane_values(self.membrane, q)
+
     def update_flows(self):
         """
         This function updates the flow distribution of gas over the stack cells
@@ -204,14 +299,15 @@ class Stack:
                                  * self.cells[0].cathode.channel_numb,
                                  self.m_sum_g_ano[::-1]
                                  * self.cells[0].cathode.channel_numb))
-        self.manifold[0].update()
-        self.manifold[1].update()
+        m_fold.update_manifolds(self.manifold)
         self.set_stoichiometry(self.manifold[0].cell_stoi,
                                self.manifold[1].cell_stoi)
         self.set_channel_outlet_pressure(self.manifold[0].head_p[-1],
                                          self.manifold[1].head_p[-1])
         self.cathode_mfd_criteria = self.manifold[0].criteria
         self.anode_mfd_criteria = self.manifold[1].criteria
+        self.mfd_converged = self.manifold[0].newton_converged is True \
+            and self.manifold[1].newton_converged is True
 
     def update_electrical_coupling(self):
         """
@@ -219,8 +315,8 @@ class Stack:
         """
 
         self.el_cpl_stack.update_values(
-            el_cpl_dict.electrical_coupling(self.v_loss,
-                                            self.stack_cell_r))
+            el_cpl_dict.electrical_coupling(self.v_loss.ravel(),
+                                            self.stack_cell_r.ravel()))
         self.el_cpl_stack.update()
         self.i_cd = self.el_cpl_stack.i_cd
 
@@ -234,8 +330,7 @@ class Stack:
         self.temp_sys.update_values(self.k_alpha_ch * n_ch,
                                     self.cond_rate * n_ch,
                                     self.omega,
-                                    np.array([self.v_loss_cat,
-                                              self.v_loss_ano]),
+                                    self.v_loss_hc,
                                     self.g_fluid * n_ch, current)
         self.temp_sys.update()
         self.set_temperature()
@@ -244,113 +339,144 @@ class Stack:
         """
         This function sums up the dynamic values inside the cells
         necessary to calculate the flow distribution,
-        the electrical coupling or the temperature coupling
+        the electrical coupling or the temperature coupling.
+        The values are written into the preallocated stack arrays.
+        """
+
+        if self.vectorized is True:
+            items = [(slice(None), self.cell_array)]
+        else:
+            items = enumerate(self.cells)
+        ends = slice(None, None, self.dict_case['nodes'] - 1)
+        # inlet and outlet node of the channels
+        for q, item in items:
+            self.v_alarm[q] = item.v_alarm
+            self.v_cell[q] = item.v
+            self.v_loss[q] = item.v_loss
+            self.stack_cell_r[q] = item.resistance
+            self.omega[q] = item.omega
+            for i, half_cell in enumerate((item.cathode, item.anode)):
+                self.k_alpha_ch[i, q] = half_cell.k_ht_coef_ca
+                self.cond_rate[i, q] = half_cell.cond_rate
+                self.g_fluid[i, q] = half_cell.g_fluid
+                self.v_loss_hc[i, q] = half_cell.v_loss
+                self.q_sum[i, :, q] = half_cell.q_gas[..., ends].T
+                self.m_sum_f[i, :, q] = half_cell.m_flow_fluid[..., ends].T
+                self.m_sum_g[i, :, q] = half_cell.m_flow_gas[..., ends].T
+                self.cp[i, :, q] = half_cell.cp_fluid[..., ends].T
+                self.p[i, :, q] = half_cell.p[..., ends].T
+                self.r[i, :, q] = half_cell.r_gas[..., ends].T
+                self.visc[i, :, q] = half_cell.visc_gas[..., ends].T
+                self.temp_fluid[i, :, q] = \
+                    half_cell.temp_fluid[..., ends].T
+
+    def get_state(self):
         """
+        This function returns the state of the stack iteration,
+        the current density, the layer temperatures,
+        the inlet stoichiometry and the membrane water cross flux
+        of the cells, as 1-d-array.
 
-        v_alarm = []
-        k_alpha_cat, k_alpha_ano = [], []
-        g_fluid_cat, g_fluid_ano = [], []
-        v_cell, v_loss, resistance = [], [], []
-        v_loss_cat, v_loss_ano = [], []
-        q_sum_cat_in, q_sum_cat_out = [], []
-        q_sum_ano_in, q_sum_ano_out = [], []
-        cp_cat_in, cp_cat_out = [], []
-        cp_ano_in, cp_ano_out = [], []
-        visc_cat_in, visc_cat_out = [], []
-        visc_ano_in, visc_ano_out = [], []
-        p_cat_in, p_cat_out = [], []
-        p_ano_in, p_ano_out = [], []
-        r_cat_in, r_cat_out = [], []
-        r_ano_in, r_ano_out = [], []
-        temp_fluid_cat_in, temp_fluid_cat_out = [], []
-        temp_fluid_ano_in, temp_fluid_ano_out = [], []
-        cond_rate_cat, cond_rate_ano = [], []
-        m_sum_f_cat_in, m_sum_f_cat_out = [], []
-        m_sum_f_ano_in, m_sum_f_ano_out = [], []
-        m_sum_g_cat_in, m_sum_g_cat_out = [], []
-        m_sum_g_ano_in, m_sum_g_ano_out = [], []
-        omega = []
+            Access to:
+            -self.i_cd
+            -self.temp_sys.temp_layer_vec
+            -.cathode.stoi
+            -.anode.stoi
+            -.w_cross_flow
+        """
+
+        return np.hstack((self.i_cd.flatten(), self.temp_sys.temp_layer_vec,
+                          [item.cathode.stoi for item in self.cells],
+                          [item.anode.stoi for item in self.cells],
+                          np.hstack([item.w_cross_flow
+                                     for item in self.cells])))
+
+    def set_state(self, state):
+        """
+        This function sets the state of the stack iteration
+        from a 1-d-array in the order of self.get_state().
+
+            Manipulate:
+            -self.i_cd
+            -self.temp_sys.temp_layer_vec
+            -self.temp_sys.temp_layer
+            -self.manifold[0].cell_stoi
+            -self.manifold[1].cell_stoi
+            -.temp
+            -.cathode.stoi
+            -.anode.stoi
+            -.w_cross_flow
+        """
+
+        n_i = self.i_cd.size
+        n_temp = len(self.temp_sys.temp_layer_vec)
+        self.i_cd = np.reshape(state[:n_i], self.i_cd.shape)
+        self.temp_sys.temp_layer_vec = state[n_i:n_i + n_temp]
+        self.temp_sys.sort_results()
+        n_stoi = n_i + n_temp + 2 * self.cell_numb
+        stoi = np.reshape(state[n_i + n_temp:n_stoi], (2, self.cell_numb))
+        w_cross_flow = np.reshape(state[n_stoi:], self.i_cd.shape)
         for w, item in enumerate(self.cells):
-            v_alarm.append(item.v_alarm)
-            cond_rate_cat.append(item.cathode.cond_rate)
-            cond_rate_ano.append(item.anode.cond_rate)
-            k_alpha_cat.append(item.cathode.k_ht_coef_ca)
-            k_alpha_ano.append(item.anode.k_ht_coef_ca)
-            g_fluid_cat.append(item.cathode.g_fluid)
-            g_fluid_ano.append(item.anode.g_fluid)
-            v_cell.append(item.v)
-            v_loss = np.hstack((v_loss, item.v_loss))
-            v_loss_cat.append(item.cathode.v_loss)
-            v_loss_ano.append(item.anode.v_loss)
-            omega.append(item.omega)
-            resistance = np.hstack((resistance, item.resistance))
-            q_sum_cat_in = np.hstack((q_sum_cat_in, item.cathode.q_gas[0]))
-            q_sum_cat_out = np.hstack((q_sum_cat_out, item.cathode.q_gas[-1]))
-            q_sum_ano_in = np.hstack((q_sum_ano_in, item.anode.q_gas[0]))
-            q_sum_ano_out = np.hstack((q_sum_ano_out, item.anode.q_gas[-1]))
-            m_sum_f_cat_in = np.hstack((m_sum_f_cat_in,
-                                      item.cathode.m_flow_fluid[0]))
-            m_sum_f_cat_out = np.hstack((m_sum_f_cat_out,
-                                       item.cathode.m_flow_fluid[-1]))
-            m_sum_f_ano_in = np.hstack((m_sum_f_ano_in,
-                                      item.anode.m_flow_fluid[0]))
-            m_sum_f_ano_out = np.hstack((m_sum_f_ano_out,
-                                       item.anode.m_flow_fluid[-1]))
-            m_sum_g_cat_in = np.hstack((m_sum_g_cat_in,
-                                      item.cathode.m_flow_gas[0]))
-            m_sum_g_cat_out = np.hstack((m_sum_g_cat_out,
-                                       item.cathode.m_flow_gas[-1]))
-            m_sum_g_ano_in = np.hstack((m_sum_g_ano_in,
-                                      item.anode.m_flow_gas[0]))
-            m_sum_g_ano_out = np.hstack((m_sum_g_ano_out,
-                                       item.anode.m_flow_gas[-1]))
-            cp_cat_in = np.hstack((cp_cat_in, item.cathode.cp_fluid[0]))
-            cp_cat_out = np.hstack((cp_cat_out, item.cathode.cp_fluid[-1]))
-            cp_ano_in = np.hstack((cp_ano_in, item.anode.cp_fluid[0]))
-            cp_ano_out = np.hstack((cp_ano_out, item.anode.cp_fluid[-1]))
-            p_cat_in = np.hstack((p_cat_in, item.cathode.p[0]))
-            p_cat_out = np.hstack((p_cat_out, item.cathode.p[-1]))
-            p_ano_in = np.hstack((p_ano_in, item.anode.p[0]))
-            p_ano_out = np.hstack((p_ano_out, item.anode.p[-1]))
-            r_cat_in = np.hstack((r_cat_in, item.cathode.r_gas[0]))
-            r_cat_out = np.hstack((r_cat_out, item.cathode.r_gas[-1]))
-            r_ano_in = np.hstack((r_ano_in, item.anode.r_gas[0]))
-            r_ano_out = np.hstack((r_ano_out, item.anode.r_gas[-1]))
-            visc_cat_in = np.hstack((visc_cat_in, item.cathode.visc_gas[0]))
-            visc_cat_out = np.hstack((visc_cat_out, item.cathode.visc_gas[-1]))
-            visc_ano_in = np.hstack((visc_ano_in, item.anode.visc_gas[0]))
-            visc_ano_out = np.hstack((visc_ano_out, item.anode.visc_gas[-1]))
-            temp_fluid_cat_in = np.hstack((temp_fluid_cat_in,
-                                           item.cathode.temp_fluid[0]))
-            temp_fluid_cat_out = np.hstack((temp_fluid_cat_out,
-                                            item.cathode.temp_fluid[-1]))
-            temp_fluid_ano_in = np.hstack((temp_fluid_ano_in,
-                                           item.anode.temp_fluid[0]))
-            temp_fluid_ano_out = np.hstack((temp_fluid_ano_out,
-                                            item.anode.temp_fluid[-1]))
-        self.k_alpha_ch = np.array([k_alpha_cat, k_alpha_ano])
-        self.omega = np.array(omega)
-        self.cond_rate = np.array([cond_rate_cat, cond_rate_ano])
-        self.g_fluid = np.array([g_fluid_cat, g_fluid_ano])
-        self.v_cell, self.v_loss, self.stack_cell_r = v_cell, v_loss, resistance
-        self.v_loss_cat, self.v_loss_ano = v_loss_cat, v_loss_ano
-        self.q_sum_cat = np.array([q_sum_cat_in, q_sum_cat_out])
-        self.q_sum_ano = np.array([q_sum_ano_in, q_sum_ano_out])
-        self.m_sum_f_cat = np.array([m_sum_f_cat_in, m_sum_f_cat_out])
-        self.m_sum_f_ano = np.array([m_sum_f_ano_in, m_sum_f_ano_out])
-        self.m_sum_g_cat = np.array([m_sum_g_cat_in, m_sum_g_cat_out])
-        self.m_sum_g_ano = np.array([m_sum_g_ano_in, m_sum_g_ano_out])
-        self.cp_cat = np.array([cp_cat_in, cp_cat_out])
-        self.cp_ano = np.array([cp_ano_in, cp_ano_out])
-        self.visc_cat = np.array([visc_cat_in, visc_cat_out])
-        self.visc_ano = np.array([visc_ano_in, visc_ano_out])
-        self.p_cat = np.array([p_cat_in, p_cat_out])
-        self.p_ano = np.array([p_ano_in, p_ano_out])
-        self.r_cat = np.array([r_cat_in, r_cat_out])
-        self.r_ano = np.array([r_ano_in, r_ano_out])
-        self.temp_fluid_cat = np.array([temp_fluid_cat_in, temp_fluid_cat_out])
-        self.temp_fluid_ano = np.array([temp_fluid_ano_in, temp_fluid_ano_out])
-        self.v_alarm = np.array(v_alarm)
+            item.w_cross_flow = w_cross_flow[w]
+        self.manifold[0].cell_stoi = stoi[0]
+        self.manifold[1].cell_stoi = stoi[1]
+        self.set_stoichiometry(stoi[0], stoi[1])
+        self.set_temperature()
+
+    def interpolate_state(self, stack):
+        """
+        This function initializes the stack from the results of a stack
+        with a different number of elements. The current density,
+        the layer, fluid and coolant temperatures, the water cross flux
+        and the channel pressures are linearly interpolated
+        along the channel, the stoichiometry and the outlet pressure
+        of the cells are taken over.
+
+            Access to:
+            -stack
+
+            Manipulate:
+            -self.i_cd
+            -self.temp_sys.temp_layer
+            -self.temp_sys.temp_layer_vec
+            -self.temp_sys.temp_fluid
+            -self.temp_sys.temp_cool
+            -self.manifold[0].cell_stoi
+            -self.manifold[1].cell_stoi
+            -.w_cross_flow
+            -.cathode.p
+            -.anode.p
+            -.cathode.channel.p_out
+            -.anode.channel.p_out
+        """
+
+        nodes = self.dict_case['nodes']
+        elements = nodes - 1
+        i_cd = g_func.interpolate_elements(stack.i_cd, elements)
+        self.i_cd = i_cd / np.average(i_cd) * self.dict_case['tar_cd']
+        for w, item in enumerate(self.temp_sys.temp_layer):
+            item[:] = g_func.interpolate_elements(
+                stack.temp_sys.temp_layer[w], elements)
+        self.temp_sys.temp_layer_vec = \
+            np.hstack([item.transpose().flatten()
+                       for item in self.temp_sys.temp_layer])
+        self.temp_sys.temp_fluid = \
+            g_func.interpolate_nodes(stack.temp_sys.temp_fluid, nodes)
+        self.temp_sys.temp_cool = \
+            g_func.interpolate_nodes(stack.temp_sys.temp_cool, nodes)
+        self.manifold[0].cell_stoi = np.copy(stack.manifold[0].cell_stoi)
+        self.manifold[1].cell_stoi = np.copy(stack.manifold[1].cell_stoi)
+        for w, item in enumerate(self.cells):
+            item_old = stack.cells[w]
+            item.w_cross_flow = \
+                g_func.interpolate_elements(item_old.w_cross_flow, elements)
+            item.cathode.stoi = item_old.cathode.stoi
+            item.anode.stoi = item_old.anode.stoi
+            item.cathode.p = g_func.interpolate_nodes(item_old.cathode.p, nodes)
+            item.anode.p = g_func.interpolate_nodes(item_old.anode.p, nodes)
+            item.cathode.channel.p_out = item_old.cathode.channel.p_out
+            item.anode.channel.p_out = item_old.anode.channel.p_out
+        self.set_temperature()
 
     def set_stoichiometry(self, stoi_cat, stoi_ano):
         """
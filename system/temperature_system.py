@@ -1,16 +1,19 @@
 import numpy as np
-import scipy.linalg as sp_l
-import data.global_parameters as g_par
+import scipy.sparse as sp_s
+import scipy.sparse.linalg as sp_sl
 import system.global_functions as g_func
-import data.water_properties as w_prop
 
 np.set_printoptions(linewidth=10000, threshold=None, precision=2)
 
 
 class TemperatureSystem:
 
-    def __init__(self, temp_sys_const_dict):
+    def __init__(self, temp_sys_const_dict, config, block_pool=None):
         # Handover
+        self.dict_case = config.dict_case
+        # case parameters of the simulation
+        self.water = config.water
+        # property fits of liquid water
         self.n_cells = temp_sys_const_dict['cell_numb']
         # cell number
         self.nodes = temp_sys_const_dict['nodes']
@@ -53,9 +56,21 @@ class TemperatureSystem:
         # heat conductance array through and along the control volume
         self.k_alpha_env = temp_sys_const_dict['k_alpha_env']
         # heat conductance from control volume to the environment
-        self.temp_env = g_par.dict_case['temp_env']
+        self.implicit_fluid = temp_sys_const_dict['implicit_fluid']
+        # switch to solve the coolant and gas channel fluid temperatures
+        # implicit together with the layer temperatures
+        self.solver = temp_sys_const_dict['solver']
+        # solver of the layer temperatures,
+        # 'monolithic', 'jacobi' or 'gauss_seidel'
+        self.block_crit = temp_sys_const_dict['block_crit']
+        # convergence criteria of the cell interface temperatures
+        self.block_max_it = temp_sys_const_dict['block_max_it']
+        # maximal number of block iterations
+        self.show_it_output = temp_sys_const_dict['show_it_output']
+        # switch to print the block iteration report
+        self.temp_env = self.dict_case['temp_env']
         # environment temperature
-        self.v_tn = g_par.dict_case['v_tn']
+        self.v_tn = self.dict_case['v_tn']
         # thermodynamic neutral cell voltage
 
         """General values"""
@@ -63,11 +78,71 @@ class TemperatureSystem:
         # over the iterations constant conductance matrix
         self.mat_dyn = None
         # over the iterations dynamic conductance matrix
+        self.mat_lu = None
+        # sparse lu factorization of the dynamic conductance matrix
+        self.dyn_vec_lu = None
+        # dynamic diagonal entries the factorization was computed for
+        self.pos_dyn_data = None
+        # positions of the dynamic diagonal entries in self.mat_dyn.data
+        self.diag_const_dyn = None
+        # constant part of the dynamic diagonal entries
+        self.n_layer = self.n_ele * (5 * (self.n_cells - 1) + 6)
+        # number of layer temperature unknowns
+        self.pos_layer = None
+        # coordinates of the first layer of each cell element
+        self.pos_rhs = None
+        # coordinates of the layers 0-4 of each cell element
+        self.cool_ch_id = None
+        # coolant channels coupled to the layers, implicit formulation
+        self.pos_cool_wall = None
+        # coordinates of the layers coupled to the coolant channels
+        self.mat_impl = None
+        # conductance matrix of the implicit layer and fluid system
+        self.rhs_impl = None
+        # right hand side of the implicit layer and fluid system
+        self.pos_impl_data = None
+        # positions of the layer and fluid entries in self.mat_impl.data
+        self.pos_fluid_up = None
+        # coordinates of the upstream fluid node of each fluid element
+        self.pos_fluid_down = None
+        # coordinates of the downstream fluid node of each fluid element
+        self.pos_fluid_wall = None
+        # coordinates of the layer coupled to each fluid element
+        self.pos_fluid_in = None
+        # coordinates of the fluid inlet node of each channel
+        self.pos_fluid_lim = None
+        # coordinates of the layer limiting each gas channel element
+        self.fluid_lim = np.full((2, self.n_cells, self.n_ele), False)
+        # True if the gas channel element temperature is limited
+        # by its layer temperature, 0: cathode fluids, 1: anode fluids
+        self.mat_impl_lu = None
+        # sparse lu factorization of the implicit system matrix
+        self.pos_block = \
+            np.hstack((np.arange(self.n_cells) * 5 * self.n_ele,
+                       self.n_layer))
+        # first coordinate of each cell block and the system size
+        self.pos_interface = None
+        # coordinates of the layers at the cell interfaces (BPP-BPP)
+        self.mat_cpl = None
+        # heat conductance matrix between the cell blocks
+        self.block_lu = None
+        # sparse lu factorizations of the cell block matrices
+        self.block_groups = None
+        # groups of cells solved simultaneously in a block iteration
+        self.block_pool = block_pool
+        # worker threads for the cell block solves, owned by the simulation
+        self.block_it = 0
+        # number of block iterations of the last solve
+        self.block_criteria = 0.
+        # interface temperature criteria of the last block iteration
+        self.block_it_process = []
+        # number of block iterations over the outer iterations
         self.k_gas_ch = np.full((2, self.n_cells, self.n_ele), 0.)
         # conductance of the species flow to the species channels
         # 0: cathode channels, 1: anode channels
         self.temp_layer_vec = \
-            np.full(self.n_ele * (5 * (self.n_cells - 1) + 6), 0.)
+            np.full(self.n_ele * (5 * (self.n_cells - 1) + 6),
+                    self.temp_layer_init)
         # unsorted result layer temperature vector
         self.rhs = np.full(self.n_ele * (5 * (self.n_cells - 1) + 6), 0.)
         # right side of the matrix system: mat T = rhs,
@@ -139,13 +214,10 @@ class TemperatureSystem:
         # thermal conductance between the element channel area and the coolant
 
         """Building up the result temperature list and arrays"""
-        temp_layer = np.full((5, self.n_ele), self.temp_layer_init)
-        temp_layer_n = np.full((6, self.n_ele), self.temp_layer_init)
         self.temp_layer = []
-        for q in range(self.n_cells - 1):
-            self.temp_layer.append(temp_layer)
-        self.temp_layer.append(temp_layer_n)
-        # layer temperature list cell, layer, element
+        # layer temperature list cell, layer, element,
+        # views of self.temp_layer_vec
+        self.sort_results()
         #temp_cool_out = self.temp_cool_in + op_con.tar
         if self.cool_ch_bc is True:
             self.temp_cool = np.full((self.n_cells + 1, self.nodes),
@@ -191,7 +263,7 @@ class TemperatureSystem:
                     list_mat.append(mat_base)
         # list of all the heat conductance matrix in z-direction
         # for all cells and all elements
-        self.mat_const = sp_l.block_diag(*list_mat)
+        self.mat_const = sp_s.block_diag(list_mat, format='lil')
         # uncoupled heat conductance matrix in z-direction
 
         """Setting the coolant channel heat conductance"""
@@ -211,7 +283,8 @@ class TemperatureSystem:
             # lower cool ch pos for the n cell
             for q, item in enumerate(cool_pos_n_up):
                 self.mat_const[item, item] -= self.k_cool
-
+            for q, item in enumerate(cool_pos_n_down):
+                self.mat_const[item, item] -= self.k_cool
         else:
             cool_pos_base = \
                 np.arange(self.n_ele,
@@ -219,8 +292,6 @@ class TemperatureSystem:
             # cool ch pos for the 1-(n-1) cell
         for q, item in enumerate(cool_pos_base):
             self.mat_const[item, item] -= self.k_cool
-        for q, item in enumerate(cool_pos_n_down):
-            self.mat_const[item, item] -= self.k_cool
 
         """Setting the x-axis heat conductance"""
         x_con_base = np.array([self.k_layer[1, 2, 0],
@@ -259,12 +330,12 @@ class TemperatureSystem:
                                   x_con_n))))
         # heat conductance vec for
         # the diagonal of the main heat conductance matrix for the cells 0-n
-        self.mat_const = self.mat_const \
-            - np.diag(x_con_mid) \
-            + np.diag(x_con_side_base, 5) \
-            + np.diag(x_con_side_base, -5) \
-            + np.diag(x_con_side_n, 6) \
-            + np.diag(x_con_side_n, -6)
+        self.mat_const = (self.mat_const
+                          - sp_s.diags(x_con_mid)
+                          + sp_s.diags(x_con_side_base, 5)
+                          + sp_s.diags(x_con_side_base, -5)
+                          + sp_s.diags(x_con_side_n, 6)
+                          + sp_s.diags(x_con_side_n, -6)).tolil()
 
         """Setting the cell connecting heat conductance, z-direction"""
         pos_r, pos_c = [], []
@@ -317,8 +388,12 @@ class TemperatureSystem:
                                self.n_ele),
                        np.tile(env_con_n, self.n_ele)))
         # vector of the main diagonal of the heat conductance matrix
-        self.mat_const = self.mat_const + np.diag(env_con_vec)
-        self.mat_dyn = self.mat_const
+        self.mat_const = (self.mat_const + sp_s.diags(env_con_vec)).tocsc()
+        self.mat_const.sum_duplicates()
+        self.mat_const.sort_indices()
+        # the sparsity pattern stays fixed over the iterations,
+        # only the gas channel entries of the main diagonal change
+        self.mat_dyn = self.mat_const.copy()
 
         """Calculating the coordinates of the gas channel heat conductance"""
         pos_cat_ch_base = np.arange(1,
@@ -341,6 +416,53 @@ class TemperatureSystem:
         # heat conductance for the n cell
         self.pos_cat_ch = np.hstack((pos_cat_ch_base, pos_cat_ch_n))
         self.pos_ano_ch = np.hstack((pos_ano_ch_base, pos_ano_ch_n))
+        self.pos_layer = np.reshape(self.pos_cat_ch - 1,
+                                    (self.n_cells, self.n_ele))
+        self.pos_rhs = self.pos_layer + np.arange(5)[:, None, None]
+
+        """Coordinates of the coolant channel heat conductance"""
+        if self.cool_ch_bc is True:
+            self.cool_ch_id = np.arange(self.n_cells + 1)
+            self.pos_cool_wall = np.vstack((self.pos_layer,
+                                            self.pos_layer[-1] + 5))
+        else:
+            self.cool_ch_id = np.arange(1, self.n_cells)
+            self.pos_cool_wall = self.pos_layer[1:]
+        if self.implicit_fluid is True:
+            self.init_fluid_system()
+
+        """Locating the gas channel diagonal entries in the sparse data"""
+        pos_dyn = np.hstack((self.pos_cat_ch, self.pos_ano_ch))
+        self.pos_dyn_data = np.full(len(pos_dyn), 0, dtype=int)
+        for q, item in enumerate(pos_dyn):
+            col_start = self.mat_const.indptr[item]
+            col_end = self.mat_const.indptr[item + 1]
+            self.pos_dyn_data[q] = col_start \
+                + np.searchsorted(self.mat_const.indices[col_start:col_end],
+                                  item)
+        self.diag_const_dyn = self.mat_const.data[self.pos_dyn_data]
+
+        """Splitting the cell connecting heat conductance"""
+        self.pos_interface = np.hstack((pos_r, pos_c))
+        if self.solver != 'monolithic':
+            mat_coo = self.mat_const.tocoo()
+            block_row = np.searchsorted(self.pos_block, mat_coo.row,
+                                        side='right')
+            block_col = np.searchsorted(self.pos_block, mat_coo.col,
+                                        side='right')
+            cpl = block_row != block_col
+            self.mat_cpl = sp_s.csr_matrix((mat_coo.data[cpl],
+                                            (mat_coo.row[cpl],
+                                             mat_coo.col[cpl])),
+                                           shape=mat_coo.shape)
+            # only the z-conductance between the bipolar plates
+            # of adjacent cells couples the cell blocks
+            if self.solver == 'gauss_seidel':
+                self.block_groups = [np.arange(0, self.n_cells, 2),
+                                     np.arange(1, self.n_cells, 2)]
+                # red-black ordering, the cells of a group are independent
+            else:
+                self.block_groups = [np.arange(self.n_cells)]
 
     def update_values(self, k_alpha_ch, gamma, omega, v_loss, g_gas, i):
         """
@@ -385,9 +507,12 @@ class TemperatureSystem:
         This function coordinates the program sequence
         """
         self.change_value_shape()
-        self.update_gas_channel_lin()
-        self.update_coolant_channel_lin()
-        self.update_temp_layer()
+        if self.implicit_fluid is True:
+            self.update_temp_implicit()
+        else:
+            self.update_gas_channel_lin()
+            self.update_coolant_channel_lin()
+            self.update_temp_layer()
 
     def update_temp_layer(self):
         """
@@ -398,42 +523,71 @@ class TemperatureSystem:
         self.solve_system()
         self.sort_results()
 
+    def update_temp_implicit(self):
+        """
+        This function coordinates the implicit program sequence,
+        the layer, gas channel and coolant temperatures
+        are solved in one linear system.
+        """
+        self.update_matrix()
+        self.update_rhs()
+        self.update_fluid_system()
+        self.solve_system_implicit()
+        self.sort_results()
+        self.sort_fluid_results()
+
     def update_gas_channel_lin(self):
         """
-        Calculates the fluid temperatures in the anode and cathode channels
+        Calculates the fluid temperatures in the anode and cathode channels,
+        marching along the flow direction of all cells at once.
 
             Access to:
             -self.k_gas_ch
             -self.temp_layer
-            -self.temp_fluid
             -self.g_fluid
 
             Manipulate:
             -self.temp_fluid
+            -self.temp_fluid_ele
+        """
+        temp_layer = np.array([item[:5] for item in self.temp_layer])
+        temp_cat = \
+            g_func.calc_fluid_temp_march(self.temp_gas_in[0],
+                                         temp_layer[:, 1],
+                                         self.g_fluid[0], self.k_gas_ch[0])
+        temp_ano = \
+            g_func.calc_fluid_temp_march(self.temp_gas_in[1],
+                                         temp_layer[:, 4, ::-1],
+                                         self.g_fluid[1, :, ::-1],
+                                         self.k_gas_ch[1, :, ::-1])[:, ::-1]
+        self.sort_gas_results(temp_cat, temp_ano)
+
+    def sort_gas_results(self, temp_cat, temp_ano):
+        """
+        Calculates the element fluid temperatures of the cathode
+        and anode channels from the given fluid node temperatures,
+        limited by the temperature of the adjacent bipolar plate layer,
+        and rebuilds the fluid node temperatures from them.
+
+            Access to:
+            -self.temp_layer
+            -self.temp_gas_in
+
+            Manipulate:
+            -self.temp_fluid
+            -self.temp_fluid_ele
+            -self.fluid_lim
         """
-        for q in range(self.n_cells):
-            for w in range(1, self.nodes):
-                self.temp_fluid[0, q, w] =\
-                    g_func.calc_fluid_temp_out(self.temp_fluid[0, q, w - 1],
-                                               self.temp_layer[q][1, w - 1],
-                                               self.g_fluid[0, q, w - 1],
-                                               self.k_gas_ch[0, q, w - 1])
-            temp_fluid_ele = g_func.calc_elements_1_d(self.temp_fluid[0, q])
-            self.temp_fluid_ele[0, q] = np.minimum(temp_fluid_ele,
-                                                   self.temp_layer[q][0])
-            for w in range(self.n_ele - 1, -1, -1):
-                self.temp_fluid[1, q, w] =\
-                    g_func.calc_fluid_temp_out(self.temp_fluid[1, q, w + 1],
-                                               self.temp_layer[q][4, w],
-                                               self.g_fluid[1, q, w],
-                                               self.k_gas_ch[1, q, w])
-                temp_fluid_ele = g_func.calc_elements_1_d(self.temp_fluid[1, q])
-                self.temp_fluid_ele[1, q] = np.minimum(temp_fluid_ele,
-                                                       self.temp_layer[q][4])
-            self.temp_fluid[0] = g_func.calc_nodes_2_d(self.temp_fluid_ele[0])
-            self.temp_fluid[0, :, 0] = self.temp_gas_in[0]
-            self.temp_fluid[1] = g_func.calc_nodes_2_d(self.temp_fluid_ele[1])
-            self.temp_fluid[1, :, -1] = self.temp_gas_in[1]
+        temp_layer = np.array([item[:5] for item in self.temp_layer])
+        temp_ele = np.array((g_func.calc_elements_1_d(temp_cat),
+                             g_func.calc_elements_1_d(temp_ano)))
+        temp_lim = np.array((temp_layer[:, 0], temp_layer[:, 4]))
+        self.fluid_lim = temp_ele > temp_lim
+        self.temp_fluid_ele[:] = np.minimum(temp_ele, temp_lim)
+        self.temp_fluid[0] = g_func.calc_nodes_2_d(self.temp_fluid_ele[0])
+        self.temp_fluid[0, :, 0] = self.temp_gas_in[0]
+        self.temp_fluid[1] = g_func.calc_nodes_2_d(self.temp_fluid_ele[1])
+        self.temp_fluid[1, :, -1] = self.temp_gas_in[1]
 
     def update_coolant_channel_lin(self):
         """
@@ -448,20 +602,13 @@ class TemperatureSystem:
                     -self.temp_cool
                     -self.temp_cool_ele
                 """
-        for q in range(self.n_cells):
-            for w in range(1, self.nodes):
-                self.temp_cool[q, w] =\
-                    g_func.calc_fluid_temp_out(self.temp_cool[q, w - 1],
-                                               self.temp_layer[q][0, w - 1],
-                                               self.g_cool, self.k_cool)
-                self.temp_cool_ele[q] = g_func.calc_elements_1_d(self.temp_cool[q])
+        temp_wall = [item[0] for item in self.temp_layer]
         if self.cool_ch_bc is True:
-            for w in range(1, self.nodes):
-                self.temp_cool[-1, w] =\
-                    g_func.calc_fluid_temp_out(self.temp_cool[-1, w - 1],
-                                               self.temp_layer[-1][-1, w - 1],
-                                               self.g_cool, self.k_cool)
-                self.temp_cool_ele[-1] = g_func.calc_elements_1_d(self.temp_cool[-1])
+            temp_wall.append(self.temp_layer[-1][-1])
+        self.temp_cool = g_func.calc_fluid_temp_march(self.temp_cool[:, 0],
+                                                      np.array(temp_wall),
+                                                      self.g_cool, self.k_cool)
+        self.temp_cool_ele = g_func.calc_elements_1_d(self.temp_cool)
 
     def update_rhs(self):
         """
@@ -481,7 +628,7 @@ class TemperatureSystem:
             -self.k_gas_ch
             -self.v_loss
             -self.v_tn
-            -g_par.dict_case['e_0]
+            -self.dict_case['e_0]
             -self.omega
             -self.i
             -self.k_cool
@@ -491,50 +638,38 @@ class TemperatureSystem:
             -self.rhs
         """
         self.rhs = np.full(self.n_ele * (5 * (self.n_cells - 1) + 6), 0.)
-        rhs = self.rhs
         temp_env = self.temp_env
-        k_alpha_env = self.k_alpha_env
-
-        ct = 0
-        for q in range(self.n_cells):
-            for w in range(self.n_ele):
-                if q is 0:
-                    rhs[ct] = -.5 * temp_env * k_alpha_env[0, 2, q]
-                else:
-                    rhs[ct] = - temp_env * k_alpha_env[0, 2, q]
-
-                rhs[ct + 1] = -temp_env * k_alpha_env[0, 1, q] \
-                    - self.temp_fluid_ele[0, q, w] * self.k_gas_ch[0, q, w] \
-                    - w_prop.water.calc_h_vap(self.temp_fluid[0, q, w]) \
-                    * self.cond_rate[0, q, w]
-                rhs[ct + 2] = \
-                    - temp_env * k_alpha_env[0, 0, q] \
-                    - (self.v_tn - g_par.dict_case['e_0'] + self.v_loss[0, q, w]
-                       + .5 * self.omega[q, w] * self.i[q, w]) * self.i[q, w]
-                rhs[ct + 3] = \
-                    - temp_env * k_alpha_env[0, 0, q] \
-                    - (self.v_loss[1, q, w]
-                       + self.omega[q, w] * self.i[q, w] * .5) * self.i[q, w]
-                rhs[ct + 4] = - temp_env * k_alpha_env[0, 1, q] \
-                    - self.temp_fluid_ele[1, q, w] * self.k_gas_ch[1, q, w] \
-                    - w_prop.water.calc_h_vap(self.temp_fluid[1, q, w]) \
-                    * self.cond_rate[1, q, w]
-                if q is 0:
-                    rhs[ct] -= self.heat_pow
-                    if self.cool_ch_bc is True:
-                        rhs[ct] -= self.k_cool * self.temp_cool_ele[0, w]
-                    cr = 5
-                elif 0 < q < self.n_cells - 1:
-                    rhs[ct] -= self.k_cool * self.temp_cool_ele[q, w]
-                    cr = 5
-                else:
-                    rhs[ct] -= self.k_cool * self.temp_cool_ele[q, w]
-                    rhs[ct + 5] -= self.heat_pow \
-                        - .5 * self.k_alpha_env[0, 2, 0] * temp_env
-                    if self.cool_ch_bc is True:
-                        rhs[ct + 5] -= self.k_cool * self.temp_cool_ele[-1, w]
-                    cr = 6
-                ct += cr
+        k_alpha_env = self.k_alpha_env[0, :, :, None]
+        if self.implicit_fluid is True:
+            temp_cool_ele = np.zeros(self.temp_cool_ele.shape)
+            # the fluid coupling is part of the conductance matrix
+        else:
+            temp_cool_ele = self.temp_cool_ele
+        h_vap = self.water.calc_h_vap(self.temp_fluid[:, :, :-1])
+        cond_rate = self.cond_rate[:, :, :self.n_ele]
+        rhs = np.empty((5, self.n_cells, self.n_ele))
+        # right hand side of the layers 0-4, layer, cell, element
+        rhs[0] = - temp_env * k_alpha_env[2] \
+            - self.k_cool * temp_cool_ele[:self.n_cells]
+        rhs[0, 0] = - .5 * temp_env * k_alpha_env[2, 0] - self.heat_pow
+        if self.cool_ch_bc is True:
+            rhs[0, 0] -= self.k_cool * temp_cool_ele[0]
+        rhs[1] = - temp_env * k_alpha_env[1] - h_vap[0] * cond_rate[0]
+        rhs[2] = - temp_env * k_alpha_env[0] \
+            - (self.v_tn - self.dict_case['e_0'] + self.v_loss[0]
+               + .5 * self.omega * self.i) * self.i
+        rhs[3] = - temp_env * k_alpha_env[0] \
+            - (self.v_loss[1] + self.omega * self.i * .5) * self.i
+        rhs[4] = - temp_env * k_alpha_env[1] - h_vap[1] * cond_rate[1]
+        if self.implicit_fluid is False:
+            rhs[1] -= self.temp_fluid_ele[0] * self.k_gas_ch[0]
+            rhs[4] -= self.temp_fluid_ele[1] * self.k_gas_ch[1]
+        self.rhs[self.pos_rhs] = rhs
+        rhs_n = - self.heat_pow + .5 * self.k_alpha_env[0, 2, 0] * temp_env
+        if self.cool_ch_bc is True:
+            rhs_n = rhs_n - self.k_cool * temp_cool_ele[-1]
+        self.rhs[self.pos_layer[-1] + 5] = rhs_n
+        # sixth layer of the last cell
 
     def update_matrix(self):
         """
@@ -549,37 +684,283 @@ class TemperatureSystem:
             Manipulate:
             -self.mat_dyn
         """
-        dyn_vec = np.full(self.n_ele * (5 * (self.n_cells - 1) + 6), 0.)
-        ct = 0
-        for q in range(self.n_cells):
-            if q is not self.n_cells - 1:
-                cr = 5
-            else:
-                cr = 6
-            for w in range(self.n_ele):
-                dyn_vec[ct + 1] = -self.k_gas_ch[0, q, w]
-                dyn_vec[ct + 4] = -self.k_gas_ch[1, q, w]
-                ct += cr
-        self.mat_dyn = self.mat_const + np.diag(dyn_vec)
+        dyn_vec = -np.hstack((self.k_gas_ch[0].flatten(),
+                              self.k_gas_ch[1].flatten()))
+        self.mat_dyn.data[self.pos_dyn_data] = self.diag_const_dyn + dyn_vec
+        if self.dyn_vec_lu is None \
+                or not np.array_equal(dyn_vec, self.dyn_vec_lu):
+            self.mat_lu = None
+            self.block_lu = None
+            self.dyn_vec_lu = dyn_vec
 
     def solve_system(self):
         """
-        Solves the layer temperatures.
+        Solves the layer temperatures with a sparse lu factorization.
+        The factorization is reused as long as the dynamic diagonal
+        of the conductance matrix does not change.
 
             Access to:
             -self.mat_dyn
             -self.rhs
 
             Manipulate:
+            -self.mat_lu
             -self.temp_layer_vec
         """
 
-        self.temp_layer_vec = np.linalg.tensorsolve(self.mat_dyn, self.rhs)
+        if self.solver != 'monolithic':
+            self.solve_system_blocks()
+        else:
+            if self.mat_lu is None:
+                self.mat_lu = sp_sl.splu(self.mat_dyn)
+            self.temp_layer_vec = self.mat_lu.solve(self.rhs)
+
+    def solve_system_blocks(self):
+        """
+        Solves the layer temperatures cell by cell.
+        Each cell block is factorized on its own and the conduction
+        between the bipolar plates of adjacent cells is iterated with
+        block Jacobi or red-black block Gauss-Seidel sweeps,
+        until the interface temperatures change less than self.block_crit.
+        The temperatures of the last solve are the initial guess.
+
+            Access to:
+            -self.mat_dyn
+            -self.mat_cpl
+            -self.rhs
+            -self.pos_block
+            -self.pos_interface
+            -self.block_groups
+
+            Manipulate:
+            -self.block_lu
+            -self.temp_layer_vec
+            -self.block_it
+            -self.block_criteria
+            -self.block_it_process
+        """
+        pos = self.pos_block
+        if self.block_lu is None:
+            self.block_lu = \
+                self.map_cells(lambda q: sp_sl.splu(
+                    self.mat_dyn[pos[q]:pos[q + 1], pos[q]:pos[q + 1]]),
+                               range(self.n_cells))
+        temp = np.copy(self.temp_layer_vec)
+
+        def solve_cell(q):
+            temp[pos[q]:pos[q + 1]] = \
+                self.block_lu[q].solve(rhs[pos[q]:pos[q + 1]])
+
+        for it in range(1, self.block_max_it + 1):
+            temp_interface = temp[self.pos_interface]
+            for group in self.block_groups:
+                rhs = self.rhs - self.mat_cpl.dot(temp)
+                self.map_cells(solve_cell, group)
+            self.block_criteria = \
+                np.max(np.abs(temp[self.pos_interface] - temp_interface))
+            if self.block_criteria < self.block_crit:
+                break
+        self.block_it = it
+        self.block_it_process.append(it)
+        self.temp_layer_vec = temp
+        if self.show_it_output is True:
+            print('thermal block iterations:', self.block_it,
+                  'interface criteria:', self.block_criteria)
+
+    def map_cells(self, func, cells):
+        """
+        Applies func to the given cell indices,
+        on the worker threads if there are any.
+        """
+        if self.block_pool is None:
+            return [func(q) for q in cells]
+        else:
+            return list(self.block_pool.map(func, cells))
+
+    def init_fluid_system(self):
+        """
+        Locates the fluid node temperatures of the cathode channels,
+        the anode channels and the coolant channels behind the layer
+        temperatures and sets up the sparsity pattern of the implicit
+        system matrix, which stays fixed over the iterations.
+
+            Access to:
+            -self.mat_dyn
+            -self.pos_cat_ch
+            -self.pos_ano_ch
+            -self.pos_cool_wall
+            -self.cool_ch_id
+
+            Manipulate:
+            -self.pos_fluid_up
+            -self.pos_fluid_down
+            -self.pos_fluid_wall
+            -self.pos_fluid_in
+            -self.pos_fluid_lim
+            -self.pos_impl_data
+            -self.mat_impl
+        """
+        n_gas = self.n_cells * self.nodes
+        n_cool = len(self.cool_ch_id) * self.nodes
+        node_id = np.arange(self.nodes)
+        up, down, wall, inlet = [], [], [], []
+        channels = \
+            [(self.n_layer, self.pos_cat_ch, self.n_cells, True),
+             (self.n_layer + n_gas, self.pos_ano_ch, self.n_cells, False),
+             (self.n_layer + 2 * n_gas, self.pos_cool_wall.flatten(),
+              len(self.cool_ch_id), True)]
+        for offset, pos_wall, n_ch, flow_dir in channels:
+            node = offset + np.arange(n_ch)[:, None] * self.nodes + node_id
+            if flow_dir is True:
+                up.append(node[:, :-1].flatten())
+                down.append(node[:, 1:].flatten())
+                inlet.append(node[:, 0])
+            else:
+                up.append(node[:, 1:].flatten())
+                down.append(node[:, :-1].flatten())
+                inlet.append(node[:, -1])
+            wall.append(pos_wall)
+        self.pos_fluid_up = np.hstack(up)
+        self.pos_fluid_down = np.hstack(down)
+        self.pos_fluid_wall = np.hstack(wall)
+        self.pos_fluid_in = np.hstack(inlet)
+        self.pos_fluid_lim = np.hstack((self.pos_cat_ch - 1, self.pos_ano_ch))
+        # bipolar plate layers of the cathode and anode channels
+        n_all = self.n_layer + 2 * n_gas + n_cool
+        up, down, wall = \
+            self.pos_fluid_up, self.pos_fluid_down, self.pos_fluid_wall
+        n_gas_ele = len(self.pos_fluid_lim)
+        rows = np.hstack((self.mat_dyn.indices, down, down, down,
+                          wall, wall, self.pos_fluid_in, wall[:n_gas_ele]))
+        cols = np.hstack((np.repeat(np.arange(self.n_layer),
+                                    np.diff(self.mat_dyn.indptr)),
+                          down, up, wall, up, down, self.pos_fluid_in,
+                          self.pos_fluid_lim))
+        # entry order of the values in update_fluid_system
+        pos, self.pos_impl_data = np.unique(cols * n_all + rows,
+                                            return_inverse=True)
+        # column major order, as the data of a csc matrix
+        self.mat_impl = \
+            sp_s.csc_matrix((np.full(len(pos), 0.), pos % n_all,
+                             np.searchsorted(pos // n_all,
+                                             np.arange(n_all + 1))),
+                            shape=(n_all, n_all))
+
+    def update_fluid_system(self):
+        """
+        Updates the values of the implicit layer and fluid system.
+        The fluid elements follow the same linearised relation
+        as g_func.calc_fluid_temp_out of the explicit formulation,
+        g * (T_out - T_in) = k * (T_wall - 0.5 * (T_in + T_out)),
+        and the wall layer gives the heat k * (T_wall - T_fluid_ele)
+        to the fluid. As in the explicit formulation, T_fluid_ele
+        of a gas channel element is replaced by the temperature
+        of its bipolar plate layer, if this limit was active
+        in the last solution (self.fluid_lim).
+        The lu factorization of the system matrix is
+        renewed only if the matrix values have changed.
+
+            Access to:
+            -self.mat_dyn
+            -self.rhs
+            -self.g_fluid
+            -self.k_gas_ch
+            -self.g_cool
+            -self.k_cool
+            -self.temp_gas_in
+            -self.temp_cool_in
+            -self.fluid_lim
+            -self.pos_impl_data
+
+            Manipulate:
+            -self.mat_impl
+            -self.mat_impl_lu
+            -self.rhs_impl
+        """
+        n_cool = self.pos_cool_wall.size
+        g = np.hstack((self.g_fluid[0].flatten(), self.g_fluid[1].flatten(),
+                       np.full(n_cool, self.g_cool)))
+        k = np.hstack((self.k_gas_ch[0].flatten(),
+                       self.k_gas_ch[1].flatten(),
+                       np.full(n_cool, self.k_cool)))
+        lim = np.hstack((self.fluid_lim.flatten(), np.full(n_cool, False)))
+        k_ele = np.where(lim, 0., .5 * k)
+        # wall conductance to the fluid nodes of the element
+        k_lim = np.where(self.fluid_lim.flatten(), k[:len(self.pos_fluid_lim)],
+                         0.)
+        # wall conductance to the limiting layer
+        vals = np.hstack((self.mat_dyn.data, g + .5 * k, -(g - .5 * k), -k,
+                          k_ele, k_ele, np.full(len(self.pos_fluid_in), 1.),
+                          k_lim))
+        # the layer diagonal already contains -k
+        data = np.bincount(self.pos_impl_data, weights=vals,
+                           minlength=self.mat_impl.nnz)
+        if self.mat_impl_lu is None \
+                or not np.array_equal(data, self.mat_impl.data):
+            self.mat_impl.data = data
+            self.mat_impl_lu = None
+        rhs_fluid = np.full(self.mat_impl.shape[0] - self.n_layer, 0.)
+        rhs_fluid[self.pos_fluid_in - self.n_layer] = \
+            np.hstack((np.full(self.n_cells, self.temp_gas_in[0]),
+                       np.full(self.n_cells, self.temp_gas_in[1]),
+                       np.full(len(self.cool_ch_id), self.temp_cool_in)))
+        self.rhs_impl = np.hstack((self.rhs, rhs_fluid))
+
+    def solve_system_implicit(self):
+        """
+        Solves the layer and fluid temperatures of the implicit system
+        with a sparse lu factorization, which is reused as long as
+        the values of the system matrix do not change.
+
+            Access to:
+            -self.mat_impl
+            -self.rhs_impl
+
+            Manipulate:
+            -self.mat_impl_lu
+            -self.temp_layer_vec
+            -self.temp_fluid
+            -self.temp_cool
+        """
+        if self.mat_impl_lu is None:
+            self.mat_impl_lu = sp_sl.splu(self.mat_impl)
+        temp_vec = self.mat_impl_lu.solve(self.rhs_impl)
+        n_gas = self.n_cells * self.nodes
+        self.temp_layer_vec = temp_vec[:self.n_layer]
+        temp_vec = temp_vec[self.n_layer:]
+        self.temp_fluid[0] = np.reshape(temp_vec[:n_gas],
+                                        (self.n_cells, self.nodes))
+        self.temp_fluid[1] = np.reshape(temp_vec[n_gas:2 * n_gas],
+                                        (self.n_cells, self.nodes))
+        self.temp_cool[self.cool_ch_id] = \
+            np.reshape(temp_vec[2 * n_gas:],
+                       (len(self.cool_ch_id), self.nodes))
+
+    def sort_fluid_results(self):
+        """
+        Calculates the element based fluid temperatures
+        from the implicit fluid node temperatures,
+        the gas channel temperatures are sorted as in the explicit
+        formulation by sort_gas_results.
+
+            Access to:
+            -self.temp_fluid
+            -self.temp_cool
+
+            Manipulate:
+            -self.temp_fluid
+            -self.temp_fluid_ele
+            -self.temp_cool_ele
+        """
+        self.sort_gas_results(np.copy(self.temp_fluid[0]),
+                              np.copy(self.temp_fluid[1]))
+        self.temp_cool_ele = g_func.calc_elements_2d(self.temp_cool)
 
     def sort_results(self):
         """
         Sorts the temperatures in the 1-d-array self.temp_layer_vec
-        to the 3-d-list self.temp_layer
+        to the 3-d-list self.temp_layer. The list entries are views
+        of self.temp_layer_vec, no temperatures are copied.
 
             Access to:
             -self.cell_numb
@@ -589,13 +970,8 @@ class TemperatureSystem:
             Manipulate:
             -self.temp_layer
         """
-
-        ct = 0
-        for q in range(self.n_cells):
-            if q is not self.n_cells - 1:
-                cr = 5
-            else:
-                cr = 6
-            for w in range(self.n_ele):
-                self.temp_layer[q][:, w] = self.temp_layer_vec[ct: ct + cr]
-                ct += cr
\ No newline at end of file
+        n_base = 5 * self.n_ele * (self.n_cells - 1)
+        temp_base = np.reshape(self.temp_layer_vec[:n_base],
+                               (self.n_cells - 1, self.n_ele, 5))
+        temp_n = np.reshape(self.temp_layer_vec[n_base:], (self.n_ele, 6))
+        self.temp_layer = list(temp_base.transpose((0, 2, 1))) + [temp_n.T]
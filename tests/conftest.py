@@ -0,0 +1,39 @@
+import os
+import sys
+import pytest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import data.configuration as conf
+import input.operating_conditions as op_con_in
+import input.simulation as sim_in
+import system.stack as st
+
+
+def get_config(cell_number=None, tar_cd=6000., **sim_changes):
+    """
+    Returns a configuration of the default input with the given
+    number of cells and simulation setting changes.
+    """
+    op_con_changes = {}
+    if cell_number is not None:
+        op_con_changes['cell_number'] = cell_number
+    config = conf.Configuration(
+        sim=conf.get_settings(sim_in, **sim_changes),
+        op_con=conf.get_settings(op_con_in, **op_con_changes))
+    config.dict_case['tar_cd'] = tar_cd
+    return config
+
+
+@pytest.fixture
+def make_stack():
+    """
+    Returns a function, which sets up a stack of the default input
+    with the given simulation setting changes and updates it a few times.
+    """
+    def make(iterations=5, **sim_changes):
+        config = get_config(**sim_changes)
+        stack = st.Stack(config.dict_stack, config)
+        for q in range(iterations):
+            stack.update()
+        assert stack.break_program is False
+        return stack
+    return make
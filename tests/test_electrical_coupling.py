@@ -0,0 +1,44 @@
+import numpy as np
+import system.global_functions as g_func
+
+
+def calc_dense(mat_band, bands):
+    """
+    Returns the dense matrix of a matrix in the banded storage
+    of scipy.linalg.solve_banded with bands lower and upper bands.
+    """
+    size = mat_band.shape[-1]
+    rows, cols = np.indices((size, size))
+    in_band = np.abs(rows - cols) <= bands
+    mat = np.full((size, size), 0.)
+    mat[in_band] = mat_band[bands + rows[in_band] - cols[in_band],
+                            cols[in_band]]
+    return mat
+
+
+def test_band_matrix_matches_dense(make_stack):
+    el_cpl = make_stack().el_cpl_stack
+    elements = el_cpl.elements
+    cell_c_side = el_cpl.cell_c[:-elements][elements:]
+    mat_dense = calc_dense(el_cpl.mat_const, elements) \
+        - np.diag(el_cpl.cell_c_mid) \
+        + np.diag(cell_c_side, elements) \
+        + np.diag(cell_c_side, -elements)
+    # assembly of the former dense conductance matrix
+    assert np.array_equal(calc_dense(el_cpl.mat, elements), mat_dense)
+    assert np.all(np.delete(el_cpl.mat_const,
+                            [elements - 1, elements, elements + 1],
+                            axis=0) == 0.)
+
+
+def test_band_solve_matches_dense(make_stack):
+    el_cpl = make_stack().el_cpl_stack
+    elements = el_cpl.elements
+    el_cpl.update()
+    v_new = np.linalg.solve(calc_dense(el_cpl.mat, elements), el_cpl.rhs)
+    v_new = np.hstack((np.full(elements, el_cpl.v_end_plate),
+                       v_new, np.full(elements, 0.)))
+    i_cd = g_func.to_array((v_new[:-elements] - v_new[elements:])
+                           / el_cpl.cell_r, el_cpl.cell_numb, elements)
+    i_cd = i_cd / np.average(i_cd) * el_cpl.dict_case['tar_cd']
+    np.testing.assert_allclose(el_cpl.i_cd, i_cd, rtol=1.e-10)
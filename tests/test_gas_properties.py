@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+import data.gas_properties as g_fit
+
+
+@pytest.mark.parametrize('species',
+                         [(g_fit.oxygen, g_fit.water, g_fit.nitrogen),
+                          (g_fit.hydrogen, g_fit.water, g_fit.nitrogen)])
+@pytest.mark.parametrize('shape', [(11,), (4, 11)])
+def test_mixture_matches_species_fits(species, shape):
+    gas_mix = g_fit.GasMixture(species)
+    rng = np.random.default_rng(0)
+    temp = rng.uniform(300., 450., shape)
+    p = rng.uniform(1.e5, 3.e5, shape)
+    cp, visc, lambdas = gas_mix.calc_properties(temp, p)
+    for q, item in enumerate(species):
+        np.testing.assert_allclose(cp[q], item.calc_cp(temp), rtol=1.e-12)
+        np.testing.assert_allclose(visc[q], item.calc_visc(temp),
+                                   rtol=1.e-12)
+        np.testing.assert_allclose(lambdas[q], item.calc_lambda(temp, p),
+                                   rtol=1.e-12)
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+import system.global_functions as g_func
+
+
+def test_fwd_sum_matches_triangular_matrix():
+    vec = np.random.default_rng(0).uniform(-1., 1., (3, 7))
+    fwd_mat = np.tril(np.full((7, 7), 1.))
+    np.testing.assert_allclose(g_func.calc_fwd_sum(vec),
+                               np.matmul(vec, fwd_mat.T), atol=1.e-12)
+    np.testing.assert_allclose(g_func.calc_fwd_sum(vec[0]),
+                               np.matmul(fwd_mat, vec[0]), atol=1.e-12)
+
+
+def test_bwd_sum_matches_triangular_matrix():
+    vec = np.random.default_rng(0).uniform(-1., 1., (3, 7))
+    bwd_mat = np.triu(np.full((7, 7), 1.))
+    np.testing.assert_allclose(g_func.calc_bwd_sum(vec),
+                               np.matmul(vec, bwd_mat.T), atol=1.e-12)
+    np.testing.assert_allclose(g_func.calc_bwd_sum(vec[0]),
+                               np.matmul(bwd_mat, vec[0]), atol=1.e-12)
+
+
+def calc_fluid_temp_loop(temp_in, temp_wall, g, k):
+    """
+    Marches calc_fluid_temp_out element by element
+    along the last axis of each channel.
+    """
+    temp = np.full(temp_wall.shape[:-1] + (temp_wall.shape[-1] + 1,), 0.)
+    for index in np.ndindex(temp_wall.shape[:-1]):
+        temp[index][0] = temp_in[index]
+        for w in range(temp_wall.shape[-1]):
+            temp[index][w + 1] = \
+                g_func.calc_fluid_temp_out(temp[index][w],
+                                           temp_wall[index][w],
+                                           g[index][w], k[index][w])
+    return temp
+
+
+@pytest.mark.parametrize('g_min', [1., .1])
+def test_fluid_temp_march_matches_element_loop(g_min):
+    rng = np.random.default_rng(0)
+    temp_in = rng.uniform(330., 350., 4)
+    temp_wall = rng.uniform(340., 360., (4, 12))
+    k = rng.uniform(.5, 1., (4, 12))
+    g = rng.uniform(g_min, 2., (4, 12))
+    # with g < 0.5 * k the elements are marched one after another
+    np.testing.assert_allclose(
+        g_func.calc_fluid_temp_march(temp_in, temp_wall, g, k),
+        calc_fluid_temp_loop(temp_in, temp_wall, g, k), rtol=1.e-12)
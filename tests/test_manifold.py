@@ -0,0 +1,102 @@
+import copy
+import numpy as np
+import pytest
+import data.manifold_dict as m_fold_dict
+from conftest import get_config
+import system.manifold as m_fold
+
+
+def solve_manifolds(solver, cell_number=20, **attributes):
+    """
+    Solves the cathode and anode manifolds of a stack
+    with a non-uniform inlet flow for the given solver,
+    the given attributes are set on both manifolds before.
+    """
+    config = get_config(cell_number=cell_number)
+    rng = np.random.default_rng(0)
+    mol_flow = np.full((2, cell_number), 0.)
+    mol_flow[0] = rng.uniform(1.e-5, 2.e-5, cell_number)
+    mol_flow[1] = .8 * mol_flow[0]
+    shape = (2, cell_number)
+    dict_mfold = m_fold_dict.manifold(
+        mol_flow, np.full(shape, 340.), np.full(shape, 1000.),
+        np.full(shape, 2.e-5),
+        np.vstack((np.full(cell_number, 1.6e5),
+                   np.full(cell_number, 1.5e5))),
+        np.full(shape, 290.), .03 * mol_flow, .03 * mol_flow)
+    manifolds = [m_fold.Manifold(config.dict_mfold_cat),
+                 m_fold.Manifold(config.dict_mfold_ano)]
+    for item in manifolds:
+        item.solver = solver
+        for key, value in attributes.items():
+            setattr(item, key, value)
+        item.update_values(copy.deepcopy(dict_mfold))
+    m_fold.update_manifolds(manifolds)
+    return manifolds, mol_flow
+
+
+def get_newton_values(manifold):
+    """
+    Returns the scaled newton unknowns of a solved manifold.
+    """
+    x = np.stack((manifold.cell_mol_flow[0], manifold.head_mol_flow[0],
+                  manifold.head_mol_flow[1], manifold.head_p[0],
+                  manifold.head_p[1]), axis=-1) / manifold.newton_scale
+    return x.flatten()
+
+
+def test_newton_conserves_header_flow():
+    manifolds, mol_flow = solve_manifolds('newton')
+    for item in manifolds:
+        assert item.newton_converged is True
+        assert np.sum(item.cell_mol_flow[0]) \
+            == pytest.approx(np.sum(mol_flow[0]), rel=1.e-12)
+        assert item.head_mol_flow[0, -1] \
+            == pytest.approx(np.sum(mol_flow[0]), rel=1.e-12)
+
+
+def test_newton_failure_is_recorded_silently(capsys):
+    manifolds = solve_manifolds('newton', newton_max_it=1)[0]
+    for item in manifolds:
+        assert item.newton_converged is False
+        assert item.newton_it == 1
+    assert capsys.readouterr().out == ''
+
+
+def test_newton_matches_reference():
+    newton = solve_manifolds('newton')[0]
+    reference = solve_manifolds('reference')[0]
+    for item_n, item_r in zip(newton, reference):
+        np.testing.assert_allclose(item_n.cell_mol_flow[0],
+                                   item_r.cell_mol_flow[0], rtol=1.e-6)
+        np.testing.assert_allclose(item_n.head_p, item_r.head_p, rtol=1.e-6)
+
+
+def test_newton_solves_residual():
+    manifold = solve_manifolds('newton')[0][0]
+    res = manifold.calc_flow_residual(get_newton_values(manifold))
+    assert np.max(np.abs(res)) < 1.e-8
+
+
+def test_flow_jacobian_matches_difference_jacobian():
+    manifold = solve_manifolds('newton')[0][0]
+    x = get_newton_values(manifold)
+    x = x * (1. + 1.e-3 * np.random.default_rng(1).standard_normal(x.size))
+    # off the solution, so that all residual terms contribute
+    size = x.size
+    jac_dense = np.full((size, size), 0.)
+    for j in range(size):
+        dx = 1.e-7 * max(abs(x[j]), 1.)
+        x_p, x_m = np.copy(x), np.copy(x)
+        x_p[j] += dx
+        x_m[j] -= dx
+        jac_dense[:, j] = (manifold.calc_flow_residual(x_p)
+                           - manifold.calc_flow_residual(x_m)) / (2. * dx)
+    jac_band = manifold.calc_flow_jacobian(x)
+    rows, cols = np.indices((size, size))
+    in_band = np.abs(rows - cols) <= 5
+    jac = np.full((size, size), 0.)
+    jac[in_band] = jac_band[5 + rows[in_band] - cols[in_band], cols[in_band]]
+    assert np.all(jac_dense[~in_band] == 0.)
+    np.testing.assert_allclose(jac, jac_dense, rtol=0.,
+                               atol=1.e-6 * np.max(np.abs(jac_dense)))
@@ -0,0 +1,49 @@
+import json
+import os
+import numpy as np
+import pytest
+import system.result_store as res_store
+
+
+@pytest.fixture
+def results(make_stack):
+    """
+    Returns the gathered results of a small stack and their metadata.
+    """
+    return res_store.gather_results(make_stack()), \
+        {'tar_cd': 6000., 'iterations': 5, 'converged': False}
+
+
+@pytest.mark.parametrize('file_format, mmap_mode',
+                         [('npz', None), ('npy', None), ('npy', 'r')])
+def test_results_round_trip(tmp_path, results, file_format, mmap_mode):
+    path = res_store.save_results(str(tmp_path / 'point'), *results,
+                                  file_format=file_format)
+    results_load, meta_load = res_store.load_results(path, mmap_mode)
+    assert meta_load == results[1]
+    assert sorted(results_load) == sorted(results[0])
+    for name, value in results[0].items():
+        assert np.array_equal(results_load[name], value)
+        if mmap_mode is not None:
+            assert isinstance(results_load[name], np.memmap)
+
+
+def test_results_in_current_directory(tmp_path, monkeypatch, results):
+    monkeypatch.chdir(tmp_path)
+    path = res_store.save_results('point', *results)
+    assert path == 'point.npz'
+    results_load, meta_load = res_store.load_results(path)
+    assert meta_load == results[1]
+    for name, value in results[0].items():
+        assert np.array_equal(results_load[name], value)
+
+
+def test_export_csv(tmp_path, results):
+    res_store.export_csv(str(tmp_path), *results)
+    for name, value in results[0].items():
+        value_csv = np.loadtxt(os.path.join(str(tmp_path), name + '.csv'),
+                               delimiter=',')
+        np.testing.assert_allclose(np.reshape(value_csv, np.shape(value)),
+                                   value, rtol=1.e-9)
+    with open(os.path.join(str(tmp_path), 'meta.json')) as file:
+        assert json.load(file) == results[1]
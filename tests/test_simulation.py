@@ -0,0 +1,45 @@
+import pytest
+from conftest import get_config
+import simulation as simu
+
+
+class OutputError(Exception):
+    pass
+
+
+def fail_output(self, q, counter, tar_cd):
+    raise OutputError(q)
+
+
+@pytest.fixture
+def simulation(tmp_path, monkeypatch, make_stack):
+    """
+    Returns a simulation with asynchronous output and a solved stack,
+    whose output of a load point fails in the background thread.
+    """
+    switched = []
+    monkeypatch.setattr(simu.plt, 'switch_backend', switched.append)
+    monkeypatch.setattr(simu.Simulation, 'output', fail_output)
+    simulation = simu.Simulation(get_config(async_output=True,
+                                            output_queue_size=1),
+                                 str(tmp_path))
+    simulation.stack = make_stack(iterations=1)
+    yield simulation
+    simulation.shutdown_block_pool()
+    assert switched == []
+
+
+def test_flush_output_raises_output_error(simulation):
+    simulation.submit_output('0', 1, 6000.)
+    with pytest.raises(OutputError, match='0'):
+        simulation.flush_output()
+    assert simulation.output_pool is None
+
+
+def test_submit_output_raises_pending_output_error(simulation):
+    simulation.submit_output('0', 1, 6000.)
+    with pytest.raises(OutputError, match='0'):
+        simulation.submit_output('1', 1, 6000.)
+    # the load point 1 is not handed over after the error
+    assert simulation.output_jobs == []
+    simulation.flush_output()
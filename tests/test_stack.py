@@ -0,0 +1,12 @@
+import numpy as np
+
+
+def test_vectorized_cells_match_cell_loop(make_stack):
+    stack = make_stack(iterations=10)
+    stack_vec = make_stack(iterations=10, vectorized_cells=True)
+    np.testing.assert_allclose(stack_vec.i_cd, stack.i_cd, rtol=1.e-12)
+    np.testing.assert_allclose(np.asarray(stack_vec.v_cell),
+                               np.asarray(stack.v_cell), rtol=1.e-12)
+    for item_vec, item in zip(stack_vec.temp_sys.temp_layer,
+                              stack.temp_sys.temp_layer):
+        np.testing.assert_allclose(item_vec, item, rtol=1.e-12)
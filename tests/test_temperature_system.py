@@ -0,0 +1,203 @@
+import numpy as np
+import pytest
+import system.global_functions as g_func
+
+
+def test_conductance_matrix_is_symmetric(make_stack):
+    temp_sys = make_stack().temp_sys
+    mat = temp_sys.mat_const.toarray()
+    assert np.array_equal(mat, mat.T)
+
+
+def test_dynamic_diagonal(make_stack):
+    temp_sys = make_stack().temp_sys
+    mat_dif = temp_sys.mat_dyn.toarray() - temp_sys.mat_const.toarray()
+    pos_dyn = np.hstack((temp_sys.pos_cat_ch, temp_sys.pos_ano_ch))
+    dyn_vec = -np.hstack((temp_sys.k_gas_ch[0].flatten(),
+                          temp_sys.k_gas_ch[1].flatten()))
+    mat_dyn = np.full(mat_dif.shape, 0.)
+    mat_dyn[pos_dyn, pos_dyn] = dyn_vec
+    np.testing.assert_allclose(mat_dif, mat_dyn, rtol=0., atol=1.e-12
+                               * np.max(np.abs(temp_sys.mat_dyn.data)))
+
+
+def test_sparse_solve_matches_dense(make_stack):
+    temp_sys = make_stack().temp_sys
+    temp_dense = np.linalg.solve(temp_sys.mat_dyn.toarray(), temp_sys.rhs)
+    np.testing.assert_allclose(temp_sys.temp_layer_vec, temp_dense,
+                               rtol=1.e-12)
+    temp_sys.k_gas_ch = 1.5 * temp_sys.k_gas_ch
+    # the cached factorization has to be renewed
+    temp_sys.update_matrix()
+    temp_sys.update_rhs()
+    temp_sys.solve_system()
+    temp_dense = np.linalg.solve(temp_sys.mat_dyn.toarray(), temp_sys.rhs)
+    np.testing.assert_allclose(temp_sys.temp_layer_vec, temp_dense,
+                               rtol=1.e-12)
+
+
+@pytest.mark.parametrize('solver', ['jacobi', 'gauss_seidel'])
+def test_block_solve_matches_monolithic(make_stack, solver):
+    temp_sys = make_stack(thermal_solver=solver).temp_sys
+    temp_dense = np.linalg.solve(temp_sys.mat_dyn.toarray(), temp_sys.rhs)
+    # the criteria limits the change of the last sweep, the remaining error
+    # is larger by the inverse of the convergence rate of the sweeps
+    assert np.max(np.abs(temp_sys.temp_layer_vec - temp_dense)) \
+        < 1.e2 * temp_sys.block_crit
+
+
+def test_fluid_march_matches_element_loop(make_stack):
+    temp_sys = make_stack().temp_sys
+    temp_layer = temp_sys.temp_layer
+    temp_fluid = np.copy(temp_sys.temp_fluid)
+    temp_fluid_ele = np.copy(temp_sys.temp_fluid_ele)
+    for q in range(temp_sys.n_cells):
+        temp_fluid[0, q, 0] = temp_sys.temp_gas_in[0]
+        for w in range(1, temp_sys.nodes):
+            temp_fluid[0, q, w] = \
+                g_func.calc_fluid_temp_out(temp_fluid[0, q, w - 1],
+                                           temp_layer[q][1, w - 1],
+                                           temp_sys.g_fluid[0, q, w - 1],
+                                           temp_sys.k_gas_ch[0, q, w - 1])
+        temp_fluid_ele[0, q] = \
+            np.minimum(g_func.calc_elements_1_d(temp_fluid[0, q]),
+                       temp_layer[q][0])
+        temp_fluid[1, q, -1] = temp_sys.temp_gas_in[1]
+        for w in range(temp_sys.n_ele - 1, -1, -1):
+            temp_fluid[1, q, w] = \
+                g_func.calc_fluid_temp_out(temp_fluid[1, q, w + 1],
+                                           temp_layer[q][4, w],
+                                           temp_sys.g_fluid[1, q, w],
+                                           temp_sys.k_gas_ch[1, q, w])
+        temp_fluid_ele[1, q] = \
+            np.minimum(g_func.calc_elements_1_d(temp_fluid[1, q]),
+                       temp_layer[q][4])
+    temp_fluid[0] = g_func.calc_nodes_2_d(temp_fluid_ele[0])
+    temp_fluid[0, :, 0] = temp_sys.temp_gas_in[0]
+    temp_fluid[1] = g_func.calc_nodes_2_d(temp_fluid_ele[1])
+    temp_fluid[1, :, -1] = temp_sys.temp_gas_in[1]
+    # marching of the former element loops
+    temp_sys.update_gas_channel_lin()
+    np.testing.assert_allclose(temp_sys.temp_fluid, temp_fluid, rtol=1.e-12)
+
+    assert temp_sys.cool_ch_bc is True
+    temp_cool = np.copy(temp_sys.temp_cool)
+    temp_wall = [item[0] for item in temp_layer] + [temp_layer[-1][-1]]
+    for q, item in enumerate(temp_wall):
+        for w in range(1, temp_sys.nodes):
+            temp_cool[q, w] = \
+                g_func.calc_fluid_temp_out(temp_cool[q, w - 1], item[w - 1],
+                                           temp_sys.g_cool, temp_sys.k_cool)
+    temp_sys.update_coolant_channel_lin()
+    np.testing.assert_allclose(temp_sys.temp_cool, temp_cool, rtol=1.e-12)
+
+
+def calc_rhs_loop(temp_sys):
+    """
+    Assembles the right hand side of the layer temperatures
+    cell element by cell element.
+    """
+    rhs = np.full(temp_sys.n_ele * (5 * (temp_sys.n_cells - 1) + 6), 0.)
+    temp_env = temp_sys.temp_env
+    k_alpha_env = temp_sys.k_alpha_env
+    k_cool = temp_sys.k_cool
+    if temp_sys.implicit_fluid is True:
+        temp_cool_ele = np.zeros(temp_sys.temp_cool_ele.shape)
+    else:
+        temp_cool_ele = temp_sys.temp_cool_ele
+    ct = 0
+    for q in range(temp_sys.n_cells):
+        for w in range(temp_sys.n_ele):
+            if q == 0:
+                rhs[ct] = -.5 * temp_env * k_alpha_env[0, 2, q]
+            else:
+                rhs[ct] = - temp_env * k_alpha_env[0, 2, q]
+            rhs[ct + 1] = -temp_env * k_alpha_env[0, 1, q] \
+                - temp_sys.water.calc_h_vap(temp_sys.temp_fluid[0, q, w]) \
+                * temp_sys.cond_rate[0, q, w]
+            rhs[ct + 2] = \
+                - temp_env * k_alpha_env[0, 0, q] \
+                - (temp_sys.v_tn - temp_sys.dict_case['e_0']
+                   + temp_sys.v_loss[0, q, w]
+                   + .5 * temp_sys.omega[q, w] * temp_sys.i[q, w]) \
+                * temp_sys.i[q, w]
+            rhs[ct + 3] = \
+                - temp_env * k_alpha_env[0, 0, q] \
+                - (temp_sys.v_loss[1, q, w]
+                   + temp_sys.omega[q, w] * temp_sys.i[q, w] * .5) \
+                * temp_sys.i[q, w]
+            rhs[ct + 4] = - temp_env * k_alpha_env[0, 1, q] \
+                - temp_sys.water.calc_h_vap(temp_sys.temp_fluid[1, q, w]) \
+                * temp_sys.cond_rate[1, q, w]
+            if temp_sys.implicit_fluid is False:
+                rhs[ct + 1] -= temp_sys.temp_fluid_ele[0, q, w] \
+                    * temp_sys.k_gas_ch[0, q, w]
+                rhs[ct + 4] -= temp_sys.temp_fluid_ele[1, q, w] \
+                    * temp_sys.k_gas_ch[1, q, w]
+            if q == 0:
+                rhs[ct] -= temp_sys.heat_pow
+                if temp_sys.cool_ch_bc is True:
+                    rhs[ct] -= k_cool * temp_cool_ele[0, w]
+                cr = 5
+            elif 0 < q < temp_sys.n_cells - 1:
+                rhs[ct] -= k_cool * temp_cool_ele[q, w]
+                cr = 5
+            else:
+                rhs[ct] -= k_cool * temp_cool_ele[q, w]
+                rhs[ct + 5] -= temp_sys.heat_pow \
+                    - .5 * k_alpha_env[0, 2, 0] * temp_env
+                if temp_sys.cool_ch_bc is True:
+                    rhs[ct + 5] -= k_cool * temp_cool_ele[-1, w]
+                cr = 6
+            ct += cr
+    return rhs
+
+
+@pytest.mark.parametrize('implicit_fluid', [False, True])
+def test_rhs_matches_element_loop(make_stack, implicit_fluid):
+    temp_sys = make_stack(implicit_fluid_temperature=implicit_fluid).temp_sys
+    temp_sys.update_rhs()
+    assert np.array_equal(temp_sys.rhs, calc_rhs_loop(temp_sys))
+
+
+def test_implicit_fluid_matches_explicit_fluid(make_stack):
+    explicit = make_stack(iterations=100).temp_sys
+    implicit = \
+        make_stack(iterations=100, implicit_fluid_temperature=True).temp_sys
+    assert np.any(implicit.fluid_lim)
+    assert np.array_equal(implicit.fluid_lim, explicit.fluid_lim)
+    for name in ('temp_layer_vec', 'temp_fluid', 'temp_cool'):
+        np.testing.assert_allclose(getattr(implicit, name),
+                                   getattr(explicit, name),
+                                   rtol=0., atol=1.e-8)
+    mat_impl_lu = implicit.mat_impl_lu
+    pattern = (np.copy(implicit.mat_impl.indices),
+               np.copy(implicit.mat_impl.indptr))
+    temp_layer_vec = np.copy(implicit.temp_layer_vec)
+    implicit.update_temp_implicit()
+    # the converged values do not change the system matrix
+    assert implicit.mat_impl_lu is mat_impl_lu
+    assert np.array_equal(implicit.mat_impl.indices, pattern[0])
+    assert np.array_equal(implicit.mat_impl.indptr, pattern[1])
+    np.testing.assert_allclose(implicit.temp_layer_vec, temp_layer_vec,
+                               rtol=0., atol=1.e-8)
+
+
+def test_layer_temperatures_are_distinct_arrays(make_stack):
+    temp_layer = make_stack().temp_sys.temp_layer
+    for q, item in enumerate(temp_layer):
+        for item_other in temp_layer[q + 1:]:
+            assert not np.shares_memory(item, item_other)
+    assert not np.array_equal(temp_layer[0], temp_layer[1])
+
+
+def test_sorted_results_match_element_loop(make_stack):
+    temp_sys = make_stack().temp_sys
+    ct = 0
+    for q in range(temp_sys.n_cells):
+        cr = 5 if q < temp_sys.n_cells - 1 else 6
+        for w in range(temp_sys.n_ele):
+            assert np.array_equal(temp_sys.temp_layer[q][:, w],
+                                  temp_sys.temp_layer_vec[ct:ct + cr])
+            ct += cr
+    assert ct == len(temp_sys.temp_layer_vec)